@@ -0,0 +1,99 @@
+"""flag abnormal health metrics
+
+Revision ID: 2c8f5e9a1d64
+Revises: d71a3f08e5b2
+Create Date: 2026-10-19 12:31:45.019327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.models.enums import VitalType
+from app.utils.health_metrics import is_abnormal_reading, effective_unit
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f5e9a1d64'
+down_revision: Union[str, None] = 'd71a3f08e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Enum values are stored by name
+    op.execute("ALTER TYPE notificationtype ADD VALUE IF NOT EXISTS 'ABNORMAL_VITAL'")
+
+    op.add_column('health_metrics', sa.Column('is_abnormal', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Flag existing readings that carry a normal range, in keyset-paginated batches
+    bind = op.get_bind()
+    health_metrics = sa.table(
+        'health_metrics',
+        sa.column('id', sa.Uuid()),
+        sa.column('metric_type', sa.String()),
+        sa.column('value', sa.String()),
+        sa.column('unit', sa.String()),
+        sa.column('value_num', sa.Float()),
+        sa.column('normal_min', sa.Float()),
+        sa.column('normal_max', sa.Float()),
+        sa.column('is_abnormal', sa.Boolean()),
+    )
+    update_statement = (
+        health_metrics.update()
+        .where(health_metrics.c.id == sa.bindparam('metric_id'))
+        .values(is_abnormal=sa.true())
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(
+                health_metrics.c.id,
+                health_metrics.c.metric_type,
+                health_metrics.c.value,
+                health_metrics.c.unit,
+                health_metrics.c.value_num,
+                health_metrics.c.normal_min,
+                health_metrics.c.normal_max,
+            )
+            .where(sa.or_(health_metrics.c.normal_min.isnot(None), health_metrics.c.normal_max.isnot(None)))
+            .order_by(health_metrics.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(health_metrics.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+
+        params = [
+            {'metric_id': row.id}
+            for row in rows
+            if is_abnormal_reading(
+                VitalType[row.metric_type], row.value_num, effective_unit(row.value, row.unit),
+                row.normal_min, row.normal_max
+            )
+        ]
+        if params:
+            bind.execute(update_statement, params)
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_health_metrics_abnormal_recorded',
+        'health_metrics',
+        ['recorded_at', 'patient_id'],
+        unique=False,
+        postgresql_where=sa.text('is_abnormal'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_health_metrics_abnormal_recorded', table_name='health_metrics')
+    op.drop_column('health_metrics', 'is_abnormal')
+    # Postgres cannot drop a single enum value; ABNORMAL_VITAL is left in notificationtype
@@ -0,0 +1,33 @@
+"""index appointments for calendar sync
+
+Revision ID: 3d7b9e2f5c18
+Revises: 8f2c4a6b1d37
+Create Date: 2026-10-19 18:41:07.226913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7b9e2f5c18'
+down_revision: Union[str, None] = '8f2c4a6b1d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sync tokens are positions in updated_at order, which older rows never had
+    op.execute("UPDATE appointments SET updated_at = created_at WHERE updated_at IS NULL")
+    op.create_index('ix_appointments_doctor_updated', 'appointments', ['doctor_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_appointments_patient_updated', 'appointments', ['patient_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_appointments_patient_updated', table_name='appointments')
+    op.drop_index('ix_appointments_doctor_updated', table_name='appointments')
@@ -0,0 +1,98 @@
+"""add parsed numeric health metric values
+
+Revision ID: 4f3b42fe828c
+Revises: c4ff53c23f75
+Create Date: 2026-10-19 10:02:11.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.models.enums import VitalType
+from app.utils.health_metrics import parse_metric_value
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f3b42fe828c'
+down_revision: Union[str, None] = 'c4ff53c23f75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('health_metrics', sa.Column('value_num', sa.Float(), nullable=True))
+    op.add_column('health_metrics', sa.Column('value_secondary', sa.Float(), nullable=True))
+    op.add_column('health_metrics', sa.Column('unit_normalized', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True))
+
+    # Backfill parsed values in keyset-paginated batches
+    bind = op.get_bind()
+    health_metrics = sa.table(
+        'health_metrics',
+        sa.column('id', sa.Uuid()),
+        sa.column('metric_type', sa.String()),
+        sa.column('value', sa.String()),
+        sa.column('unit', sa.String()),
+        sa.column('value_num', sa.Float()),
+        sa.column('value_secondary', sa.Float()),
+        sa.column('unit_normalized', sa.String()),
+    )
+    update_statement = (
+        health_metrics.update()
+        .where(health_metrics.c.id == sa.bindparam('metric_id'))
+        .values(
+            value_num=sa.bindparam('parsed_num'),
+            value_secondary=sa.bindparam('parsed_secondary'),
+            unit_normalized=sa.bindparam('parsed_unit'),
+        )
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(
+                health_metrics.c.id,
+                health_metrics.c.metric_type,
+                health_metrics.c.value,
+                health_metrics.c.unit,
+            )
+            .order_by(health_metrics.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(health_metrics.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            # Enum values are stored by name (e.g. 'BLOOD_PRESSURE')
+            num, secondary, unit = parse_metric_value(VitalType[row.metric_type], row.value, row.unit)
+            params.append({
+                'metric_id': row.id,
+                'parsed_num': num,
+                'parsed_secondary': secondary,
+                'parsed_unit': unit,
+            })
+        bind.execute(update_statement, params)
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_health_metrics_patient_type_recorded',
+        'health_metrics',
+        ['patient_id', 'metric_type', 'recorded_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_health_metrics_patient_type_recorded', table_name='health_metrics')
+    op.drop_column('health_metrics', 'unit_normalized')
+    op.drop_column('health_metrics', 'value_secondary')
+    op.drop_column('health_metrics', 'value_num')
@@ -0,0 +1,41 @@
+"""add reminder dispatch claims
+
+Revision ID: 5a91c3e7f208
+Revises: 7e4a0c9d2b15
+Create Date: 2026-10-19 14:05:12.530871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a91c3e7f208'
+down_revision: Union[str, None] = '7e4a0c9d2b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('appointment_reminders', sa.Column('claimed_by', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True))
+    op.add_column('appointment_reminders', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_appointment_reminders_unsent_time',
+        'appointment_reminders',
+        ['reminder_time'],
+        unique=False,
+        postgresql_where=sa.text('NOT is_sent'),
+    )
+    op.create_index('ix_appointment_reminders_sent_at', 'appointment_reminders', ['sent_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_appointment_reminders_sent_at', table_name='appointment_reminders')
+    op.drop_index('ix_appointment_reminders_unsent_time', table_name='appointment_reminders')
+    op.drop_column('appointment_reminders', 'claimed_until')
+    op.drop_column('appointment_reminders', 'claimed_by')
@@ -0,0 +1,54 @@
+"""add doctor patient summary
+
+Revision ID: 6c1e8a4f2d93
+Revises: 3d7b9e2f5c18
+Create Date: 2026-10-19 19:27:45.103582
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e8a4f2d93'
+down_revision: Union[str, None] = '3d7b9e2f5c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('doctor_patient_summary',
+    sa.Column('doctor_id', sa.Uuid(), nullable=False),
+    sa.Column('patient_id', sa.Uuid(), nullable=False),
+    sa.Column('appointment_count', sa.Integer(), nullable=False),
+    sa.Column('last_visit', sa.DateTime(), nullable=True),
+    sa.Column('is_bookmarked', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['doctor_id'], ['doctor_profiles.id'], ),
+    sa.ForeignKeyConstraint(['patient_id'], ['patient_profiles.id'], ),
+    sa.PrimaryKeyConstraint('doctor_id', 'patient_id')
+    )
+    op.create_index('ix_doctor_patient_summary_doctor_last_visit', 'doctor_patient_summary', ['doctor_id', 'last_visit'], unique=False)
+
+    # Seed from existing appointments and bookmarks
+    op.execute("""
+        INSERT INTO doctor_patient_summary (doctor_id, patient_id, appointment_count, last_visit, is_bookmarked)
+        SELECT doctor_id, patient_id, COUNT(*), MAX(appointment_date), false
+        FROM appointments
+        GROUP BY doctor_id, patient_id
+    """)
+    op.execute("""
+        INSERT INTO doctor_patient_summary (doctor_id, patient_id, appointment_count, last_visit, is_bookmarked)
+        SELECT DISTINCT doctor_id, patient_id, 0, NULL::timestamp, true
+        FROM doctor_bookmarks
+        ON CONFLICT (doctor_id, patient_id) DO UPDATE SET is_bookmarked = true
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_doctor_patient_summary_doctor_last_visit', table_name='doctor_patient_summary')
+    op.drop_table('doctor_patient_summary')
@@ -0,0 +1,109 @@
+"""partition health metrics by month
+
+Revision ID: 7e4a0c9d2b15
+Revises: 2c8f5e9a1d64
+Create Date: 2026-10-19 13:20:51.886140
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.core.config import settings
+from app.db.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_health_metric_partitions,
+    month_start,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4a0c9d2b15'
+down_revision: Union[str, None] = '2c8f5e9a1d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        'ix_health_metrics_patient_type_recorded',
+        'health_metrics',
+        ['patient_id', 'metric_type', 'recorded_at'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_health_metrics_abnormal_recorded',
+        'health_metrics',
+        ['recorded_at', 'patient_id'],
+        unique=False,
+        postgresql_where=sa.text('is_abnormal'),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # A partitioned table cannot be referenced by id alone
+    op.drop_constraint('patient_latest_vitals_health_metric_id_fkey', 'patient_latest_vitals', type_='foreignkey')
+
+    # Move the existing table aside, freeing its index names
+    op.rename_table('health_metrics', 'health_metrics_unpartitioned')
+    op.drop_index('ix_health_metrics_patient_type_recorded', table_name='health_metrics_unpartitioned')
+    op.drop_index('ix_health_metrics_abnormal_recorded', table_name='health_metrics_unpartitioned')
+    op.execute("ALTER TABLE health_metrics_unpartitioned RENAME CONSTRAINT health_metrics_pkey TO health_metrics_unpartitioned_pkey")
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE health_metrics (LIKE health_metrics_unpartitioned INCLUDING DEFAULTS)
+        PARTITION BY RANGE (recorded_at)
+    """)
+    op.create_primary_key('health_metrics_pkey', 'health_metrics', ['id', 'recorded_at'])
+    op.create_foreign_key('health_metrics_patient_id_fkey', 'health_metrics', 'patient_profiles', ['patient_id'], ['id'])
+    _create_indexes()
+
+    # One partition per month of existing data plus the upcoming months;
+    # anything outside that range lands in the default partition
+    oldest, newest = bind.execute(
+        sa.text("SELECT MIN(recorded_at), MAX(recorded_at) FROM health_metrics_unpartitioned")
+    ).one()
+    this_month = month_start(datetime.utcnow().date())
+    start = month_start(oldest.date()) if oldest else this_month
+    end = add_months(
+        max(month_start(newest.date()), this_month) if newest else this_month,
+        settings.HEALTH_METRICS_PARTITION_MONTHS_AHEAD + 1,
+    )
+    create_health_metric_partitions(bind, start, end)
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF health_metrics DEFAULT")
+
+    op.execute("INSERT INTO health_metrics SELECT * FROM health_metrics_unpartitioned")
+    op.drop_table('health_metrics_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("CREATE TABLE health_metrics_unpartitioned (LIKE health_metrics INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO health_metrics_unpartitioned SELECT * FROM health_metrics")
+
+    # Dropping the parent drops every attached partition
+    op.drop_table('health_metrics')
+    op.rename_table('health_metrics_unpartitioned', 'health_metrics')
+    op.create_primary_key('health_metrics_pkey', 'health_metrics', ['id'])
+    op.create_foreign_key('health_metrics_patient_id_fkey', 'health_metrics', 'patient_profiles', ['patient_id'], ['id'])
+    _create_indexes()
+
+    # Pointers into detached months would violate the restored foreign key
+    op.execute("""
+        DELETE FROM patient_latest_vitals
+        WHERE health_metric_id NOT IN (SELECT id FROM health_metrics)
+    """)
+    op.create_foreign_key(
+        'patient_latest_vitals_health_metric_id_fkey',
+        'patient_latest_vitals', 'health_metrics',
+        ['health_metric_id'], ['id'],
+        ondelete='CASCADE',
+    )
@@ -0,0 +1,60 @@
+"""prevent overlapping doctor appointments
+
+Revision ID: 8f2c4a6b1d37
+Revises: b3d6e8f1a4c9
+Create Date: 2026-10-19 16:02:18.514730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2c4a6b1d37'
+down_revision: Union[str, None] = 'b3d6e8f1a4c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BOOKED = "status NOT IN ('CANCELLED', 'NO_SHOW')"
+
+
+def _time_range(alias: str = "") -> str:
+    prefix = f"{alias}." if alias else ""
+    return f"tsrange({prefix}appointment_date, {prefix}appointment_date + make_interval(mins => {prefix}duration_minutes))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # Existing double bookings would make the constraint fail; list them instead of guessing which to cancel
+    overlaps = bind.execute(sa.text(f"""
+        SELECT a.id, b.id FROM appointments a
+        JOIN appointments b ON b.doctor_id = a.doctor_id AND b.id > a.id
+        WHERE a.{BOOKED} AND b.{BOOKED}
+          AND {_time_range('a')} && {_time_range('b')}
+        LIMIT 20
+    """)).all()
+    if overlaps:
+        pairs = ", ".join(f"{first}/{second}" for first, second in overlaps)
+        raise RuntimeError(
+            f"Overlapping appointments must be cancelled or rescheduled before upgrading: {pairs}"
+        )
+
+    # GiST equality on uuid comes from btree_gist
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_index('ix_appointments_doctor_date', 'appointments', ['doctor_id', 'appointment_date'], unique=False)
+    op.execute(f"""
+        ALTER TABLE appointments ADD CONSTRAINT ex_appointments_doctor_overlap
+        EXCLUDE USING gist (doctor_id WITH =, {_time_range()} WITH &&)
+        WHERE ({BOOKED})
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_appointments_doctor_overlap', 'appointments')
+    op.drop_index('ix_appointments_doctor_date', table_name='appointments')
@@ -0,0 +1,46 @@
+"""add patient latest vitals
+
+Revision ID: 9b2e6d41c7a3
+Revises: 4f3b42fe828c
+Create Date: 2026-10-19 11:14:37.602184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e6d41c7a3'
+down_revision: Union[str, None] = '4f3b42fe828c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('patient_latest_vitals',
+    sa.Column('patient_id', sa.Uuid(), nullable=False),
+    sa.Column('metric_type', postgresql.ENUM('BLOOD_PRESSURE', 'HEART_RATE', 'TEMPERATURE', 'WEIGHT', 'HEIGHT', 'BMI', 'BLOOD_SUGAR', 'OXYGEN_SATURATION', name='vitaltype', create_type=False), nullable=False),
+    sa.Column('health_metric_id', sa.Uuid(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['health_metric_id'], ['health_metrics.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['patient_id'], ['patient_profiles.id'], ),
+    sa.PrimaryKeyConstraint('patient_id', 'metric_type')
+    )
+
+    # Seed from existing readings
+    op.execute("""
+        INSERT INTO patient_latest_vitals (patient_id, metric_type, health_metric_id, recorded_at)
+        SELECT DISTINCT ON (patient_id, metric_type) patient_id, metric_type, id, recorded_at
+        FROM health_metrics
+        ORDER BY patient_id, metric_type, recorded_at DESC, created_at DESC
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('patient_latest_vitals')
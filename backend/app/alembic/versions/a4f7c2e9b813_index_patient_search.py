@@ -0,0 +1,44 @@
+"""index patient search
+
+Revision ID: a4f7c2e9b813
+Revises: 6c1e8a4f2d93
+Create Date: 2026-10-19 20:06:31.559210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f7c2e9b813'
+down_revision: Union[str, None] = '6c1e8a4f2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('users', sa.Column(
+        'phone_digits',
+        sa.String(length=20),
+        sa.Computed("regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')", persisted=True),
+        nullable=True,
+    ))
+    op.execute(
+        "CREATE INDEX ix_users_full_name_trgm ON users "
+        "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_phone_digits ON users (phone_digits text_pattern_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_phone_digits', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_users_full_name_trgm', table_name='users')
+    op.drop_column('users', 'phone_digits')
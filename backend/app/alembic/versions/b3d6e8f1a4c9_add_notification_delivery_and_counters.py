@@ -0,0 +1,58 @@
+"""add notification delivery and counters
+
+Revision ID: b3d6e8f1a4c9
+Revises: 5a91c3e7f208
+Create Date: 2026-10-19 15:12:40.337926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d6e8f1a4c9'
+down_revision: Union[str, None] = '5a91c3e7f208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('claimed_by', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True))
+    op.add_column('notifications', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.create_index('ix_notifications_user_sent', 'notifications', ['user_id', 'sent_at', 'id'], unique=False)
+    op.create_index(
+        'ix_notifications_pending_created',
+        'notifications',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+    op.create_table('user_notification_counters',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Seed from notifications already delivered and unread
+    op.execute("""
+        INSERT INTO user_notification_counters (user_id, unread_count)
+        SELECT user_id, COUNT(*)
+        FROM notifications
+        WHERE sent_at IS NOT NULL AND read_at IS NULL
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_notification_counters')
+    op.drop_index('ix_notifications_pending_created', table_name='notifications')
+    op.drop_index('ix_notifications_user_sent', table_name='notifications')
+    op.drop_column('notifications', 'claimed_until')
+    op.drop_column('notifications', 'claimed_by')
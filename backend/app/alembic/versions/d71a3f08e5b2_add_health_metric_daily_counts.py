@@ -0,0 +1,43 @@
+"""add health metric daily counts
+
+Revision ID: d71a3f08e5b2
+Revises: 9b2e6d41c7a3
+Create Date: 2026-10-19 11:52:08.274913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd71a3f08e5b2'
+down_revision: Union[str, None] = '9b2e6d41c7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('health_metric_daily_counts',
+    sa.Column('patient_id', sa.Uuid(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patient_profiles.id'], ),
+    sa.PrimaryKeyConstraint('patient_id', 'day')
+    )
+
+    # Seed from existing readings
+    op.execute("""
+        INSERT INTO health_metric_daily_counts (patient_id, day, count)
+        SELECT patient_id, CAST(recorded_at AS DATE), COUNT(*)
+        FROM health_metrics
+        GROUP BY patient_id, CAST(recorded_at AS DATE)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('health_metric_daily_counts')
@@ -0,0 +1,99 @@
+"""recheck abnormal flags for embedded units
+
+Revision ID: f1c3a8d6b592
+Revises: e2b5d9a7c431
+Create Date: 2026-10-19 23:05:37.412908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from app.models.enums import VitalType
+from app.utils.health_metrics import is_abnormal_reading, effective_unit
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3a8d6b592'
+down_revision: Union[str, None] = 'e2b5d9a7c431'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Readings with a blank unit had their range compared in the wrong unit
+    # when the value carried its own ("180 lbs"); flag them again
+    bind = op.get_bind()
+    health_metrics = sa.table(
+        'health_metrics',
+        sa.column('id', sa.Uuid()),
+        sa.column('recorded_at', sa.DateTime()),
+        sa.column('metric_type', sa.String()),
+        sa.column('value', sa.String()),
+        sa.column('unit', sa.String()),
+        sa.column('value_num', sa.Float()),
+        sa.column('normal_min', sa.Float()),
+        sa.column('normal_max', sa.Float()),
+        sa.column('is_abnormal', sa.Boolean()),
+    )
+    update_statement = (
+        health_metrics.update()
+        .where(
+            sa.and_(
+                health_metrics.c.id == sa.bindparam('metric_id'),
+                health_metrics.c.recorded_at == sa.bindparam('metric_recorded_at'),
+            )
+        )
+        .values(is_abnormal=sa.bindparam('flag'))
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(
+                health_metrics.c.id,
+                health_metrics.c.recorded_at,
+                health_metrics.c.metric_type,
+                health_metrics.c.value,
+                health_metrics.c.unit,
+                health_metrics.c.value_num,
+                health_metrics.c.normal_min,
+                health_metrics.c.normal_max,
+                health_metrics.c.is_abnormal,
+            )
+            .where(
+                sa.and_(
+                    sa.func.coalesce(sa.func.trim(health_metrics.c.unit), '') == '',
+                    sa.or_(health_metrics.c.normal_min.isnot(None), health_metrics.c.normal_max.isnot(None)),
+                )
+            )
+            .order_by(health_metrics.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(health_metrics.c.id > last_id)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            flag = is_abnormal_reading(
+                VitalType[row.metric_type], row.value_num, effective_unit(row.value, row.unit),
+                row.normal_min, row.normal_max
+            )
+            if flag != row.is_abnormal:
+                params.append({'metric_id': row.id, 'metric_recorded_at': row.recorded_at, 'flag': flag})
+        if params:
+            bind.execute(update_statement, params)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Data-only fix; the corrected flags are kept
+    pass
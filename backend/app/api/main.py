@@ -6,6 +6,9 @@ from app.api.routes import (
     profiles_router,
     medical_conditions_router,
     medical_records,
+    notifications_router,
+    events_router,
+    calendar_router,
 )
 from app.api.routes.health_metrics import router as health_metrics_router
 
@@ -25,3 +28,12 @@ api_router.include_router(
 api_router.include_router(
     health_metrics_router, tags=["Health Metrics"]
 )
+api_router.include_router(
+    notifications_router, tags=["Notifications"]
+)
+api_router.include_router(
+    events_router, tags=["Live Updates"]
+)
+api_router.include_router(
+    calendar_router, tags=["Calendar"]
+)
@@ -4,5 +4,8 @@ from .profiles import router as profiles_router
 from .medications import router as medications_router
 from .medical_conditions import router as medical_conditions_router
 from .medical_records import router as records_router
+from .notifications import router as notifications_router
+from .events import router as events_router
+from .calendar import router as calendar_router
 
-__all__ = ["auth_router", "appointments_router", "medications_router", "medical_conditions_router", "profiles_router", "records_router"]
+__all__ = ["auth_router", "appointments_router", "medications_router", "medical_conditions_router", "profiles_router", "records_router", "notifications_router", "events_router", "calendar_router"]
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Query
 from fastapi.requests import Request
 from app.schemas.appointments import (
     AppointmentCreate,
@@ -8,7 +8,11 @@ from app.schemas.appointments import (
     AppointmentStats,
     AppointmentReminderCreate,
     AppointmentReminderRead,
-    AppointmentBatchUpdate
+    AppointmentBatchUpdate,
+    ReminderDispatchStats,
+    DoctorAvailability,
+    DoctorAvailabilitySearchFilters,
+    DoctorAvailabilitySearchResponse
 )
 from app.crud.appointments import (
     get_appointment_by_id,
@@ -23,17 +27,20 @@ from app.crud.appointments import (
     create_appointment_reminder,
     get_user_reminders,
     get_reminder_by_id,
-    delete_reminder
+    delete_reminder,
+    get_reminder_dispatch_stats,
+    get_doctor_free_slots,
+    search_doctor_availability
 )
+from app.crud.notifications import notify_appointment_change
 from app.crud.profiles import (
-    get_patient_profile_by_user_id,
-    get_doctor_profile_by_user_id
+    get_profile_id_for_user
 )
 from app.models.auth import User
 from app.models.enums import AppointmentStatus
 from app.db.session import SessionDep
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, date, time
 import logging
 import uuid
 
@@ -44,27 +51,18 @@ router = APIRouter()
 # Helper function to get user profile ID
 async def get_user_profile_id(user: User) -> uuid.UUID:
     """Get the profile ID for the current user based on their type."""
-    if user.is_patient:
-        profile = get_patient_profile_by_user_id(user.id)
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Patient profile not found"
-            )
-        return profile.id
-    elif user.is_doctor:
-        profile = get_doctor_profile_by_user_id(user.id)
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Doctor profile not found"
-            )
-        return profile.id
-    else:
+    if not (user.is_patient or user.is_doctor):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only patients and doctors can access appointments"
         )
+    profile_id = get_profile_id_for_user(user)
+    if not profile_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient profile not found" if user.is_patient else "Doctor profile not found"
+        )
+    return profile_id
 
 
 # Create Appointment
@@ -72,7 +70,8 @@ async def get_user_profile_id(user: User) -> uuid.UUID:
 async def create_new_appointment(
     appointment_data: AppointmentCreate,
     session: SessionDep,
-    request: Request
+    request: Request,
+    background_tasks: BackgroundTasks
 ):
     """Create a new appointment. Patients can only create appointments for themselves."""
     try:
@@ -99,6 +98,13 @@ async def create_new_appointment(
 
         appointment = create_appointment(
             appointment_data, created_by_patient_id)
+
+        # Notifications are written after the response is sent
+        background_tasks.add_task(
+            notify_appointment_change, appointment.id, current_user.id,
+            "New appointment",
+            f"An appointment was booked for {appointment.appointment_date:%B %d at %I:%M %p}."
+        )
         return AppointmentRead.model_validate(appointment)
 
     except ValueError as e:
@@ -114,6 +120,127 @@ async def create_new_appointment(
         )
 
 
+# Search Appointments with Filters
+# /search and /batch are registered before /{appointment_id}, which would capture them
+@router.get("/search", response_model=dict)
+async def search_user_appointments(
+    request: Request,
+    doctor_id: Optional[uuid.UUID] = Query(None),
+    patient_id: Optional[uuid.UUID] = Query(None),
+    status: Optional[AppointmentStatus] = Query(None),
+    appointment_type: Optional[str] = Query(None),
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    specialization: Optional[str] = Query(None),
+    doctor_name: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Search appointments with various filters. Access controlled by user role."""
+    current_user = request.state.user
+    try:
+        # Build search filters
+        filters = AppointmentSearchFilters(
+            doctor_id=doctor_id,
+            patient_id=patient_id,
+            status=status,
+            appointment_type=appointment_type,
+            date_from=date_from,
+            date_to=date_to,
+            specialization=specialization,
+            doctor_name=doctor_name,
+            limit=limit,
+            offset=offset
+        )
+
+        # Apply access control based on user role
+        if current_user.is_patient:
+            # Patients can only see their own appointments
+            user_profile_id = await get_user_profile_id(current_user)
+            filters.patient_id = user_profile_id
+        elif current_user.is_doctor:
+            # Doctors can only see their own appointments unless they search for specific patients
+            if not patient_id:  # If no specific patient requested, show doctor's appointments
+                user_profile_id = await get_user_profile_id(current_user)
+                filters.doctor_id = user_profile_id
+        # Admins can see all appointments without restrictions
+
+        appointments, total_count = search_appointments(filters)
+
+        return {
+            "appointments": appointments,
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + limit < total_count
+        }
+
+    except Exception as e:
+        logger.error(f"Error searching appointments: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search appointments"
+        )
+
+
+# Batch Update Appointments (Admin/Doctor only)
+@router.put("/batch", response_model=dict)
+async def batch_update_appointments(
+    batch_data: AppointmentBatchUpdate,
+    request: Request,
+    background_tasks: BackgroundTasks
+):
+    current_user = request.state.user
+    """Batch update multiple appointments. Admin and doctors only."""
+    if not (current_user.is_admin or current_user.is_doctor):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and doctors can perform batch updates"
+        )
+
+    try:
+        updated_count = 0
+        failed_count = 0
+
+        for appointment_id in batch_data.appointment_ids:
+            try:
+                update_data = AppointmentUpdate()
+                if batch_data.status:
+                    update_data.status = batch_data.status
+                if batch_data.notes:
+                    update_data.notes = batch_data.notes
+
+                result = update_appointment(appointment_id, update_data)
+                if result:
+                    updated_count += 1
+                    background_tasks.add_task(
+                        notify_appointment_change, appointment_id, current_user.id,
+                        "Appointment updated",
+                        f"Your appointment on {result.appointment_date:%B %d at %I:%M %p} was updated "
+                        f"(status: {result.status.value})."
+                    )
+                else:
+                    failed_count += 1
+            except Exception as e:
+                logger.error(
+                    f"Error updating appointment {appointment_id}: {e}")
+                failed_count += 1
+
+        return {
+            "message": "Batch update completed",
+            "updated": updated_count,
+            "failed": failed_count,
+            "total": len(batch_data.appointment_ids)
+        }
+
+    except Exception as e:
+        logger.error(f"Error in batch update: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to perform batch update"
+        )
+
+
 # Get Appointment by ID
 @router.get("/{appointment_id}", response_model=AppointmentRead)
 async def get_appointment(
@@ -148,7 +275,8 @@ async def get_appointment(
 async def update_existing_appointment(
     appointment_id: uuid.UUID,
     appointment_data: AppointmentUpdate,
-    request: Request
+    request: Request,
+    background_tasks: BackgroundTasks
 ):
     """Update appointment. Users can only update appointments they're involved in."""
     # Get existing appointment
@@ -193,8 +321,19 @@ async def update_existing_appointment(
                 detail="Appointment not found"
             )
 
+        background_tasks.add_task(
+            notify_appointment_change, appointment_id, current_user.id,
+            "Appointment updated",
+            f"Your appointment on {updated_appointment.appointment_date:%B %d at %I:%M %p} was updated "
+            f"(status: {updated_appointment.status.value})."
+        )
         return AppointmentRead.model_validate(updated_appointment)
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error updating appointment {appointment_id}: {e}")
         raise HTTPException(
@@ -207,7 +346,8 @@ async def update_existing_appointment(
 @router.delete("/{appointment_id}")
 async def cancel_appointment(
     appointment_id: uuid.UUID,
-    request: Request
+    request: Request,
+    background_tasks: BackgroundTasks
 ):
     """Cancel appointment. Users can only cancel appointments they're involved in."""
     # Get existing appointment
@@ -239,6 +379,11 @@ async def cancel_appointment(
                 detail="Appointment not found"
             )
 
+        background_tasks.add_task(
+            notify_appointment_change, appointment_id, current_user.id,
+            "Appointment cancelled",
+            f"Your appointment on {existing_appointment.appointment_date:%B %d at %I:%M %p} was cancelled."
+        )
         return {"message": "Appointment cancelled successfully"}
 
     except Exception as e:
@@ -249,68 +394,6 @@ async def cancel_appointment(
         )
 
 
-# Search Appointments with Filters
-@router.get("/search", response_model=dict)
-async def search_user_appointments(
-    request: Request,
-    doctor_id: Optional[uuid.UUID] = Query(None),
-    patient_id: Optional[uuid.UUID] = Query(None),
-    status: Optional[AppointmentStatus] = Query(None),
-    appointment_type: Optional[str] = Query(None),
-    date_from: Optional[datetime] = Query(None),
-    date_to: Optional[datetime] = Query(None),
-    specialization: Optional[str] = Query(None),
-    doctor_name: Optional[str] = Query(None),
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0)
-):
-    """Search appointments with various filters. Access controlled by user role."""
-    current_user = request.state.user
-    try:
-        # Build search filters
-        filters = AppointmentSearchFilters(
-            doctor_id=doctor_id,
-            patient_id=patient_id,
-            status=status,
-            appointment_type=appointment_type,
-            date_from=date_from,
-            date_to=date_to,
-            specialization=specialization,
-            doctor_name=doctor_name,
-            limit=limit,
-            offset=offset
-        )
-
-        # Apply access control based on user role
-        if current_user.is_patient:
-            # Patients can only see their own appointments
-            user_profile_id = await get_user_profile_id(current_user)
-            filters.patient_id = user_profile_id
-        elif current_user.is_doctor:
-            # Doctors can only see their own appointments unless they search for specific patients
-            if not patient_id:  # If no specific patient requested, show doctor's appointments
-                user_profile_id = await get_user_profile_id(current_user)
-                filters.doctor_id = user_profile_id
-        # Admins can see all appointments without restrictions
-
-        appointments, total_count = search_appointments(filters)
-
-        return {
-            "appointments": appointments,
-            "total": total_count,
-            "limit": limit,
-            "offset": offset,
-            "has_more": offset + limit < total_count
-        }
-
-    except Exception as e:
-        logger.error(f"Error searching appointments: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to search appointments"
-        )
-
-
 # Get User's Appointments (Simplified endpoint)
 @router.get("/my/list", response_model=dict)
 async def get_my_appointments(
@@ -391,54 +474,87 @@ async def get_my_appointment_stats(
         )
 
 
-# Batch Update Appointments (Admin/Doctor only)
-@router.put("/batch", response_model=dict)
-async def batch_update_appointments(
-    batch_data: AppointmentBatchUpdate,
-    request: Request
+# Doctor Free Slots
+@router.get("/doctors/{doctor_id}/free-slots", response_model=DoctorAvailability)
+async def get_doctor_free_slots_endpoint(
+    doctor_id: uuid.UUID,
+    start_date: date = Query(..., description="First day to search"),
+    end_date: date = Query(..., description="Last day to search (inclusive)"),
+    slot_minutes: int = Query(30, ge=15, le=180)
 ):
-    current_user = request.state.user
-    """Batch update multiple appointments. Admin and doctors only."""
-    if not (current_user.is_admin or current_user.is_doctor):
+    """Get the bookable slots of a doctor between two dates, from their working hours minus booked appointments."""
+    try:
+        return get_doctor_free_slots(doctor_id, start_date, end_date, slot_minutes)
+
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins and doctors can perform batch updates"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error getting free slots for doctor {doctor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve free slots"
         )
 
-    try:
-        updated_count = 0
-        failed_count = 0
-
-        for appointment_id in batch_data.appointment_ids:
-            try:
-                update_data = AppointmentUpdate()
-                if batch_data.status:
-                    update_data.status = batch_data.status
-                if batch_data.notes:
-                    update_data.notes = batch_data.notes
 
-                result = update_appointment(appointment_id, update_data)
-                if result:
-                    updated_count += 1
-                else:
-                    failed_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Error updating appointment {appointment_id}: {e}")
-                failed_count += 1
-
-        return {
-            "message": "Batch update completed",
-            "updated": updated_count,
-            "failed": failed_count,
-            "total": len(batch_data.appointment_ids)
-        }
+# Search Free Slots Across Doctors
+@router.get("/availability/search", response_model=DoctorAvailabilitySearchResponse)
+async def search_doctor_availability_endpoint(
+    start_date: date = Query(..., description="First day to search"),
+    end_date: date = Query(..., description="Last day to search (inclusive)"),
+    from_time: Optional[time] = Query(None, description="Earliest slot start each day, e.g. 08:00"),
+    to_time: Optional[time] = Query(None, description="Latest slot end each day, e.g. 12:00"),
+    specialization: Optional[str] = Query(None, description="Filter by specialization"),
+    hospital_affiliation: Optional[str] = Query(None, description="Filter by hospital affiliation"),
+    min_experience: Optional[int] = Query(None, ge=0, description="Minimum years of experience"),
+    max_fee: Optional[float] = Query(None, ge=0, description="Maximum consultation fee"),
+    is_verified: Optional[bool] = Query(None, description="Filter by verification status"),
+    name: Optional[str] = Query(None, description="Search by doctor name"),
+    slot_minutes: int = Query(30, ge=15, le=180),
+    slots_per_doctor: int = Query(3, ge=1, le=20),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page")
+):
+    """Find the doctors matching a search who are free soonest, with their earliest free slots."""
+    try:
+        filters = DoctorAvailabilitySearchFilters(
+            specialization=specialization,
+            hospital_affiliation=hospital_affiliation,
+            min_experience=min_experience,
+            max_fee=max_fee,
+            is_verified=is_verified,
+            name=name,
+            start_date=start_date,
+            end_date=end_date,
+            from_time=from_time,
+            to_time=to_time,
+            slot_minutes=slot_minutes,
+            slots_per_doctor=slots_per_doctor,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        doctors, total_count = search_doctor_availability(filters)
+
+        return DoctorAvailabilitySearchResponse(
+            doctors=doctors,
+            total_count=total_count,
+            page=page,
+            page_size=page_size,
+            total_pages=(total_count + page_size - 1) // page_size
+        )
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
-        logger.error(f"Error in batch update: {e}")
+        logger.error(f"Error searching doctor availability: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to perform batch update"
+            detail="Failed to search doctor availability"
         )
 
 
@@ -510,6 +626,28 @@ async def get_my_reminders(
         )
 
 
+# Reminder dispatch metrics
+@router.get("/reminders/metrics", response_model=ReminderDispatchStats)
+async def get_reminder_metrics(request: Request):
+    """Get reminder delivery backlog, lag and throughput across all workers (admin only)."""
+    current_user = request.state.user
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can view reminder metrics"
+        )
+
+    try:
+        return get_reminder_dispatch_stats()
+
+    except Exception as e:
+        logger.error(f"Error getting reminder metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get reminder metrics"
+        )
+
+
 # Delete User's Reminder
 @router.delete("/reminders/{reminder_id}")
 async def delete_my_reminder(
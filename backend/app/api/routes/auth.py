@@ -5,6 +5,7 @@ from app.schemas.auth import (
     PatientRegisterRequest, 
     DoctorRegisterRequest, 
     AdminRegisterRequest,
+    PasswordHasherStats,
     Token, 
     UserRead
 )
@@ -12,9 +13,18 @@ from app.crud.auth import (
     get_user_by_email, 
     create_patient_user, 
     create_doctor_user, 
-    create_admin_user
+    create_admin_user,
+    update_password_hash,
+    revoke_token
+)
+from app.services.password_hasher import password_hasher, PasswordHasherBusy
+from app.utils.auth import (
+    create_access_token,
+    get_token_expires_in,
+    get_token_expiry,
+    mark_tokens_revoked,
+    token_hash
 )
-from app.utils.auth import verify_password, create_access_token, get_token_expires_in
 from app.db.session import SessionDep
 import logging
 
@@ -22,6 +32,21 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
@@ -35,12 +60,20 @@ async def login(
             detail="Invalid email or password"
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    # Verify password off the event loop
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(login_data.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
+
+    # The stored hash used another cost factor; replace it while we have the password
+    if new_hash:
+        update_password_hash(user.id, new_hash)
     
     # Create access token
     token_data = {
@@ -61,6 +94,32 @@ async def login(
     )
 
 
+@router.post("/logout", response_model=dict)
+async def logout(request: Request):
+    """Revoke the bearer token of this request; every API process rejects it within seconds."""
+    current_user = request.state.user
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Logout requires the token in the Authorization header"
+        )
+    token = auth_header.split(" ")[1]
+    key = token_hash(token)
+
+    expires_at = get_token_expiry(token)
+    try:
+        revoke_token(key, current_user.id, expires_at)
+    except Exception as e:
+        logger.error(f"Error logging out user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to log out"
+        )
+    mark_tokens_revoked([(key, expires_at)])
+    return {"message": "Logged out"}
+
+
 @router.post("/register/patient", response_model=Token)
 async def register_patient(
     register_data: PatientRegisterRequest,
@@ -77,7 +136,8 @@ async def register_patient(
     
     try:
         # Create patient user with profile (atomic transaction)
-        user = create_patient_user(register_data)
+        hashed_password = await _hash_password(register_data.password)
+        user = create_patient_user(register_data, hashed_password)
         
         # Create access token
         token_data = {
@@ -97,6 +157,8 @@ async def register_patient(
             user=user_read
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         # Validation errors (bad input data)
         raise HTTPException(
@@ -130,7 +192,8 @@ async def register_doctor(
     
     try:
         # Create doctor user with profile
-        user = create_doctor_user(register_data)
+        hashed_password = await _hash_password(register_data.password)
+        user = create_doctor_user(register_data, hashed_password)
         
         # Create access token
         token_data = {
@@ -150,6 +213,8 @@ async def register_doctor(
             user=user_read
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -191,12 +256,15 @@ async def register_admin(
     
     try:
         # Create admin user
-        user = create_admin_user(register_data)
+        hashed_password = await _hash_password(register_data.password)
+        user = create_admin_user(register_data, hashed_password)
         
         # Convert user to UserRead format and return (no token needed)
         user_read = UserRead.model_validate(user)
         return user_read
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -210,4 +278,16 @@ async def register_admin(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create admin account: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get("/password-hasher/metrics", response_model=PasswordHasherStats)
+async def get_password_hasher_metrics(request: Request):
+    """Get queue depth, wait times and rejections of this process's password hashing pool (admin only)."""
+    current_user = request.state.user
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return password_hasher.stats()
@@ -0,0 +1,169 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.crud.appointments import (
+    get_calendar_feed_state,
+    iter_calendar_appointments,
+    decode_sync_token
+)
+from app.crud.auth import get_user_by_id
+from app.crud.profiles import get_profile_id_for_user
+from app.core.config import settings
+from app.models.auth import User
+from app.models.enums import AppointmentStatus
+from app.utils.auth import create_calendar_feed_token, verify_token, CALENDAR_SCOPE
+from app.utils.ical import (
+    render_calendar_start,
+    render_calendar_end,
+    render_event
+)
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/calendar")
+
+# Events are joined into chunks of about this size before they are written out
+FEED_CHUNK_BYTES = 64 * 1024
+
+EVENT_STATUS = {
+    AppointmentStatus.SCHEDULED: "TENTATIVE",
+    AppointmentStatus.CANCELLED: "CANCELLED",
+    AppointmentStatus.NO_SHOW: "CANCELLED",
+}
+
+
+def _render_feed(profile_id, is_doctor: bool, since: Optional[str], until: Optional[str]):
+    """Yield the .ics document in chunks while the appointments are streamed from the database."""
+    chunk = [render_calendar_start("MediTrack appointments")]
+    size = 0
+    for appointment, patient_name, doctor_name in iter_calendar_appointments(profile_id, is_doctor, since, until):
+        if is_doctor:
+            summary = f"Appointment: {patient_name}"
+        else:
+            summary = f"Appointment with Dr. {doctor_name}"
+        event = render_event(
+            uid=f"{appointment.id}@meditrack",
+            start=appointment.appointment_date,
+            end=appointment.appointment_date + timedelta(minutes=appointment.duration_minutes),
+            summary=summary,
+            last_modified=appointment.updated_at or appointment.created_at,
+            status=EVENT_STATUS.get(appointment.status, "CONFIRMED"),
+            description=appointment.reason,
+            location=appointment.meeting_link,
+            created=appointment.created_at,
+        )
+        chunk.append(event)
+        size += len(event)
+        if size >= FEED_CHUNK_BYTES:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    chunk.append(render_calendar_end())
+    yield "".join(chunk)
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Comparison is weak, so a W/ prefix on either side does not matter
+        return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+    return False
+
+
+def _calendar_response(request: Request, user: User, since: Optional[str]) -> Response:
+    profile_id = get_profile_id_for_user(user)
+    if not profile_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No appointments calendar for this user"
+        )
+
+    try:
+        if since:
+            decode_sync_token(since)
+        state = get_calendar_feed_state(profile_id, user.is_doctor, since)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error reading calendar feed state for user {user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build calendar feed"
+        )
+
+    # Names are not covered by updated_at, hence a weak validator
+    digest = hashlib.sha1(
+        f"{profile_id}|{since}|{state.sync_token}|{state.event_count}".encode()
+    ).hexdigest()
+    etag = f'W/"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if state.sync_token:
+        headers["X-Sync-Token"] = state.sync_token
+    if state.last_modified:
+        headers["Last-Modified"] = format_datetime(state.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if _not_modified(request, etag, state.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return StreamingResponse(
+        _render_feed(profile_id, user.is_doctor, since, state.sync_token),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
+
+
+@router.post("/feed-token", response_model=dict)
+async def create_feed_token(request: Request):
+    """
+    Create a subscription link for calendar apps.
+
+    The link embeds a token that only grants access to the feed, so it can be
+    pasted into Google Calendar, Outlook or Apple Calendar.
+    """
+    current_user: User = request.state.user
+    token = create_calendar_feed_token(current_user.id)
+    return {
+        "feed_url": f"{settings.BACKEND_URL}{settings.API_V1_STR}/calendar/feed/{token}.ics",
+        "expires_in": settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+    }
+
+
+@router.get("/my.ics")
+async def get_my_calendar(request: Request, since: Optional[str] = None):
+    """
+    Get the current user's appointments as an iCalendar feed.
+
+    Responses carry ETag and Last-Modified, so unchanged feeds answer 304.
+    X-Sync-Token can be passed back as since to receive only appointments
+    changed after it; cancellations come through as STATUS:CANCELLED events.
+    """
+    return _calendar_response(request, request.state.user, since)
+
+
+@router.get("/feed/{token}.ics")
+async def get_calendar_feed(token: str, request: Request, since: Optional[str] = None):
+    """Calendar feed for subscription links created by POST /calendar/feed-token."""
+    token_data = verify_token(token, scope=CALENDAR_SCOPE)
+    user = get_user_by_id(token_data.user_id) if token_data else None
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found"
+        )
+    return _calendar_response(request, user, since)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.models.auth import User
+from app.services.events import event_bus, stream_events
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events")
+
+
+# Live updates for the current user's dashboards
+@router.get("/stream")
+async def stream_my_events(request: Request):
+    """
+    Stream changes to the current user's appointments, prescriptions, health
+    metrics and notifications as server-sent events.
+
+    Each event is named after its topic and carries {"topic", "action", "ids"};
+    an empty ids list means many rows changed. A "resync" event means some
+    changes were missed and every topic should be refetched. Browsers'
+    EventSource cannot send headers, so the JWT may also be passed as the
+    access_token query parameter.
+    """
+    current_user: User = request.state.user
+    keys = [current_user.id]
+    if request.state.profile_id:
+        keys.append(request.state.profile_id)
+
+    async def events():
+        subscription = event_bus.subscribe(keys)
+        try:
+            async for chunk in stream_events(subscription):
+                yield chunk
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
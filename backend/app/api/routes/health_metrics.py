@@ -4,27 +4,44 @@ from app.schemas.health_metrics import (
     HealthMetricUpdate,
     HealthMetricRead,
     HealthMetricStats,
-    HealthMetricSearchFilters
+    HealthMetricSearchFilters,
+    HealthMetricBatchResult,
+    HealthMetricAggregate,
+    HealthMetricSeries,
+    AbnormalHealthMetricList,
+    AbnormalHealthMetricRead
 )
 from app.crud.health_metrics import (
     get_health_metric_by_id,
     create_health_metric,
+    bulk_create_health_metrics,
     update_health_metric,
     delete_health_metric,
     get_patient_health_metrics,
     get_patient_health_metrics_stats,
-    get_latest_health_metrics_for_dashboard
+    get_latest_health_metrics_for_dashboard,
+    get_health_metric_aggregates,
+    get_downsampled_health_metrics,
+    get_abnormal_health_metrics_for_doctor
 )
-from app.crud.profiles import get_patient_profile_by_user_id
+from app.crud.profiles import get_profile_id_for_user, get_doctor_profile_by_user_id
 from app.models.auth import User
-from app.models.enums import VitalType
+from app.models.enums import VitalType, MetricBucket
+from app.utils.health_metrics import naive_utc
+from pydantic import ValidationError
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
+import json
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on readings accepted by the bulk ingestion endpoint
+MAX_BATCH_SIZE = 5000
+# A serialized reading is a few hundred bytes; bodies beyond this are refused unread
+MAX_BATCH_BYTES = MAX_BATCH_SIZE * 1024
+
 router = APIRouter(prefix="/health-metrics")
 
 
@@ -37,13 +54,13 @@ async def get_patient_profile_id(user: User) -> uuid.UUID:
             detail="Only patients can access health metrics"
         )
     
-    profile = get_patient_profile_by_user_id(user.id)
-    if not profile:
+    profile_id = get_profile_id_for_user(user)
+    if not profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient profile not found"
         )
-    return profile.id
+    return profile_id
 
 
 # Get health metrics for current patient (dashboard)
@@ -163,6 +180,124 @@ async def get_my_health_metrics(
         )
 
 
+# Get time-bucketed aggregates for current patient
+@router.get("/my/aggregate", response_model=HealthMetricAggregate)
+async def get_my_health_metric_aggregates(
+    request: Request,
+    metric_type: VitalType = Query(...),
+    bucket: MetricBucket = Query(MetricBucket.DAY),
+    recorded_from: Optional[datetime] = Query(None),
+    recorded_to: Optional[datetime] = Query(None)
+):
+    """Get min/max/avg/count per hour, day or week for one vital type (defaults to the last 90 days)."""
+    try:
+        current_user: User = request.state.user
+        patient_profile_id = await get_patient_profile_id(current_user)
+
+        # recorded_at is naive UTC; aware bounds would not compare with the defaults
+        recorded_to = naive_utc(recorded_to) if recorded_to else datetime.utcnow()
+        recorded_from = naive_utc(recorded_from) if recorded_from else recorded_to - timedelta(days=90)
+        if recorded_from > recorded_to:
+            raise ValueError("recorded_from must be before recorded_to")
+
+        return get_health_metric_aggregates(
+            patient_profile_id, metric_type, bucket, recorded_from, recorded_to
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error aggregating health metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to aggregate health metrics"
+        )
+
+
+# Get downsampled chart series for current patient
+@router.get("/my/series", response_model=List[HealthMetricSeries])
+async def get_my_health_metric_series(
+    request: Request,
+    metric_type: Optional[VitalType] = Query(None),
+    recorded_from: Optional[datetime] = Query(None),
+    recorded_to: Optional[datetime] = Query(None),
+    recorded_by: Optional[str] = Query(None),
+    max_points: int = Query(500, ge=3, le=5000)
+):
+    """Get at most max_points points per vital type, downsampled with LTTB so spikes are kept."""
+    try:
+        current_user: User = request.state.user
+        patient_profile_id = await get_patient_profile_id(current_user)
+
+        filters = HealthMetricSearchFilters(
+            metric_type=metric_type,
+            recorded_from=recorded_from,
+            recorded_to=recorded_to,
+            recorded_by=recorded_by
+        )
+
+        return get_downsampled_health_metrics(patient_profile_id, filters, max_points)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting health metric series: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve health metric series"
+        )
+
+
+# Get abnormal readings across the current doctor's patients
+@router.get("/doctor/abnormal", response_model=AbnormalHealthMetricList)
+async def get_doctor_abnormal_health_metrics(
+    request: Request,
+    since: Optional[datetime] = Query(None, description="Defaults to the start of today (UTC)"),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0)
+):
+    """Get readings outside their normal range for patients the doctor has appointments with."""
+    try:
+        current_user: User = request.state.user
+
+        if not current_user.is_doctor:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only doctors can view abnormal readings"
+            )
+
+        doctor_profile = get_doctor_profile_by_user_id(current_user.id)
+        if not doctor_profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Doctor profile not found"
+            )
+
+        since = since or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        metrics, total_count = get_abnormal_health_metrics_for_doctor(
+            doctor_profile.id, since, limit, offset
+        )
+
+        return AbnormalHealthMetricList(
+            metrics=[AbnormalHealthMetricRead(**metric) for metric in metrics],
+            total_count=total_count
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting abnormal health metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve abnormal health metrics"
+        )
+
+
 # Create new health metric
 @router.post("/", response_model=HealthMetricRead)
 async def create_new_health_metric(
@@ -204,6 +339,118 @@ async def create_new_health_metric(
         )
 
 
+def _batch_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Batch size cannot exceed {MAX_BATCH_SIZE} readings"
+    )
+
+
+async def _read_batch_body(request: Request, ndjson: bool) -> bytes:
+    """Read the request body, stopping as soon as it exceeds the batch limits."""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BATCH_BYTES:
+        raise _batch_too_large()
+
+    chunks = []
+    size = 0
+    lines = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        lines += chunk.count(b"\n")
+        # NDJSON holds one reading per line; a trailing newline may follow the last one
+        if size > MAX_BATCH_BYTES or (ndjson and lines > MAX_BATCH_SIZE):
+            raise _batch_too_large()
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+# Bulk ingest health metrics (device sync)
+@router.post("/batch", response_model=HealthMetricBatchResult)
+async def create_health_metrics_batch(request: Request):
+    """
+    Ingest many health metrics in one request, as a JSON array or NDJSON
+    (Content-Type: application/x-ndjson). Rows are validated in one pass and
+    inserted together; invalid rows are reported by index and skipped.
+    """
+    try:
+        current_user: User = request.state.user
+
+        patient_profile_id = None
+        if current_user.is_patient:
+            patient_profile_id = await get_patient_profile_id(current_user)
+        elif not (current_user.is_doctor or current_user.is_admin):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only patients, doctors, and admins can create health metrics"
+            )
+
+        content_type = request.headers.get("content-type", "")
+        ndjson = "ndjson" in content_type or "jsonl" in content_type
+        body = await _read_batch_body(request, ndjson)
+        try:
+            if ndjson:
+                raw_rows = [
+                    json.loads(line) for line in body.splitlines() if line.strip()
+                ]
+            else:
+                raw_rows = json.loads(body or b"[]")
+        except json.JSONDecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid JSON payload: {e}"
+            )
+
+        if not isinstance(raw_rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Payload must be a JSON array or NDJSON"
+            )
+        if len(raw_rows) > MAX_BATCH_SIZE:
+            raise _batch_too_large()
+
+        valid_rows = []
+        errors = []
+        for index, raw in enumerate(raw_rows):
+            try:
+                metric = HealthMetricCreate.model_validate(raw)
+            except ValidationError as e:
+                errors.append({"index": index, "error": e.errors()[0]["msg"]})
+                continue
+            if patient_profile_id and metric.patient_id != patient_profile_id:
+                errors.append({
+                    "index": index,
+                    "error": "Patients can only create health metrics for themselves"
+                })
+                continue
+            valid_rows.append((index, metric))
+
+        inserted, insert_errors = bulk_create_health_metrics(valid_rows)
+        errors.extend(insert_errors)
+        errors.sort(key=lambda error: error["index"])
+
+        return HealthMetricBatchResult(
+            received=len(raw_rows),
+            inserted=inserted,
+            failed=len(errors),
+            errors=errors
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk creating health metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create health metrics"
+        )
+
+
 # Get health metric by ID
 @router.get("/{metric_id}", response_model=HealthMetricRead)
 async def get_health_metric(
@@ -16,7 +16,7 @@ from app.crud.medical_conditions import (
     get_active_medical_conditions,
     get_patient_allergies
 )
-from app.crud.profiles import get_patient_profile_by_user_id
+from app.crud.profiles import get_profile_id_for_user
 from app.models.auth import User
 from app.models.enums import ConditionType, ConditionStatus, AllergySeverity
 from typing import Optional, List
@@ -36,13 +36,13 @@ async def get_patient_profile_id(user: User) -> uuid.UUID:
             detail="Only patients can access medical conditions"
         )
     
-    profile = get_patient_profile_by_user_id(user.id)
-    if not profile:
+    profile_id = get_profile_id_for_user(user)
+    if not profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient profile not found"
         )
-    return profile.id
+    return profile_id
 
 
 # ===============================
@@ -24,7 +24,6 @@ from sqlmodel import Session, select
 from app.services import file_service
 from fastapi.responses import FileResponse
 from io import BytesIO
-from PIL import Image
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -97,6 +96,9 @@ async def upload_my_record(
 
         # Convert image to PDF if needed
         if is_image:
+            # Pillow is only loaded once an image is uploaded
+            from PIL import Image
+
             image = Image.open(BytesIO(file_bytes)).convert("RGB")
             temp_pdf_stream = BytesIO()
             image.save(temp_pdf_stream, format="PDF")
@@ -1,5 +1,6 @@
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     HTTPException,
     status,
     Query,
@@ -54,7 +55,10 @@ from app.crud.medications import (
     get_prescription_pdf_by_id,
     get_patient_prescription_pdfs,
     create_prescription_pdf_and_store,
+    bulk_update_prescription_status,
+    bulk_update_prescription_pdf_status,
 )
+from app.crud.notifications import notify_new_prescription
 from app.crud.profiles import (
     get_profile,
     get_user_profile_id,
@@ -79,9 +83,6 @@ from app.models.profiles import DoctorProfile
 from app.models.medications import Prescription
 from sqlmodel import select
 from io import BytesIO
-from PIL import Image
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -246,7 +247,10 @@ async def search_all_medications(
 # Create Prescription
 @router.post("/prescriptions", response_model=PrescriptionRead)
 async def create_new_prescription(
-    prescription_data: PrescriptionCreate, session: SessionDep, request: Request
+    prescription_data: PrescriptionCreate,
+    session: SessionDep,
+    request: Request,
+    background_tasks: BackgroundTasks,
 ):
     """Create a new prescription. Only doctors can create prescriptions."""
     try:
@@ -271,6 +275,8 @@ async def create_new_prescription(
             title=f"Prescription for {getattr(prescription, 'diagnosis', '') or 'Patient'}",
         )
         print(f"🔥{pdf_record}")
+        # Notify the patient after the response is sent
+        background_tasks.add_task(notify_new_prescription, prescription.id)
         # Optionally, you can return the PDF info as part of the response, or just the prescription
         # return {"prescription": PrescriptionRead.model_validate(prescription), "pdf": PrescriptionPDFRead.model_validate(pdf_record)}
         return PrescriptionRead.model_validate(prescription)
@@ -312,7 +318,9 @@ async def upload_prescription_pdf(
         temp_pdf_stream = None
 
         if is_image:
-            # Convert image to PDF
+            # Convert image to PDF; Pillow is only loaded once an image is uploaded
+            from PIL import Image
+
             image_bytes = await file.read()
             image = Image.open(BytesIO(image_bytes)).convert("RGB")
             temp_pdf_stream = BytesIO()
@@ -624,58 +632,62 @@ async def batch_update_prescriptions(
             detail="Only doctors and admins can perform batch operations",
         )
 
+    if not batch_data.status and not batch_data.notes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A status or notes is required",
+        )
+
+    if batch_data.pdf_ids and not batch_data.status:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Status is required to update prescription PDFs",
+        )
+
     try:
-        updated_count = 0
-        failed_updates = []
-
-        for prescription_id in batch_data.prescription_ids:
-            try:
-                # Check if user has access to this prescription
-                existing_prescription = get_prescription_by_id(prescription_id)
-                if not existing_prescription:
-                    failed_updates.append(
-                        {"id": prescription_id, "error": "Prescription not found"}
-                    )
-                    continue
-
-                # Check access permissions
-                if not current_user.is_admin:
-                    user_profile_id = await get_user_profile_id(current_user)
-                    if (
-                        existing_prescription.patient_id != user_profile_id
-                        and existing_prescription.doctor_id != user_profile_id
-                    ):
-                        failed_updates.append(
-                            {"id": prescription_id, "error": "Access denied"}
-                        )
-                        continue
-
-                # Create update data
-                update_data = PrescriptionUpdate()
-                if batch_data.status:
-                    update_data.status = batch_data.status
-                if batch_data.notes:
-                    update_data.notes = batch_data.notes
-
-                # Update prescription
-                updated_prescription = update_prescription(prescription_id, update_data)
-                if updated_prescription:
-                    updated_count += 1
-                else:
-                    failed_updates.append(
-                        {"id": prescription_id, "error": "Update failed"}
-                    )
+        # Ownership is enforced inside the UPDATE statements
+        doctor_id = None
+        uploaded_by = None
+        if not current_user.is_admin:
+            doctor_id = await get_user_profile_id(current_user)
+            uploaded_by = current_user.id
+
+        updated_ids = bulk_update_prescription_status(
+            batch_data.prescription_ids,
+            status=batch_data.status,
+            notes=batch_data.notes,
+            doctor_id=doctor_id,
+            current_status=batch_data.current_status,
+            chunk_size=batch_data.chunk_size,
+        )
+        updated_pdf_ids = []
+        if batch_data.pdf_ids:
+            updated_pdf_ids = bulk_update_prescription_pdf_status(
+                batch_data.pdf_ids,
+                status=batch_data.status,
+                uploaded_by=uploaded_by,
+                chunk_size=batch_data.chunk_size,
+            )
 
-            except Exception as e:
-                failed_updates.append({"id": prescription_id, "error": str(e)})
+        updated_set = set(updated_ids) | set(updated_pdf_ids)
+        failed_updates = [
+            {"id": item_id, "error": "Not found or access denied"}
+            for item_id in [*batch_data.prescription_ids, *batch_data.pdf_ids]
+            if item_id not in updated_set
+        ]
 
         return {
             "message": "Batch update completed",
-            "updated_count": updated_count,
+            "updated_count": len(updated_ids),
+            "pdf_updated_count": len(updated_pdf_ids),
             "failed_count": len(failed_updates),
             "failed_updates": failed_updates,
         }
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error in batch update: {e}")
         raise HTTPException(
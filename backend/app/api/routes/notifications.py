@@ -0,0 +1,82 @@
+from fastapi import APIRouter, HTTPException, Request, status, Query
+from app.schemas.notifications import NotificationRead, NotificationPage, NotificationMarkRead
+from app.crud.notifications import (
+    get_user_notifications,
+    get_unread_notification_count,
+    mark_notifications_read
+)
+from app.models.auth import User
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/notifications")
+
+
+# Get current user's inbox
+@router.get("/", response_model=NotificationPage)
+async def get_my_notifications(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    unread_only: bool = Query(False)
+):
+    """Get the current user's delivered notifications, newest first, with keyset pagination."""
+    try:
+        current_user: User = request.state.user
+        notifications, next_cursor = get_user_notifications(
+            current_user.id, limit, cursor, unread_only
+        )
+
+        return NotificationPage(
+            notifications=[NotificationRead.model_validate(n) for n in notifications],
+            next_cursor=next_cursor,
+            unread_count=get_unread_notification_count(current_user.id)
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error getting notifications: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve notifications"
+        )
+
+
+# Get current user's unread count
+@router.get("/unread-count", response_model=dict)
+async def get_my_unread_count(request: Request):
+    """Get the current user's unread notification count."""
+    current_user: User = request.state.user
+    return {"unread_count": get_unread_notification_count(current_user.id)}
+
+
+# Mark notifications read
+@router.post("/read", response_model=dict)
+async def mark_my_notifications_read(
+    read_data: NotificationMarkRead,
+    request: Request
+):
+    """Mark the given notifications, or all of them, as read."""
+    try:
+        current_user: User = request.state.user
+        updated_count = mark_notifications_read(
+            current_user.id, read_data.notification_ids, read_data.mark_all
+        )
+
+        return {
+            "updated_count": updated_count,
+            "unread_count": get_unread_notification_count(current_user.id)
+        }
+
+    except Exception as e:
+        logger.error(f"Error marking notifications read: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to mark notifications read"
+        )
@@ -1,5 +1,5 @@
 import secrets
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn, AnyUrl, BeforeValidator
 from functools import lru_cache
@@ -21,6 +21,38 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_BACKEND: str = "jose"  # or "pyjwt", faster but needs PyJWT installed
+    TOKEN_CACHE_TTL_SECONDS: float = 3600.0
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    TOKEN_REVOCATION_PURGE_SECONDS: float = 3600.0  # how often expired revocations are dropped
+
+    # get_profile results cached per worker (see app/crud/profiles.py)
+    PROFILE_CACHE_TTL_SECONDS: float = 30.0
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    PROFILE_ID_CACHE_TTL_SECONDS: float = 3600.0
+    PROFILE_ID_CACHE_MAX_ENTRIES: int = 100000
+
+    # Password hashing (see app/services/password_hasher.py); stored hashes are
+    # upgraded to PASSWORD_BCRYPT_ROUNDS the next time their owner logs in
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # waiting calls before logins are turned away with 503
+
+    # Production server (see gunicorn.conf.py); each worker has its own DB pool
+    WEB_BIND: str = "0.0.0.0:8000"
+    WEB_WORKERS: Optional[int] = None  # one per CPU core when unset
+    WEB_LOOP: str = "uvloop"
+    WEB_HTTP: str = "httptools"
+    WEB_PRELOAD_APP: bool = True  # import the app once in the master so workers share its memory
+    WEB_MAX_REQUESTS: int = 10000  # restart a worker after this many requests; 0 never restarts
+    WEB_MAX_REQUESTS_JITTER: int = 1000  # keeps workers from restarting all at once
+    WEB_TIMEOUT_SECONDS: int = 60
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30  # time to finish in-flight requests on shutdown or restart
+    WEB_KEEPALIVE_SECONDS: int = 5
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+
     API_V1_STR: str = "/api/v1"
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = [
         "http://localhost:3000",
@@ -33,6 +65,36 @@ class Settings(BaseSettings):
     GCP_SERVICE_ACCOUNT_KEY_PATH: str = "attensys-dev.json"
     GCP_SIGNED_URL_EXPIRATION: int = 3600  # 1 hour in seconds
 
+    # health_metrics partition maintenance (see scripts/maintain_partitions.py)
+    HEALTH_METRICS_PARTITION_MONTHS_AHEAD: int = 3
+    HEALTH_METRICS_RETENTION_MONTHS: Optional[int] = None  # keep everything when unset
+    HEALTH_METRICS_PARTITION_MAINTENANCE_IN_PROCESS: bool = True  # repeat it inside the API process
+    HEALTH_METRICS_PARTITION_CHECK_INTERVAL_SECONDS: float = 3600.0
+    HEALTH_METRICS_PARTITION_LOCK_TIMEOUT_MS: int = 2000
+
+    # Appointment reminder dispatch (see scripts/run_reminder_worker.py)
+    REMINDER_DISPATCH_IN_PROCESS: bool = False  # also run a dispatcher inside the API process
+    REMINDER_BATCH_SIZE: int = 100
+    REMINDER_POLL_INTERVAL_SECONDS: float = 5.0
+    REMINDER_CLAIM_TIMEOUT_SECONDS: int = 300
+    REMINDER_RETRY_DELAY_SECONDS: int = 60
+
+    # Notification dispatch (see scripts/run_notification_worker.py)
+    NOTIFICATION_DISPATCH_IN_PROCESS: bool = False
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_POLL_INTERVAL_SECONDS: float = 2.0
+    NOTIFICATION_CLAIM_TIMEOUT_SECONDS: int = 300
+    NOTIFICATION_RETRY_DELAY_SECONDS: int = 60
+
+    # Live update stream (see app/services/events.py)
+    EVENTS_CHANNEL: str = "meditrack_events"
+    EVENTS_HEARTBEAT_SECONDS: float = 20.0
+    EVENTS_QUEUE_SIZE: int = 100  # pending events per stream before it is told to resync
+    EVENTS_RECONNECT_SECONDS: float = 5.0
+
+    # Calendar (.ics) feed; subscription links carry their own long-lived token
+    CALENDAR_FEED_TOKEN_EXPIRE_DAYS: int = 365
+
     @property
     def POSTGRES_DATABASE_URL(self) -> PostgresDsn:
         return self.DATABASE_URL
@@ -1,24 +1,140 @@
 from sqlmodel import Session, select, and_, or_, func
+from sqlalchemy import update, true, tuple_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 from app.models.appointments import Appointment, AppointmentReminder
 from app.models.profiles import PatientProfile, DoctorProfile
 from app.models.auth import User
-from app.models.enums import AppointmentStatus
+from app.models.enums import AppointmentStatus, ChangeTopic
 from app.schemas.appointments import (
     AppointmentCreate,
     AppointmentUpdate,
     AppointmentSearchFilters,
     AppointmentReminderCreate,
-    AppointmentStats
+    AppointmentReminderDispatch,
+    AppointmentStats,
+    ReminderDispatchStats,
+    AvailableSlot,
+    DoctorAvailability,
+    DoctorAvailabilitySearchFilters,
+    DoctorSlotMatch,
+    CalendarFeedState
 )
 from app.db.session import engine
-from typing import Optional, List, Tuple
-from datetime import datetime
+from app.services.events import publish_change
+from app.crud.profiles import (
+    doctor_search_conditions,
+    record_doctor_patient_appointment,
+    refresh_doctor_patient_last_visit
+)
+from app.utils.availability import (
+    MAX_APPOINTMENT_MINUTES,
+    parse_availability,
+    compute_free_slots,
+    compute_free_slots_bulk
+)
+from typing import Optional, List, Tuple, Iterator
+from datetime import datetime, date, time, timedelta, timezone
+import numpy as np
+import base64
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Appointments in any other status hold their time slot
+NON_BLOCKING_STATUSES = [AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW]
+# Only appointments that are still going ahead get reminders
+REMINDER_STATUSES = [AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED]
+APPOINTMENT_CONFLICT_MESSAGE = "The doctor already has an appointment at that time"
+MAX_AVAILABILITY_DAYS = 31
+MAX_AVAILABILITY_SEARCH_DAYS = 14
+CALENDAR_FEED_BATCH_SIZE = 1000
+# updated_at is set before commit, so a change can become visible after a newer one was
+# already handed out; incremental syncs look back this far to pick such rows up again
+CALENDAR_SYNC_OVERLAP = timedelta(minutes=2)
+
+
+def _naive(value: datetime) -> datetime:
+    """appointment_date is stored without a time zone; aware values are taken as UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _skip_pending_reminders(session: Session, appointment_ids) -> None:
+    """Close out unsent reminders of appointments that no longer take place (is_sent without sent_at)."""
+    session.execute(
+        update(AppointmentReminder)
+        .where(
+            and_(
+                AppointmentReminder.appointment_id.in_(appointment_ids),
+                AppointmentReminder.is_sent == False
+            )
+        )
+        .values(is_sent=True, claimed_by=None, claimed_until=None)
+    )
+
+
+def _is_overlap_violation(error: IntegrityError) -> bool:
+    """Whether an IntegrityError came from ex_appointments_doctor_overlap."""
+    return getattr(error.orig, "pgcode", None) == "23P01"  # exclusion_violation
+
+
+def _booked_appointments(doctor_id: uuid.UUID, start: datetime, end: datetime):
+    """Query (id, appointment_date, duration_minutes) of a doctor's booked appointments overlapping [start, end)."""
+    # Bounding appointment_date on both sides keeps this a range scan on ix_appointments_doctor_date
+    return (
+        select(Appointment.id, Appointment.appointment_date, Appointment.duration_minutes)
+        .where(
+            and_(
+                Appointment.doctor_id == doctor_id,
+                Appointment.status.not_in(NON_BLOCKING_STATUSES),
+                Appointment.appointment_date < end,
+                Appointment.appointment_date > start - timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+            )
+        )
+    )
+
+
+def _find_conflicting_appointment(
+    session: Session,
+    doctor_id: uuid.UUID,
+    start: datetime,
+    duration_minutes: int,
+    exclude_id: Optional[uuid.UUID] = None,
+) -> Optional[uuid.UUID]:
+    """Id of a booked appointment of the doctor that overlaps the given time, if any."""
+    start = _naive(start)
+    end = start + timedelta(minutes=duration_minutes)
+    for appointment_id, booked_start, booked_minutes in session.exec(_booked_appointments(doctor_id, start, end)).all():
+        if appointment_id != exclude_id and booked_start + timedelta(minutes=booked_minutes) > start:
+            return appointment_id
+    return None
+
+
+def encode_sync_token(updated_at: datetime, appointment_id: uuid.UUID) -> str:
+    """Encode the position after an appointment change as an opaque calendar sync token."""
+    return base64.urlsafe_b64encode(f"{updated_at.isoformat()}|{appointment_id}".encode()).decode()
+
+
+def decode_sync_token(token: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a calendar sync token produced by encode_sync_token."""
+    try:
+        updated_at, appointment_id = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), uuid.UUID(appointment_id)
+    except Exception:
+        raise ValueError("Invalid sync token")
+
+
+def _calendar_feed_conditions(profile_id: uuid.UUID, is_doctor: bool, since: Optional[str]) -> list:
+    owner = Appointment.doctor_id if is_doctor else Appointment.patient_id
+    conditions = [owner == profile_id]
+    if since:
+        updated_at, _ = decode_sync_token(since)
+        conditions.append(Appointment.updated_at > updated_at - CALENDAR_SYNC_OVERLAP)
+    return conditions
+
 
 def get_appointment_by_id(appointment_id: uuid.UUID) -> Optional[Appointment]:
     """Get appointment by ID with relationships."""
@@ -59,6 +175,13 @@ def create_appointment(appointment_data: AppointmentCreate, created_by_patient_i
             if not patient_exists:
                 raise ValueError("Patient not found")
 
+            # The exclusion constraint is the guarantee; this gives the usual case a clear error
+            if _find_conflicting_appointment(
+                session, appointment_data.doctor_id,
+                appointment_data.appointment_date, appointment_data.duration_minutes
+            ):
+                raise ValueError(APPOINTMENT_CONFLICT_MESSAGE)
+
             # Create appointment
             db_appointment = Appointment(
                 patient_id=patient_id,
@@ -71,16 +194,27 @@ def create_appointment(appointment_data: AppointmentCreate, created_by_patient_i
                 meeting_link=appointment_data.meeting_link,
                 meeting_id=appointment_data.meeting_id,
                 consultation_fee=appointment_data.consultation_fee,
-                status=AppointmentStatus.SCHEDULED
+                status=AppointmentStatus.SCHEDULED,
+                updated_at=datetime.utcnow()
             )
 
             session.add(db_appointment)
+            session.flush()
+            record_doctor_patient_appointment(
+                session, appointment_data.doctor_id, patient_id, db_appointment.appointment_date
+            )
+            publish_change(
+                session, ChangeTopic.APPOINTMENTS, "created",
+                [patient_id, appointment_data.doctor_id], [db_appointment.id]
+            )
             session.commit()
             session.refresh(db_appointment)
             return db_appointment
 
         except IntegrityError as e:
             session.rollback()
+            if _is_overlap_violation(e):
+                raise ValueError(APPOINTMENT_CONFLICT_MESSAGE)
             logger.error(f"Database integrity error creating appointment: {e}")
             raise ValueError(
                 "Failed to create appointment - data integrity error")
@@ -107,11 +241,37 @@ def update_appointment(appointment_id: uuid.UUID, appointment_data: AppointmentU
             for field, value in update_data.items():
                 setattr(appointment, field, value)
 
+            if (
+                update_data.keys() & {"appointment_date", "duration_minutes", "status"}
+                and appointment.status not in NON_BLOCKING_STATUSES
+                and _find_conflicting_appointment(
+                    session, appointment.doctor_id, appointment.appointment_date,
+                    appointment.duration_minutes, exclude_id=appointment.id
+                )
+            ):
+                raise ValueError(APPOINTMENT_CONFLICT_MESSAGE)
+
+            appointment.updated_at = datetime.utcnow()
             session.add(appointment)
+            if "status" in update_data and appointment.status not in REMINDER_STATUSES:
+                _skip_pending_reminders(session, [appointment.id])
+            if "appointment_date" in update_data:
+                session.flush()
+                refresh_doctor_patient_last_visit(session, appointment.doctor_id, appointment.patient_id)
+            publish_change(
+                session, ChangeTopic.APPOINTMENTS, "updated",
+                [appointment.patient_id, appointment.doctor_id], [appointment.id]
+            )
             session.commit()
             session.refresh(appointment)
             return appointment
 
+        except IntegrityError as e:
+            session.rollback()
+            if _is_overlap_violation(e):
+                raise ValueError(APPOINTMENT_CONFLICT_MESSAGE)
+            logger.error(f"Database integrity error updating appointment {appointment_id}: {e}")
+            raise ValueError("Failed to update appointment - data integrity error")
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating appointment {appointment_id}: {e}")
@@ -130,7 +290,13 @@ def delete_appointment(appointment_id: uuid.UUID) -> bool:
                 return False
 
             appointment.status = AppointmentStatus.CANCELLED
+            appointment.updated_at = datetime.utcnow()
             session.add(appointment)
+            _skip_pending_reminders(session, [appointment.id])
+            publish_change(
+                session, ChangeTopic.APPOINTMENTS, "cancelled",
+                [appointment.patient_id, appointment.doctor_id], [appointment.id]
+            )
             session.commit()
             return True
 
@@ -140,6 +306,159 @@ def delete_appointment(appointment_id: uuid.UUID) -> bool:
             return False
 
 
+def get_doctor_free_slots(
+    doctor_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+    slot_minutes: int = 30,
+) -> DoctorAvailability:
+    """
+    Get a doctor's free slots between two dates (inclusive).
+
+    Working hours come from the doctor's available_days and booked
+    appointments are subtracted from them; both are read in one query.
+    Slots that have already started are left out.
+    """
+    if end_date < start_date:
+        raise ValueError("end_date cannot be before start_date")
+    if (end_date - start_date).days >= MAX_AVAILABILITY_DAYS:
+        raise ValueError(f"Date range cannot exceed {MAX_AVAILABILITY_DAYS} days")
+
+    window_start = max(datetime.combine(start_date, time()), datetime.now())
+    window_end = datetime.combine(end_date + timedelta(days=1), time())
+
+    with Session(engine) as session:
+        booked = _booked_appointments(doctor_id, window_start, window_end).subquery()
+        rows = session.exec(
+            select(DoctorProfile.available_days, booked.c.appointment_date, booked.c.duration_minutes)
+            .outerjoin(booked, true())
+            .where(DoctorProfile.id == doctor_id)
+        ).all()
+    if not rows:
+        raise ValueError("Doctor not found")
+
+    busy = [
+        (appointment_date, appointment_date + timedelta(minutes=duration_minutes))
+        for _, appointment_date, duration_minutes in rows
+        if appointment_date is not None
+    ]
+    slots = compute_free_slots(
+        parse_availability(rows[0][0]), busy, window_start, window_end, slot_minutes
+    )
+    return DoctorAvailability(
+        doctor_id=doctor_id,
+        start_date=start_date,
+        end_date=end_date,
+        slot_minutes=slot_minutes,
+        slots=[AvailableSlot(start=start, end=end) for start, end in slots],
+    )
+
+
+def search_doctor_availability(filters: DoctorAvailabilitySearchFilters) -> Tuple[List[DoctorSlotMatch], int]:
+    """
+    Find the earliest free slots across every doctor matching a doctor search.
+
+    Matching doctors and all of their booked appointments in the window are
+    read with two set-based queries, and slots for all doctors are computed
+    together by compute_free_slots_bulk. Doctors are ranked by their earliest
+    free slot, then by name.
+
+    Returns:
+        Tuple of (page of doctors, number of doctors with any free slot)
+    """
+    if filters.end_date < filters.start_date:
+        raise ValueError("end_date cannot be before start_date")
+    if (filters.end_date - filters.start_date).days >= MAX_AVAILABILITY_SEARCH_DAYS:
+        raise ValueError(f"Date range cannot exceed {MAX_AVAILABILITY_SEARCH_DAYS} days")
+    if filters.from_time and filters.to_time and filters.to_time <= filters.from_time:
+        raise ValueError("to_time must be after from_time")
+
+    window_start = max(datetime.combine(filters.start_date, time()), datetime.now())
+    window_end = datetime.combine(filters.end_date + timedelta(days=1), time())
+    conditions = doctor_search_conditions(
+        filters.specialization, filters.hospital_affiliation, filters.min_experience,
+        filters.max_fee, filters.is_verified, filters.name
+    )
+    conditions.append(DoctorProfile.available_days.is_not(None))
+
+    with Session(engine) as session:
+        doctors = session.exec(
+            select(
+                DoctorProfile.id,
+                DoctorProfile.available_days,
+                DoctorProfile.specialization,
+                DoctorProfile.hospital_affiliation,
+                DoctorProfile.consultation_fee,
+                User.first_name,
+                User.last_name
+            )
+            .join(User, DoctorProfile.user_id == User.id)
+            .where(*conditions)
+            .order_by(User.first_name, User.last_name, DoctorProfile.id)
+        ).all()
+        if not doctors:
+            return [], 0
+
+        matching_doctor_ids = (
+            select(DoctorProfile.id)
+            .join(User, DoctorProfile.user_id == User.id)
+            .where(*conditions)
+        )
+        booked = session.exec(
+            select(Appointment.doctor_id, Appointment.appointment_date, Appointment.duration_minutes)
+            .where(
+                and_(
+                    Appointment.doctor_id.in_(matching_doctor_ids),
+                    Appointment.status.not_in(NON_BLOCKING_STATUSES),
+                    Appointment.appointment_date < window_end,
+                    Appointment.appointment_date > window_start - timedelta(minutes=MAX_APPOINTMENT_MINUTES)
+                )
+            )
+        ).all()
+
+    doctor_index = {doctor.id: index for index, doctor in enumerate(doctors)}
+    slot_doctors, slot_starts = compute_free_slots_bulk(
+        [parse_availability(doctor.available_days) for doctor in doctors],
+        [
+            (doctor_index[doctor_id], appointment_date, appointment_date + timedelta(minutes=duration_minutes))
+            for doctor_id, appointment_date, duration_minutes in booked
+        ],
+        window_start,
+        window_end,
+        filters.slot_minutes,
+        filters.from_time.hour * 60 + filters.from_time.minute if filters.from_time else None,
+        filters.to_time.hour * 60 + filters.to_time.minute if filters.to_time else None,
+    )
+    if not len(slot_doctors):
+        return [], 0
+
+    # Slots are ordered by doctor then time, so each doctor's first slot is its earliest
+    available, first, counts = np.unique(slot_doctors, return_index=True, return_counts=True)
+    ranking = np.argsort(slot_starts[first], kind="stable")
+    page = ranking[filters.offset : filters.offset + filters.limit]
+
+    base = datetime.combine(window_start.date(), time())
+    step = timedelta(minutes=filters.slot_minutes)
+    results = []
+    for rank in page:
+        doctor = doctors[int(available[rank])]
+        start = int(first[rank])
+        slots = []
+        for minute in slot_starts[start : start + min(int(counts[rank]), filters.slots_per_doctor)]:
+            slot_start = base + timedelta(minutes=int(minute))
+            slots.append(AvailableSlot(start=slot_start, end=slot_start + step))
+        results.append(DoctorSlotMatch(
+            doctor_id=doctor.id,
+            doctor_name=f"{doctor.first_name} {doctor.last_name}",
+            specialization=doctor.specialization,
+            hospital_affiliation=doctor.hospital_affiliation,
+            consultation_fee=doctor.consultation_fee,
+            earliest_slot=slots[0].start,
+            slots=slots,
+        ))
+    return results, len(available)
+
+
 def search_appointments(filters: AppointmentSearchFilters) -> Tuple[List[dict], int]:
     """Search appointments with filtering and pagination."""
     with Session(engine) as session:
@@ -442,6 +761,77 @@ def get_appointment_stats(user: User) -> AppointmentStats:
             )
 
 
+def get_calendar_feed_state(
+    profile_id: uuid.UUID, is_doctor: bool, since: Optional[str] = None
+) -> CalendarFeedState:
+    """
+    Summarise a user's calendar feed without reading the appointments.
+
+    Both queries are answered from ix_appointments_{doctor,patient}_updated, so
+    a client polling an unchanged feed costs two index lookups.
+    """
+    conditions = _calendar_feed_conditions(profile_id, is_doctor, since)
+    with Session(engine) as session:
+        event_count = session.exec(
+            select(func.count()).select_from(Appointment).where(and_(*conditions))
+        ).one()
+        latest = session.exec(
+            select(Appointment.updated_at, Appointment.id)
+            .where(and_(*conditions))
+            .order_by(Appointment.updated_at.desc(), Appointment.id.desc())
+            .limit(1)
+        ).first()
+
+    if not latest:
+        return CalendarFeedState(event_count=0, sync_token=since)
+    return CalendarFeedState(
+        event_count=event_count,
+        last_modified=latest[0],
+        sync_token=encode_sync_token(*latest)
+    )
+
+
+def iter_calendar_appointments(
+    profile_id: uuid.UUID,
+    is_doctor: bool,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> Iterator[Tuple[Appointment, str, str]]:
+    """
+    Stream a user's appointments with the patient and doctor names, oldest change first.
+
+    Rows are fetched in batches of CALENDAR_FEED_BATCH_SIZE on a server-side
+    cursor, so a doctor with tens of thousands of appointments never has them
+    all in memory. until (a sync token from get_calendar_feed_state) caps the
+    stream at the snapshot the response headers describe.
+    """
+    conditions = _calendar_feed_conditions(profile_id, is_doctor, since)
+    if until:
+        conditions.append(tuple_(Appointment.updated_at, Appointment.id) <= decode_sync_token(until))
+
+    PatientUser = aliased(User)
+    DoctorUser = aliased(User)
+    statement = (
+        select(
+            Appointment,
+            func.concat(PatientUser.first_name, " ", PatientUser.last_name),
+            func.concat(DoctorUser.first_name, " ", DoctorUser.last_name)
+        )
+        .join(PatientProfile, PatientProfile.id == Appointment.patient_id)
+        .join(PatientUser, PatientUser.id == PatientProfile.user_id)
+        .join(DoctorProfile, DoctorProfile.id == Appointment.doctor_id)
+        .join(DoctorUser, DoctorUser.id == DoctorProfile.user_id)
+        .where(and_(*conditions))
+        .order_by(Appointment.updated_at, Appointment.id)
+        .execution_options(yield_per=CALENDAR_FEED_BATCH_SIZE)
+    )
+    with Session(engine) as session:
+        for appointment, patient_name, doctor_name in session.exec(statement):
+            yield appointment, patient_name, doctor_name
+            # Nothing is modified here; dropping each row keeps the identity map flat
+            session.expunge(appointment)
+
+
 # Appointment Reminder CRUD
 def create_appointment_reminder(reminder_data: AppointmentReminderCreate) -> AppointmentReminder:
     """Create an appointment reminder."""
@@ -462,6 +852,11 @@ def create_appointment_reminder(reminder_data: AppointmentReminderCreate) -> App
             )
 
             session.add(db_reminder)
+            session.flush()
+            publish_change(
+                session, ChangeTopic.APPOINTMENTS, "reminder_created",
+                [appointment.patient_id, appointment.doctor_id], [appointment.id]
+            )
             session.commit()
             session.refresh(db_reminder)
             return db_reminder
@@ -480,10 +875,12 @@ def get_pending_reminders(limit: int = 100) -> List[AppointmentReminder]:
 
             query = (
                 select(AppointmentReminder)
+                .join(Appointment, AppointmentReminder.appointment_id == Appointment.id)
                 .where(
                     and_(
                         AppointmentReminder.is_sent == False,
-                        AppointmentReminder.reminder_time <= current_time
+                        AppointmentReminder.reminder_time <= current_time,
+                        Appointment.status.in_(REMINDER_STATUSES)
                     )
                 )
                 .limit(limit)
@@ -521,6 +918,192 @@ def mark_reminder_sent(reminder_id: uuid.UUID) -> bool:
             return False
 
 
+def _due_reminder_ids(now: datetime, limit: int, *conditions):
+    """Subquery locking up to `limit` due, unclaimed reminders that match conditions on their appointment."""
+    return (
+        select(AppointmentReminder.id)
+        .join(Appointment, AppointmentReminder.appointment_id == Appointment.id)
+        .where(
+            and_(
+                AppointmentReminder.is_sent == False,
+                AppointmentReminder.reminder_time <= now,
+                or_(
+                    AppointmentReminder.claimed_until.is_(None),
+                    AppointmentReminder.claimed_until < now
+                ),
+                *conditions
+            )
+        )
+        .order_by(AppointmentReminder.reminder_time)
+        .limit(limit)
+        .with_for_update(of=AppointmentReminder, skip_locked=True)
+        .scalar_subquery()
+    )
+
+
+def claim_due_reminders(
+    worker_id: str,
+    limit: int = 100,
+    claim_timeout_seconds: int = 300,
+) -> List[AppointmentReminderDispatch]:
+    """
+    Claim a batch of due, unsent reminders for one dispatch worker.
+
+    Candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent
+    workers never claim the same reminder. The claim is a lease: reminders
+    held by a worker that dies are picked up again once claimed_until passes.
+    Due reminders of appointments no longer in REMINDER_STATUSES are closed
+    out instead of claimed.
+    """
+    with Session(engine) as session:
+        try:
+            now = datetime.now()
+            session.execute(
+                update(AppointmentReminder)
+                .where(AppointmentReminder.id.in_(_due_reminder_ids(now, limit, Appointment.status.not_in(REMINDER_STATUSES))))
+                .values(is_sent=True, claimed_by=None, claimed_until=None)
+            )
+            claimed_ids = session.execute(
+                update(AppointmentReminder)
+                .where(AppointmentReminder.id.in_(_due_reminder_ids(now, limit, Appointment.status.in_(REMINDER_STATUSES))))
+                .values(
+                    claimed_by=worker_id,
+                    claimed_until=now + timedelta(seconds=claim_timeout_seconds)
+                )
+                .returning(AppointmentReminder.id)
+            ).scalars().all()
+
+            if not claimed_ids:
+                session.commit()
+                return []
+
+            PatientUser = aliased(User)
+            DoctorUser = aliased(User)
+            rows = session.exec(
+                select(AppointmentReminder, Appointment.appointment_date, PatientUser, DoctorUser)
+                .join(Appointment, AppointmentReminder.appointment_id == Appointment.id)
+                .join(PatientProfile, Appointment.patient_id == PatientProfile.id)
+                .join(PatientUser, PatientProfile.user_id == PatientUser.id)
+                .join(DoctorProfile, Appointment.doctor_id == DoctorProfile.id)
+                .join(DoctorUser, DoctorProfile.user_id == DoctorUser.id)
+                .where(AppointmentReminder.id.in_(claimed_ids))
+                .order_by(AppointmentReminder.reminder_time)
+            ).all()
+            session.commit()
+
+            return [
+                AppointmentReminderDispatch(
+                    id=reminder.id,
+                    appointment_id=reminder.appointment_id,
+                    reminder_time=reminder.reminder_time,
+                    reminder_type=reminder.reminder_type,
+                    appointment_date=appointment_date,
+                    patient_user_id=patient_user.id,
+                    patient_name=patient_user.full_name,
+                    patient_email=patient_user.email,
+                    patient_phone=patient_user.phone,
+                    doctor_name=doctor_user.full_name,
+                )
+                for reminder, appointment_date, patient_user, doctor_user in rows
+            ]
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error claiming due reminders for worker {worker_id}: {e}")
+            raise
+
+
+def mark_reminders_sent(reminder_ids: List[uuid.UUID], worker_id: str) -> int:
+    """Mark reminders sent in one statement, only where this worker still holds the claim."""
+    if not reminder_ids:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            result = session.execute(
+                update(AppointmentReminder)
+                .where(
+                    and_(
+                        AppointmentReminder.id.in_(reminder_ids),
+                        AppointmentReminder.claimed_by == worker_id,
+                        AppointmentReminder.is_sent == False
+                    )
+                )
+                .values(is_sent=True, sent_at=datetime.now(), claimed_by=None, claimed_until=None)
+            )
+            session.commit()
+            return result.rowcount
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error marking reminders as sent for worker {worker_id}: {e}")
+            raise
+
+
+def release_reminders(reminder_ids: List[uuid.UUID], worker_id: str, retry_at: datetime) -> int:
+    """Give up this worker's claim on reminders that failed, making them due again at retry_at."""
+    if not reminder_ids:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            result = session.execute(
+                update(AppointmentReminder)
+                .where(
+                    and_(
+                        AppointmentReminder.id.in_(reminder_ids),
+                        AppointmentReminder.claimed_by == worker_id
+                    )
+                )
+                .values(claimed_by=None, claimed_until=retry_at)
+            )
+            session.commit()
+            return result.rowcount
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error releasing reminders for worker {worker_id}: {e}")
+            raise
+
+
+def get_reminder_dispatch_stats() -> ReminderDispatchStats:
+    """Get the reminder delivery backlog, lag and recent throughput."""
+    with Session(engine) as session:
+        now = datetime.now()
+        unsent_due = and_(
+            AppointmentReminder.is_sent == False,
+            AppointmentReminder.reminder_time <= now
+        )
+        in_flight_condition = and_(
+            AppointmentReminder.claimed_by.is_not(None),
+            AppointmentReminder.claimed_until >= now
+        )
+
+        pending_due, in_flight, oldest_due = session.exec(
+            select(
+                func.count(AppointmentReminder.id),
+                func.count(AppointmentReminder.id).filter(in_flight_condition),
+                func.min(AppointmentReminder.reminder_time)
+            ).where(unsent_due)
+        ).one()
+
+        sent_last_hour = session.exec(
+            select(func.count(AppointmentReminder.id)).where(
+                and_(
+                    AppointmentReminder.is_sent == True,
+                    AppointmentReminder.sent_at >= now - timedelta(hours=1)
+                )
+            )
+        ).one()
+
+        return ReminderDispatchStats(
+            pending_due=pending_due,
+            in_flight=in_flight,
+            oldest_due_lag_seconds=(now - oldest_due).total_seconds() if oldest_due else 0.0,
+            sent_last_hour=sent_last_hour
+        )
+
+
 def get_user_reminders(user: User, limit: int = 50) -> List[AppointmentReminder]:
     """Get reminders for a specific user's appointments."""
     with Session(engine) as session:
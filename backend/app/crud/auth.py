@@ -1,12 +1,15 @@
-from sqlmodel import Session, select
+from sqlmodel import Session, select, and_, or_
+from sqlalchemy import update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from app.models.auth import User
+from app.models.auth import User, RevokedToken
 from app.models.profiles import PatientProfile, DoctorProfile
 from app.models.enums import UserType
 from app.schemas.auth import UserCreate, PatientRegisterRequest, DoctorRegisterRequest, AdminRegisterRequest
 from app.utils.auth import get_password_hash
 from app.db.session import engine
-from typing import Optional
+from typing import Optional, List, Tuple
+from datetime import datetime
 import logging
 import uuid
 
@@ -61,12 +64,13 @@ def create_user(user_data: UserCreate) -> User:
         return db_user
 
 
-def create_patient_user(register_data: PatientRegisterRequest) -> User:
+def create_patient_user(register_data: PatientRegisterRequest, hashed_password: Optional[str] = None) -> User:
     """Create patient user with patient profile in a single transaction."""
     with Session(engine) as session:
         try:
-            # Hash password
-            hashed_password = get_password_hash(register_data.password)
+            # Routes hash on the password pool and pass the result in
+            if hashed_password is None:
+                hashed_password = get_password_hash(register_data.password)
 
             # Create user
             db_user = User(
@@ -120,12 +124,13 @@ def create_patient_user(register_data: PatientRegisterRequest) -> User:
             raise
 
 
-def create_doctor_user(register_data: DoctorRegisterRequest) -> User:
+def create_doctor_user(register_data: DoctorRegisterRequest, hashed_password: Optional[str] = None) -> User:
     """Create doctor user with doctor profile in a single transaction."""
     with Session(engine) as session:
         try:
-            # Hash password
-            hashed_password = get_password_hash(register_data.password)
+            # Routes hash on the password pool and pass the result in
+            if hashed_password is None:
+                hashed_password = get_password_hash(register_data.password)
 
             # Create user
             db_user = User(
@@ -178,12 +183,13 @@ def create_doctor_user(register_data: DoctorRegisterRequest) -> User:
             raise
 
 
-def create_admin_user(register_data: AdminRegisterRequest) -> User:
+def create_admin_user(register_data: AdminRegisterRequest, hashed_password: Optional[str] = None) -> User:
     """Create admin user (no additional profile needed)."""
     with Session(engine) as session:
         try:
-            # Hash password
-            hashed_password = get_password_hash(register_data.password)
+            # Routes hash on the password pool and pass the result in
+            if hashed_password is None:
+                hashed_password = get_password_hash(register_data.password)
 
             # Create user
             db_user = User(
@@ -215,6 +221,20 @@ def create_admin_user(register_data: AdminRegisterRequest) -> User:
             raise
 
 
+def update_password_hash(user_id: uuid.UUID, password_hash: str) -> bool:
+    """Replace a user's stored password hash, e.g. after a cost factor change."""
+    try:
+        with Session(engine) as session:
+            result = session.exec(
+                update(User).where(User.id == user_id).values(password_hash=password_hash)
+            )
+            session.commit()
+            return result.rowcount > 0
+    except Exception as e:
+        logger.error(f"Error updating password hash for user {user_id}: {e}")
+        return False
+
+
 def update_user(user_id: uuid.UUID, user_data: dict) -> Optional[User]:
     """Update user basic information."""
     with Session(engine) as session:
@@ -233,10 +253,61 @@ def update_user(user_id: uuid.UUID, user_data: dict) -> Optional[User]:
             session.add(db_user)
             session.commit()
             session.refresh(db_user)
+
+            # Imported here: app.crud.profiles depends on this module
+            from app.crud.profiles import invalidate_profile_cache
+            invalidate_profile_cache(user_id)
             return db_user
             
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating user: {e}")
             raise
- 
\ No newline at end of file
+ 
+
+
+# Token revocation
+def revoke_token(token_hash: str, user_id: uuid.UUID, expires_at: Optional[datetime]) -> None:
+    """Record a revoked token; revoking it again is a no-op."""
+    with Session(engine) as session:
+        try:
+            statement = pg_insert(RevokedToken).values(
+                token_hash=token_hash,
+                user_id=user_id,
+                expires_at=expires_at,
+                revoked_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=[RevokedToken.token_hash])
+            session.execute(statement)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error revoking token for user {user_id}: {e}")
+            raise
+
+
+def get_revoked_token_hashes(since: Optional[datetime] = None) -> List[Tuple[str, Optional[datetime], datetime]]:
+    """(token_hash, expires_at, revoked_at) of unexpired revocations, optionally only those revoked after since."""
+    with Session(engine) as session:
+        conditions = [
+            or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > datetime.utcnow())
+        ]
+        if since:
+            conditions.append(RevokedToken.revoked_at > since)
+        return session.exec(
+            select(RevokedToken.token_hash, RevokedToken.expires_at, RevokedToken.revoked_at).where(and_(*conditions))
+        ).all()
+
+
+def purge_expired_revoked_tokens(now: datetime) -> int:
+    """Delete revocations of tokens that have expired anyway; returns how many."""
+    with Session(engine) as session:
+        try:
+            result = session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= now)
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error purging expired revoked tokens: {e}")
+            raise
@@ -1,22 +1,60 @@
 from sqlmodel import Session, select, and_, func
+from sqlalchemy import insert, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from app.models.health_metrics import HealthMetric
+from app.models.health_metrics import HealthMetric, PatientLatestVital, HealthMetricDailyCount
 from app.models.profiles import PatientProfile
+from app.models.notifications import Notification
+from app.models.appointments import Appointment
+from app.models.auth import User
 from app.schemas.health_metrics import (
     HealthMetricCreate, 
     HealthMetricUpdate, 
     HealthMetricSearchFilters,
-    HealthMetricStats
+    HealthMetricStats,
+    HealthMetricAggregate,
+    HealthMetricBucket,
+    HealthMetricPoint,
+    HealthMetricSeries
 )
 from app.db.session import engine
-from app.models.enums import VitalType
+from app.models.enums import VitalType, MetricBucket, NotificationType, ChangeTopic
+from app.utils.health_metrics import parse_metric_value, is_abnormal_reading, effective_unit, naive_utc, CANONICAL_UNITS
+from app.utils.downsampling import lttb_indices
+from app.services.events import publish_change
+from app.crud.notifications import add_delivered_notifications
 from typing import Optional, List, Tuple
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, date, timedelta
+import numpy as np
 import logging
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT statement for bulk ingestion
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Largest number of buckets a single aggregation request may produce
+MAX_AGGREGATE_BUCKETS = 2000
+
+BUCKET_SIZES = {
+    MetricBucket.HOUR: timedelta(hours=1),
+    MetricBucket.DAY: timedelta(days=1),
+    MetricBucket.WEEK: timedelta(weeks=1),
+}
+
+# Rows fetched per round trip when streaming chart series
+SERIES_STREAM_BATCH_SIZE = 10000
+
+# Vital types shown on the patient dashboard, in display order
+DASHBOARD_VITAL_TYPES = [
+    VitalType.BLOOD_PRESSURE,
+    VitalType.HEART_RATE,
+    VitalType.TEMPERATURE,
+    VitalType.WEIGHT,
+]
+
 
 def get_health_metric_by_id(metric_id: uuid.UUID) -> Optional[HealthMetric]:
     """Get health metric by ID."""
@@ -30,6 +68,175 @@ def get_health_metric_by_id(metric_id: uuid.UUID) -> Optional[HealthMetric]:
             return None
 
 
+def _health_metric_values(metric_data: HealthMetricCreate) -> dict:
+    """Build the column values for a new health metric row."""
+    value_num, value_secondary, unit_normalized = parse_metric_value(
+        metric_data.metric_type, metric_data.value, metric_data.unit
+    )
+    return {
+        "id": uuid.uuid4(),
+        "created_at": datetime.utcnow(),
+        "patient_id": metric_data.patient_id,
+        "metric_type": metric_data.metric_type,
+        "value": metric_data.value,
+        "unit": metric_data.unit,
+        "recorded_at": naive_utc(metric_data.recorded_at) if metric_data.recorded_at else datetime.utcnow(),
+        "recorded_by": metric_data.recorded_by,
+        "notes": metric_data.notes,
+        "value_num": value_num,
+        "value_secondary": value_secondary,
+        "unit_normalized": unit_normalized,
+        "normal_min": metric_data.normal_min,
+        "normal_max": metric_data.normal_max,
+        "is_abnormal": is_abnormal_reading(
+            metric_data.metric_type, value_num, effective_unit(metric_data.value, metric_data.unit),
+            metric_data.normal_min, metric_data.normal_max
+        ),
+    }
+
+
+def _abnormal_vital_notification(user_id: uuid.UUID, readings: List[dict]) -> Notification:
+    """Build one notification for a patient's abnormal readings (newest first)."""
+    latest = readings[0]
+    label = latest["metric_type"].value.replace("_", " ").capitalize()
+    if len(readings) == 1:
+        message = f"{label} reading of {latest['value']} {latest['unit']} is outside your normal range."
+    else:
+        message = f"{len(readings)} new readings are outside your normal range, most recently {label.lower()} at {latest['value']} {latest['unit']}."
+
+    return Notification(
+        user_id=user_id,
+        notification_type=NotificationType.ABNORMAL_VITAL,
+        title="Abnormal health reading",
+        message=message,
+        related_entity_type="health_metric",
+        related_entity_id=latest["id"],
+    )
+
+
+def _upsert_latest_vitals(session: Session, rows: List[dict], only_if_newer: bool = True) -> None:
+    """
+    Point patient_latest_vitals at the newest of the given readings.
+
+    Each row needs id, patient_id, metric_type and recorded_at. With
+    only_if_newer, an existing pointer is only replaced by a reading recorded
+    at or after it, so backfilled history never hides the current value.
+    """
+    latest = {}
+    for row in rows:
+        key = (row["patient_id"], row["metric_type"])
+        if key not in latest or row["recorded_at"] >= latest[key]["recorded_at"]:
+            latest[key] = row
+    if not latest:
+        return
+
+    statement = pg_insert(PatientLatestVital).values([
+        {
+            "patient_id": row["patient_id"],
+            "metric_type": row["metric_type"],
+            "health_metric_id": row["id"],
+            "recorded_at": row["recorded_at"],
+        }
+        for row in latest.values()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[PatientLatestVital.patient_id, PatientLatestVital.metric_type],
+        set_={
+            "health_metric_id": statement.excluded.health_metric_id,
+            "recorded_at": statement.excluded.recorded_at,
+        },
+        where=(PatientLatestVital.recorded_at <= statement.excluded.recorded_at) if only_if_newer else None,
+    )
+    session.execute(statement)
+
+
+def _refresh_latest_vital(session: Session, patient_id: uuid.UUID, metric_type: VitalType) -> None:
+    """Recompute the latest-reading pointer after a reading was moved or removed."""
+    latest = session.exec(
+        select(HealthMetric.id, HealthMetric.recorded_at)
+        .where(
+            and_(
+                HealthMetric.patient_id == patient_id,
+                HealthMetric.metric_type == metric_type
+            )
+        )
+        .order_by(HealthMetric.recorded_at.desc(), HealthMetric.created_at.desc())
+        .limit(1)
+    ).first()
+
+    if latest is None:
+        session.execute(
+            delete(PatientLatestVital).where(
+                and_(
+                    PatientLatestVital.patient_id == patient_id,
+                    PatientLatestVital.metric_type == metric_type
+                )
+            )
+        )
+        return
+
+    _upsert_latest_vitals(
+        session,
+        [{"id": latest[0], "patient_id": patient_id, "metric_type": metric_type, "recorded_at": latest[1]}],
+        only_if_newer=False,
+    )
+
+
+def _adjust_daily_counts(
+    session: Session,
+    readings: List[Tuple[uuid.UUID, datetime]],
+    delta: int = 1,
+) -> None:
+    """Add delta to health_metric_daily_counts for each (patient_id, recorded_at) reading."""
+    counts = Counter((patient_id, recorded_at.date()) for patient_id, recorded_at in readings)
+    if not counts:
+        return
+
+    statement = pg_insert(HealthMetricDailyCount).values([
+        {"patient_id": patient_id, "day": day, "count": count * delta}
+        for (patient_id, day), count in counts.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[HealthMetricDailyCount.patient_id, HealthMetricDailyCount.day],
+        set_={"count": HealthMetricDailyCount.count + statement.excluded.count},
+    )
+    session.execute(statement)
+
+
+def _sum_daily_counts(session: Session, patient_id: uuid.UUID, since: Optional[date] = None) -> int:
+    """Sum a patient's daily reading counts, optionally from a given day onwards."""
+    query = select(func.coalesce(func.sum(HealthMetricDailyCount.count), 0)).where(
+        HealthMetricDailyCount.patient_id == patient_id
+    )
+    if since is not None:
+        query = query.where(HealthMetricDailyCount.day >= since)
+    return int(session.exec(query).one())
+
+
+def _get_latest_vitals(
+    session: Session,
+    patient_id: uuid.UUID,
+    metric_types: Optional[List[VitalType]] = None,
+) -> List[HealthMetric]:
+    """Get the latest reading of each vital type through patient_latest_vitals."""
+    query = (
+        select(HealthMetric)
+        .join(
+            PatientLatestVital,
+            # Matching recorded_at lets Postgres prune to one partition per reading
+            and_(
+                PatientLatestVital.health_metric_id == HealthMetric.id,
+                PatientLatestVital.recorded_at == HealthMetric.recorded_at
+            )
+        )
+        .where(PatientLatestVital.patient_id == patient_id)
+    )
+    if metric_types:
+        query = query.where(PatientLatestVital.metric_type.in_(metric_types))
+
+    return list(session.exec(query.order_by(PatientLatestVital.metric_type)).all())
+
+
 def create_health_metric(metric_data: HealthMetricCreate) -> HealthMetric:
     """Create a new health metric."""
     with Session(engine) as session:
@@ -41,19 +248,16 @@ def create_health_metric(metric_data: HealthMetricCreate) -> HealthMetric:
             if not patient_exists:
                 raise ValueError("Patient not found")
 
-            db_metric = HealthMetric(
-                patient_id=metric_data.patient_id,
-                metric_type=metric_data.metric_type,
-                value=metric_data.value,
-                unit=metric_data.unit,
-                recorded_at=metric_data.recorded_at or datetime.utcnow(),
-                recorded_by=metric_data.recorded_by,
-                notes=metric_data.notes,
-                normal_min=metric_data.normal_min,
-                normal_max=metric_data.normal_max,
-            )
+            values = _health_metric_values(metric_data)
+            db_metric = HealthMetric(**values)
 
             session.add(db_metric)
+            session.flush()
+            _upsert_latest_vitals(session, [values])
+            _adjust_daily_counts(session, [(values["patient_id"], values["recorded_at"])])
+            if values["is_abnormal"]:
+                add_delivered_notifications(session, [_abnormal_vital_notification(patient_exists.user_id, [values])])
+            publish_change(session, ChangeTopic.HEALTH_METRICS, "created", [values["patient_id"]], [values["id"]])
             session.commit()
             session.refresh(db_metric)
             return db_metric
@@ -68,6 +272,76 @@ def create_health_metric(metric_data: HealthMetricCreate) -> HealthMetric:
             raise
 
 
+def bulk_create_health_metrics(
+    metrics: List[Tuple[int, HealthMetricCreate]],
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+) -> Tuple[int, List[dict]]:
+    """
+    Insert many health metrics using multi-row INSERT statements.
+
+    Patient existence is verified once for the whole batch rather than per row.
+
+    Args:
+        metrics: (index, metric) pairs; the index is echoed back in errors
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        Tuple of (inserted count, list of {"index", "error"} dicts)
+    """
+    errors: List[dict] = []
+    if not metrics:
+        return 0, errors
+
+    with Session(engine) as session:
+        try:
+            patient_ids = {metric.patient_id for _, metric in metrics}
+            patient_user_ids = dict(
+                session.exec(
+                    select(PatientProfile.id, PatientProfile.user_id)
+                    .where(PatientProfile.id.in_(patient_ids))
+                ).all()
+            )
+
+            rows = []
+            for index, metric in metrics:
+                if metric.patient_id not in patient_user_ids:
+                    errors.append({"index": index, "error": "Patient not found"})
+                    continue
+                rows.append(_health_metric_values(metric))
+
+            for start in range(0, len(rows), chunk_size):
+                session.execute(insert(HealthMetric), rows[start : start + chunk_size])
+            _upsert_latest_vitals(session, rows)
+            _adjust_daily_counts(session, [(row["patient_id"], row["recorded_at"]) for row in rows])
+
+            # One notification per patient rather than per abnormal reading
+            abnormal = {}
+            for row in sorted(rows, key=lambda row: row["recorded_at"], reverse=True):
+                if row["is_abnormal"]:
+                    abnormal.setdefault(row["patient_id"], []).append(row)
+            add_delivered_notifications(session, [
+                _abnormal_vital_notification(patient_user_ids[patient_id], readings)
+                for patient_id, readings in abnormal.items()
+            ])
+
+            ids_by_patient = {}
+            for row in rows:
+                ids_by_patient.setdefault(row["patient_id"], []).append(row["id"])
+            for patient_id, ids in ids_by_patient.items():
+                publish_change(session, ChangeTopic.HEALTH_METRICS, "created", [patient_id], ids)
+            session.commit()
+            return len(rows), errors
+
+        except IntegrityError as e:
+            session.rollback()
+            logger.error(f"Database integrity error bulk creating health metrics: {e}")
+            raise ValueError("Failed to create health metrics - data integrity error")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error bulk creating health metrics: {e}")
+            raise
+
+
 def update_health_metric(metric_id: uuid.UUID, metric_data: HealthMetricUpdate) -> Optional[HealthMetric]:
     """Update health metric by ID."""
     with Session(engine) as session:
@@ -79,11 +353,48 @@ def update_health_metric(metric_id: uuid.UUID, metric_data: HealthMetricUpdate)
             if not db_metric:
                 return None
 
+            previous_type = db_metric.metric_type
+            previous_recorded_at = db_metric.recorded_at
+
             update_data = metric_data.model_dump(exclude_unset=True)
+            if update_data.get("recorded_at"):
+                update_data["recorded_at"] = naive_utc(update_data["recorded_at"])
             for field, value in update_data.items():
                 setattr(db_metric, field, value)
 
+            # Keep the parsed numeric columns in sync with the raw value
+            if update_data.keys() & {"metric_type", "value", "unit"}:
+                (
+                    db_metric.value_num,
+                    db_metric.value_secondary,
+                    db_metric.unit_normalized,
+                ) = parse_metric_value(db_metric.metric_type, db_metric.value, db_metric.unit)
+
+            if update_data.keys() & {"metric_type", "value", "unit", "normal_min", "normal_max"}:
+                was_abnormal = db_metric.is_abnormal
+                db_metric.is_abnormal = is_abnormal_reading(
+                    db_metric.metric_type, db_metric.value_num, effective_unit(db_metric.value, db_metric.unit),
+                    db_metric.normal_min, db_metric.normal_max
+                )
+                if db_metric.is_abnormal and not was_abnormal:
+                    patient_user_id = session.exec(
+                        select(PatientProfile.user_id).where(PatientProfile.id == db_metric.patient_id)
+                    ).one()
+                    add_delivered_notifications(session, [_abnormal_vital_notification(patient_user_id, [db_metric.model_dump()])])
+
             session.add(db_metric)
+
+            # Moving a reading in time or to another type can change which one is latest
+            if (db_metric.metric_type, db_metric.recorded_at) != (previous_type, previous_recorded_at):
+                session.flush()
+                for metric_type in {previous_type, db_metric.metric_type}:
+                    _refresh_latest_vital(session, db_metric.patient_id, metric_type)
+
+            if db_metric.recorded_at.date() != previous_recorded_at.date():
+                _adjust_daily_counts(session, [(db_metric.patient_id, previous_recorded_at)], delta=-1)
+                _adjust_daily_counts(session, [(db_metric.patient_id, db_metric.recorded_at)])
+
+            publish_change(session, ChangeTopic.HEALTH_METRICS, "updated", [db_metric.patient_id], [db_metric.id])
             session.commit()
             session.refresh(db_metric)
             return db_metric
@@ -109,7 +420,13 @@ def delete_health_metric(metric_id: uuid.UUID) -> bool:
             if not db_metric:
                 return False
 
+            patient_id, metric_type = db_metric.patient_id, db_metric.metric_type
+            recorded_at = db_metric.recorded_at
             session.delete(db_metric)
+            session.flush()
+            _refresh_latest_vital(session, patient_id, metric_type)
+            _adjust_daily_counts(session, [(patient_id, recorded_at)], delta=-1)
+            publish_change(session, ChangeTopic.HEALTH_METRICS, "deleted", [patient_id], [metric_id])
             session.commit()
             return True
 
@@ -164,48 +481,13 @@ def get_patient_health_metrics_stats(patient_id: uuid.UUID) -> HealthMetricStats
     with Session(engine) as session:
         try:
             # Get latest metrics (one of each type)
-            latest_metrics_query = """
-                SELECT DISTINCT ON (metric_type) *
-                FROM health_metrics
-                WHERE patient_id = :patient_id
-                ORDER BY metric_type, recorded_at DESC
-            """
-            
-            latest_metrics = session.exec(
-                select(HealthMetric).from_statement(
-                    latest_metrics_query
-                ).params(patient_id=patient_id)
-            ).all()
-
-            # Count total metrics
-            total_count = session.exec(
-                select(func.count(HealthMetric.id))
-                .where(HealthMetric.patient_id == patient_id)
-            ).one()
-
-            # Count metrics this week
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            metrics_this_week = session.exec(
-                select(func.count(HealthMetric.id))
-                .where(
-                    and_(
-                        HealthMetric.patient_id == patient_id,
-                        HealthMetric.recorded_at >= week_ago
-                    )
-                )
-            ).one()
+            latest_metrics = _get_latest_vitals(session, patient_id)
 
-            # Count metrics this month
-            month_ago = datetime.utcnow() - timedelta(days=30)
-            metrics_this_month = session.exec(
-                select(func.count(HealthMetric.id))
-                .where(
-                    and_(
-                        HealthMetric.patient_id == patient_id,
-                        HealthMetric.recorded_at >= month_ago
-                    )
-                )
-            ).one()
+            # Counts come from the per-day counters rather than scanning readings
+            today = datetime.utcnow().date()
+            total_count = _sum_daily_counts(session, patient_id)
+            metrics_this_week = _sum_daily_counts(session, patient_id, today - timedelta(days=7))
+            metrics_this_month = _sum_daily_counts(session, patient_id, today - timedelta(days=30))
 
             return HealthMetricStats(
                 latest_metrics=list(latest_metrics),
@@ -228,26 +510,212 @@ def get_latest_health_metrics_for_dashboard(patient_id: uuid.UUID) -> List[Healt
     """Get the latest health metrics for dashboard display (one of each type)."""
     with Session(engine) as session:
         try:
-            # Get the latest metric for each type
-            metrics = []
-            for vital_type in [VitalType.BLOOD_PRESSURE, VitalType.HEART_RATE, VitalType.TEMPERATURE, VitalType.WEIGHT]:
-                latest_metric = session.exec(
-                    select(HealthMetric)
-                    .where(
-                        and_(
-                            HealthMetric.patient_id == patient_id,
-                            HealthMetric.metric_type == vital_type
-                        )
-                    )
-                    .order_by(HealthMetric.recorded_at.desc())
-                    .limit(1)
-                ).first()
-                
-                if latest_metric:
-                    metrics.append(latest_metric)
-
-            return metrics
+            metrics = _get_latest_vitals(session, patient_id, DASHBOARD_VITAL_TYPES)
+            return sorted(metrics, key=lambda metric: DASHBOARD_VITAL_TYPES.index(metric.metric_type))
 
         except Exception as e:
             logger.error(f"Error getting latest health metrics for dashboard: {e}")
             return []
+
+
+def get_health_metric_aggregates(
+    patient_id: uuid.UUID,
+    metric_type: VitalType,
+    bucket: MetricBucket,
+    recorded_from: datetime,
+    recorded_to: datetime,
+) -> HealthMetricAggregate:
+    """
+    Get min/max/avg/count of a vital type per hour, day or week bucket.
+
+    Aggregation runs in SQL (date_trunc + GROUP BY) over the parsed numeric
+    columns, so only one row per bucket leaves the database.
+    """
+    bucket_count = (recorded_to - recorded_from) / BUCKET_SIZES[bucket]
+    if bucket_count > MAX_AGGREGATE_BUCKETS:
+        raise ValueError(
+            f"Requested range spans more than {MAX_AGGREGATE_BUCKETS} {bucket.value} buckets"
+        )
+
+    with Session(engine) as session:
+        # Inline the (enum-validated) unit so SELECT and GROUP BY render the same expression
+        bucket_start = func.date_trunc(
+            literal_column(f"'{bucket.value}'"), HealthMetric.recorded_at
+        ).label("bucket_start")
+        query = (
+            select(
+                bucket_start,
+                func.count(HealthMetric.id),
+                func.min(HealthMetric.value_num),
+                func.max(HealthMetric.value_num),
+                func.avg(HealthMetric.value_num),
+                func.avg(HealthMetric.value_secondary),
+            )
+            .where(
+                and_(
+                    HealthMetric.patient_id == patient_id,
+                    HealthMetric.metric_type == metric_type,
+                    HealthMetric.recorded_at >= recorded_from,
+                    HealthMetric.recorded_at <= recorded_to,
+                )
+            )
+            .group_by(bucket_start)
+            .order_by(bucket_start)
+        )
+        rows = session.exec(query).all()
+
+        return HealthMetricAggregate(
+            metric_type=metric_type,
+            bucket=bucket,
+            unit=CANONICAL_UNITS.get(metric_type),
+            recorded_from=recorded_from,
+            recorded_to=recorded_to,
+            buckets=[
+                HealthMetricBucket(
+                    bucket_start=row[0],
+                    count=row[1],
+                    min=row[2],
+                    max=row[3],
+                    avg=float(row[4]) if row[4] is not None else None,
+                    avg_secondary=float(row[5]) if row[5] is not None else None,
+                )
+                for row in rows
+            ],
+        )
+
+
+def _downsample_series(
+    metric_type: VitalType,
+    recorded_at: List[datetime],
+    values: List[float],
+    secondary: List[Optional[float]],
+    max_points: int,
+) -> HealthMetricSeries:
+    """Reduce one vital type's points to at most max_points with LTTB."""
+    x = np.fromiter((r.timestamp() for r in recorded_at), dtype=np.float64, count=len(recorded_at))
+    y = np.asarray(values, dtype=np.float64)
+    indices = lttb_indices(x, y, max_points)
+
+    return HealthMetricSeries(
+        metric_type=metric_type,
+        unit=CANONICAL_UNITS.get(metric_type),
+        source_count=len(values),
+        points=[
+            HealthMetricPoint(
+                recorded_at=recorded_at[i],
+                value=values[i],
+                value_secondary=secondary[i],
+            )
+            for i in indices
+        ],
+    )
+
+
+def get_downsampled_health_metrics(
+    patient_id: uuid.UUID,
+    filters: Optional[HealthMetricSearchFilters] = None,
+    max_points: int = 500,
+) -> List[HealthMetricSeries]:
+    """
+    Get chart series per vital type, each downsampled to at most max_points.
+
+    Only (metric_type, recorded_at, value_num, value_secondary) tuples are
+    streamed from the database in batches; no ORM objects are built. Readings
+    whose value could not be parsed are skipped.
+    """
+    with Session(engine) as session:
+        query = select(
+            HealthMetric.metric_type,
+            HealthMetric.recorded_at,
+            HealthMetric.value_num,
+            HealthMetric.value_secondary,
+        ).where(
+            HealthMetric.patient_id == patient_id,
+            HealthMetric.value_num.is_not(None),
+        )
+
+        if filters:
+            if filters.metric_type:
+                query = query.where(HealthMetric.metric_type == filters.metric_type)
+            if filters.recorded_from:
+                query = query.where(HealthMetric.recorded_at >= filters.recorded_from)
+            if filters.recorded_to:
+                query = query.where(HealthMetric.recorded_at <= filters.recorded_to)
+            if filters.recorded_by:
+                query = query.where(HealthMetric.recorded_by == filters.recorded_by)
+
+        query = query.order_by(HealthMetric.metric_type, HealthMetric.recorded_at)
+        result = session.execute(
+            query.execution_options(yield_per=SERIES_STREAM_BATCH_SIZE)
+        )
+
+        series = []
+        current_type = None
+        recorded_at, values, secondary = [], [], []
+        for metric_type, recorded, value_num, value_secondary in result:
+            if metric_type != current_type:
+                if values:
+                    series.append(_downsample_series(
+                        current_type, recorded_at, values, secondary, max_points
+                    ))
+                current_type = metric_type
+                recorded_at, values, secondary = [], [], []
+            recorded_at.append(recorded)
+            values.append(value_num)
+            secondary.append(value_secondary)
+
+        if values:
+            series.append(_downsample_series(
+                current_type, recorded_at, values, secondary, max_points
+            ))
+
+        return series
+
+
+def get_abnormal_health_metrics_for_doctor(
+    doctor_id: uuid.UUID,
+    since: datetime,
+    limit: int = 50,
+    offset: int = 0,
+) -> Tuple[List[dict], int]:
+    """
+    Get abnormal readings recorded since a point in time for a doctor's patients.
+
+    Patients are those the doctor has appointments with. The filter matches
+    the partial index on flagged readings, so cost depends on the number of
+    abnormal readings rather than the size of health_metrics.
+    """
+    with Session(engine) as session:
+        try:
+            doctor_patient_ids = select(Appointment.patient_id).where(Appointment.doctor_id == doctor_id)
+            base_query = (
+                select(HealthMetric, User.first_name, User.last_name)
+                .join(PatientProfile, HealthMetric.patient_id == PatientProfile.id)
+                .join(User, PatientProfile.user_id == User.id)
+                .where(
+                    and_(
+                        HealthMetric.is_abnormal,
+                        HealthMetric.recorded_at >= since,
+                        HealthMetric.patient_id.in_(doctor_patient_ids)
+                    )
+                )
+            )
+
+            count_query = select(func.count()).select_from(base_query.subquery())
+            total_count = session.exec(count_query).one()
+
+            results = session.exec(
+                base_query.order_by(HealthMetric.recorded_at.desc())
+                .offset(offset)
+                .limit(limit)
+            ).all()
+
+            metrics = [
+                {**metric.model_dump(), "patient_name": f"{first_name} {last_name}"}
+                for metric, first_name, last_name in results
+            ]
+            return metrics, total_count
+
+        except Exception as e:
+            logger.error(f"Error getting abnormal health metrics for doctor {doctor_id}: {e}")
+            return [], 0
@@ -1,5 +1,6 @@
 from fastapi import File
 from sqlmodel import Session, select, and_, or_, func
+from sqlalchemy import update as sa_update
 from sqlalchemy.exc import IntegrityError
 from app.models.medications import (
     Medication,
@@ -10,7 +11,7 @@ from app.models.medications import (
 )
 from app.models.profiles import PatientProfile, DoctorProfile
 from app.models.auth import User
-from app.models.enums import PrescriptionStatus
+from app.models.enums import PrescriptionStatus, ChangeTopic
 from app.schemas.medications import (
     MedicationCreate,
     MedicationUpdate,
@@ -29,6 +30,7 @@ import logging
 import uuid
 from app.services import file_service
 from app.services.pdf_service import render_prescription_pdf
+from app.services.events import publish_change, publish_topic_change
 from app.crud.profiles import get_profile
 
 logger = logging.getLogger(__name__)
@@ -264,6 +266,10 @@ def create_prescription(
                     instructions=item.instructions,
                 )
                 session.add(db_item)
+            publish_change(
+                session, ChangeTopic.PRESCRIPTIONS, "created",
+                [patient_id, doctor_id], [db_prescription.id]
+            )
             session.commit()
             session.refresh(db_prescription)
             db_prescription.items  # eager load
@@ -312,6 +318,10 @@ def update_prescription(
                     )
                     session.add(db_item)
             session.add(prescription)
+            publish_change(
+                session, ChangeTopic.PRESCRIPTIONS, "updated",
+                [prescription.patient_id, prescription.doctor_id], [prescription.id]
+            )
             session.commit()
             session.refresh(prescription)
             prescription.items  # eager load
@@ -349,6 +359,10 @@ def delete_prescription(prescription_id: uuid.UUID) -> bool:
 
             prescription.status = PrescriptionStatus.DISCONTINUED
             session.add(prescription)
+            publish_change(
+                session, ChangeTopic.PRESCRIPTIONS, "cancelled",
+                [prescription.patient_id, prescription.doctor_id], [prescription.id]
+            )
             session.commit()
             return True
 
@@ -358,6 +372,145 @@ def delete_prescription(prescription_id: uuid.UUID) -> bool:
             return False
 
 
+def _chunked(ids: List[uuid.UUID], chunk_size: Optional[int]) -> List[List[uuid.UUID]]:
+    """Split a list of IDs into chunks (a single chunk when chunk_size is unset)."""
+    if not chunk_size:
+        return [ids] if ids else []
+    return [ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+
+def _publish_prescription_updates(session: Session, rows) -> None:
+    """Announce updated (id, patient_id, doctor_id) prescription rows to their patients and doctors."""
+    publish_change(
+        session, ChangeTopic.PRESCRIPTIONS, "updated",
+        [profile_id for row in rows for profile_id in (row.patient_id, row.doctor_id)],
+        [row.id for row in rows]
+    )
+
+
+def bulk_update_prescription_status(
+    prescription_ids: List[uuid.UUID],
+    status: Optional[PrescriptionStatus] = None,
+    notes: Optional[str] = None,
+    doctor_id: Optional[uuid.UUID] = None,
+    current_status: Optional[PrescriptionStatus] = None,
+    chunk_size: Optional[int] = None,
+) -> List[uuid.UUID]:
+    """
+    Update status/notes for many prescriptions with set-based UPDATE statements.
+
+    Ownership is enforced in the WHERE clause: when doctor_id is given only
+    prescriptions written by that doctor are touched. When prescription_ids is
+    empty and current_status is given, every (owned) prescription in that status
+    is updated instead; that path announces one topic-wide change rather than
+    one event per recipient. With chunk_size set, each chunk is committed
+    separately so very large batches do not hold locks on the whole set.
+
+    Returns:
+        IDs of the prescriptions that were updated
+    """
+    values = {"updated_at": datetime.utcnow()}
+    if status:
+        values["status"] = status
+    if notes:
+        values["notes"] = notes
+    if len(values) == 1:
+        raise ValueError("A status or notes is required")
+
+    conditions = []
+    if doctor_id is not None:
+        conditions.append(Prescription.doctor_id == doctor_id)
+    if current_status:
+        conditions.append(Prescription.status == current_status)
+
+    updated_ids: List[uuid.UUID] = []
+    with Session(engine) as session:
+        try:
+            if prescription_ids:
+                for chunk in _chunked(prescription_ids, chunk_size):
+                    statement = (
+                        sa_update(Prescription)
+                        .where(Prescription.id.in_(chunk), *conditions)
+                        .values(**values)
+                        .returning(Prescription.id, Prescription.patient_id, Prescription.doctor_id)
+                    )
+                    rows = session.execute(statement).all()
+                    updated_ids.extend(row.id for row in rows)
+                    _publish_prescription_updates(session, rows)
+                    if chunk_size:
+                        session.commit()
+            elif current_status:
+                if not status or status == current_status:
+                    raise ValueError("A new status different from current_status is required")
+                # Rows leave the filter once updated, so keep updating chunks
+                # until a short chunk signals the set is exhausted.
+                while True:
+                    ids_query = select(Prescription.id).where(*conditions)
+                    if chunk_size:
+                        ids_query = ids_query.limit(chunk_size)
+                    statement = (
+                        sa_update(Prescription)
+                        .where(Prescription.id.in_(ids_query.scalar_subquery()))
+                        .values(**values)
+                        .returning(Prescription.id, Prescription.patient_id, Prescription.doctor_id)
+                    )
+                    rows = session.execute(statement).all()
+                    updated_ids.extend(row.id for row in rows)
+                    session.commit()
+                    if not chunk_size or len(rows) < chunk_size:
+                        break
+                # A status-wide update can reach thousands of users; one event tells them all to refetch
+                if updated_ids:
+                    publish_topic_change(session, ChangeTopic.PRESCRIPTIONS, "updated")
+            session.commit()
+            return updated_ids
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error bulk updating prescriptions: {e}")
+            raise
+
+
+def bulk_update_prescription_pdf_status(
+    pdf_ids: List[uuid.UUID],
+    status: PrescriptionStatus,
+    uploaded_by: Optional[uuid.UUID] = None,
+    chunk_size: Optional[int] = None,
+) -> List[uuid.UUID]:
+    """
+    Update the status of many uploaded prescription PDFs in set-based statements.
+
+    When uploaded_by is given only PDFs uploaded by that user are touched.
+
+    Returns:
+        IDs of the PDFs that were updated
+    """
+    conditions = []
+    if uploaded_by is not None:
+        conditions.append(PrescriptionPDF.uploaded_by == uploaded_by)
+
+    updated_ids: List[uuid.UUID] = []
+    with Session(engine) as session:
+        try:
+            for chunk in _chunked(pdf_ids, chunk_size):
+                statement = (
+                    sa_update(PrescriptionPDF)
+                    .where(PrescriptionPDF.id.in_(chunk), *conditions)
+                    .values(status=status, updated_at=datetime.utcnow())
+                    .returning(PrescriptionPDF.id)
+                )
+                updated_ids.extend(session.execute(statement).scalars().all())
+                if chunk_size:
+                    session.commit()
+            session.commit()
+            return updated_ids
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error bulk updating prescription PDFs: {e}")
+            raise
+
+
 def search_prescriptions(filters: PrescriptionSearchFilters) -> Tuple[List[dict], int]:
     """Search prescriptions with filtering and pagination."""
     with Session(engine) as session:
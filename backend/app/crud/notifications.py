@@ -0,0 +1,428 @@
+from sqlmodel import Session, select, and_, or_
+from sqlalchemy import insert, update, case, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.notifications import Notification, UserNotificationCounter
+from app.models.appointments import Appointment
+from app.models.medications import Prescription
+from app.models.profiles import PatientProfile, DoctorProfile
+from app.models.auth import User
+from app.models.enums import NotificationType, NotificationStatus, ChangeTopic
+from app.schemas.notifications import NotificationCreate, NotificationDispatch
+from app.db.session import engine
+from app.services.events import publish_change
+from typing import Optional, List, Tuple
+from collections import Counter
+from datetime import datetime, timedelta
+import base64
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Rows per multi-row INSERT statement for batch creation
+NOTIFICATION_INSERT_CHUNK_SIZE = 1000
+
+
+def _encode_cursor(sent_at: datetime, notification_id: uuid.UUID) -> str:
+    """Encode the position after a notification as an opaque keyset cursor."""
+    return base64.urlsafe_b64encode(f"{sent_at.isoformat()}|{notification_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a keyset cursor produced by _encode_cursor."""
+    try:
+        sent_at, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(sent_at), uuid.UUID(notification_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _adjust_unread_counts(session: Session, user_ids: List[uuid.UUID], delta: int = 1) -> None:
+    """Add delta to the unread counter of each user, once per occurrence in user_ids."""
+    counts = Counter(user_ids)
+    if not counts:
+        return
+
+    if delta > 0:
+        statement = pg_insert(UserNotificationCounter).values([
+            {"user_id": user_id, "unread_count": count * delta}
+            for user_id, count in counts.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserNotificationCounter.user_id],
+            set_={"unread_count": UserNotificationCounter.unread_count + statement.excluded.unread_count},
+        )
+        session.execute(statement)
+        return
+
+    for user_id, count in counts.items():
+        decrement = count * -delta
+        session.execute(
+            update(UserNotificationCounter)
+            .where(UserNotificationCounter.user_id == user_id)
+            .values(unread_count=case(
+                (UserNotificationCounter.unread_count > decrement, UserNotificationCounter.unread_count - decrement),
+                else_=0,
+            ))
+        )
+
+
+def create_notifications(notifications: List[NotificationCreate]) -> int:
+    """
+    Create many notifications with multi-row INSERT statements.
+
+    In-app notifications that are due now are delivered immediately; the
+    rest stay PENDING for the notification dispatcher.
+
+    Returns:
+        Number of notifications created
+    """
+    if not notifications:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            now = datetime.utcnow()
+            rows = []
+            delivered_user_ids = []
+            for notification in notifications:
+                immediate = notification.delivery_method is None and (
+                    notification.scheduled_for is None or notification.scheduled_for <= now
+                )
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "created_at": now,
+                    **notification.model_dump(),
+                    "status": NotificationStatus.SENT if immediate else NotificationStatus.PENDING,
+                    "sent_at": now if immediate else None,
+                })
+                if immediate:
+                    delivered_user_ids.append(notification.user_id)
+
+            for start in range(0, len(rows), NOTIFICATION_INSERT_CHUNK_SIZE):
+                session.execute(insert(Notification), rows[start : start + NOTIFICATION_INSERT_CHUNK_SIZE])
+            _adjust_unread_counts(session, delivered_user_ids)
+            publish_change(session, ChangeTopic.NOTIFICATIONS, "created", delivered_user_ids)
+            session.commit()
+            return len(rows)
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error creating notifications: {e}")
+            raise
+
+
+def add_delivered_notifications(session: Session, notifications: List[Notification]) -> None:
+    """
+    Add in-app notifications to the session as already delivered.
+
+    For writers that raise notifications inside their own transaction; like
+    create_notifications, they reach the inbox and unread count on commit
+    without waiting for the dispatcher.
+    """
+    if not notifications:
+        return
+
+    now = datetime.utcnow()
+    for notification in notifications:
+        notification.status = NotificationStatus.SENT
+        notification.sent_at = now
+    session.add_all(notifications)
+
+    user_ids = [notification.user_id for notification in notifications]
+    _adjust_unread_counts(session, user_ids)
+    publish_change(session, ChangeTopic.NOTIFICATIONS, "created", user_ids)
+
+
+def get_user_notifications(
+    user_id: uuid.UUID,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+) -> Tuple[List[Notification], Optional[str]]:
+    """
+    Get a page of a user's delivered notifications, newest first.
+
+    Uses keyset pagination on (sent_at, id), so deep pages cost the same as
+    the first one.
+
+    Returns:
+        Tuple of (notifications, cursor for the next page or None)
+    """
+    with Session(engine) as session:
+        query = select(Notification).where(
+            and_(
+                Notification.user_id == user_id,
+                Notification.sent_at.is_not(None)
+            )
+        )
+        if unread_only:
+            query = query.where(Notification.read_at.is_(None))
+        if cursor:
+            sent_at, notification_id = _decode_cursor(cursor)
+            query = query.where(tuple_(Notification.sent_at, Notification.id) < (sent_at, notification_id))
+
+        notifications = list(session.exec(
+            query.order_by(Notification.sent_at.desc(), Notification.id.desc())
+            .limit(limit + 1)
+        ).all())
+
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = _encode_cursor(last.sent_at, last.id)
+        return notifications, next_cursor
+
+
+def get_unread_notification_count(user_id: uuid.UUID) -> int:
+    """Get a user's unread count from the maintained counter."""
+    with Session(engine) as session:
+        try:
+            count = session.exec(
+                select(UserNotificationCounter.unread_count)
+                .where(UserNotificationCounter.user_id == user_id)
+            ).first()
+            return count or 0
+        except Exception as e:
+            logger.error(f"Error getting unread notification count for user {user_id}: {e}")
+            return 0
+
+
+def mark_notifications_read(
+    user_id: uuid.UUID,
+    notification_ids: Optional[List[uuid.UUID]] = None,
+    mark_all: bool = False,
+) -> int:
+    """
+    Mark a user's delivered notifications read in one statement.
+
+    Returns:
+        Number of notifications that changed from unread to read
+    """
+    if not mark_all and not notification_ids:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            conditions = [
+                Notification.user_id == user_id,
+                Notification.sent_at.is_not(None),
+                Notification.read_at.is_(None),
+            ]
+            if not mark_all:
+                conditions.append(Notification.id.in_(notification_ids))
+
+            updated_ids = session.execute(
+                update(Notification)
+                .where(and_(*conditions))
+                .values(read_at=datetime.utcnow(), status=NotificationStatus.READ)
+                .returning(Notification.id)
+            ).scalars().all()
+
+            _adjust_unread_counts(session, [user_id] * len(updated_ids), delta=-1)
+            if updated_ids:
+                publish_change(session, ChangeTopic.NOTIFICATIONS, "read", [user_id], updated_ids)
+            session.commit()
+            return len(updated_ids)
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error marking notifications read for user {user_id}: {e}")
+            raise
+
+
+def claim_due_notifications(
+    worker_id: str,
+    limit: int = 500,
+    claim_timeout_seconds: int = 300,
+) -> List[NotificationDispatch]:
+    """
+    Claim a batch of due PENDING notifications for one dispatch worker.
+
+    Same lease scheme as appointment reminders: FOR UPDATE SKIP LOCKED keeps
+    workers apart, and claims of a dead worker expire after the timeout.
+    """
+    with Session(engine) as session:
+        try:
+            now = datetime.utcnow()
+            due_ids = (
+                select(Notification.id)
+                .where(
+                    and_(
+                        Notification.status == NotificationStatus.PENDING,
+                        or_(Notification.scheduled_for.is_(None), Notification.scheduled_for <= now),
+                        or_(Notification.claimed_until.is_(None), Notification.claimed_until < now)
+                    )
+                )
+                .order_by(Notification.created_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            claimed_ids = session.execute(
+                update(Notification)
+                .where(Notification.id.in_(due_ids.scalar_subquery()))
+                .values(
+                    claimed_by=worker_id,
+                    claimed_until=now + timedelta(seconds=claim_timeout_seconds)
+                )
+                .returning(Notification.id)
+            ).scalars().all()
+
+            if not claimed_ids:
+                session.commit()
+                return []
+
+            rows = session.exec(
+                select(Notification, User.email, User.phone)
+                .join(User, Notification.user_id == User.id)
+                .where(Notification.id.in_(claimed_ids))
+            ).all()
+            session.commit()
+
+            return [
+                NotificationDispatch(
+                    id=notification.id,
+                    user_id=notification.user_id,
+                    email=email,
+                    phone=phone,
+                    title=notification.title,
+                    message=notification.message,
+                    delivery_method=notification.delivery_method,
+                    due_at=notification.scheduled_for or notification.created_at,
+                )
+                for notification, email, phone in rows
+            ]
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error claiming due notifications for worker {worker_id}: {e}")
+            raise
+
+
+def mark_notifications_sent(notification_ids: List[uuid.UUID], worker_id: str) -> int:
+    """Mark claimed notifications delivered and bump their users' unread counters."""
+    if not notification_ids:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            user_ids = session.execute(
+                update(Notification)
+                .where(
+                    and_(
+                        Notification.id.in_(notification_ids),
+                        Notification.claimed_by == worker_id,
+                        Notification.status == NotificationStatus.PENDING
+                    )
+                )
+                .values(
+                    status=NotificationStatus.SENT,
+                    sent_at=datetime.utcnow(),
+                    claimed_by=None,
+                    claimed_until=None
+                )
+                .returning(Notification.user_id)
+            ).scalars().all()
+
+            _adjust_unread_counts(session, list(user_ids))
+            publish_change(session, ChangeTopic.NOTIFICATIONS, "created", user_ids)
+            session.commit()
+            return len(user_ids)
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error marking notifications sent for worker {worker_id}: {e}")
+            raise
+
+
+def release_notifications(notification_ids: List[uuid.UUID], worker_id: str, retry_at: datetime) -> int:
+    """Give up this worker's claim on notifications that failed, making them due again at retry_at."""
+    if not notification_ids:
+        return 0
+
+    with Session(engine) as session:
+        try:
+            result = session.execute(
+                update(Notification)
+                .where(
+                    and_(
+                        Notification.id.in_(notification_ids),
+                        Notification.claimed_by == worker_id
+                    )
+                )
+                .values(claimed_by=None, claimed_until=retry_at)
+            )
+            session.commit()
+            return result.rowcount
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error releasing notifications for worker {worker_id}: {e}")
+            raise
+
+
+def notify_appointment_change(
+    appointment_id: uuid.UUID,
+    actor_user_id: uuid.UUID,
+    title: str,
+    message: str,
+) -> int:
+    """Notify the patient and doctor of an appointment, except whoever made the change."""
+    try:
+        with Session(engine) as session:
+            participants = session.exec(
+                select(PatientProfile.user_id, DoctorProfile.user_id)
+                .select_from(Appointment)
+                .join(PatientProfile, Appointment.patient_id == PatientProfile.id)
+                .join(DoctorProfile, Appointment.doctor_id == DoctorProfile.id)
+                .where(Appointment.id == appointment_id)
+            ).first()
+        if not participants:
+            return 0
+
+        return create_notifications([
+            NotificationCreate(
+                user_id=user_id,
+                notification_type=NotificationType.GENERAL,
+                title=title,
+                message=message,
+                related_entity_type="appointment",
+                related_entity_id=appointment_id,
+            )
+            for user_id in set(participants)
+            if user_id != actor_user_id
+        ])
+
+    except Exception as e:
+        # Runs after the response is sent; a failed notification must not surface as an error
+        logger.error(f"Error notifying appointment change {appointment_id}: {e}")
+        return 0
+
+
+def notify_new_prescription(prescription_id: uuid.UUID) -> int:
+    """Notify the patient that a prescription was issued for them."""
+    try:
+        with Session(engine) as session:
+            patient_user_id = session.exec(
+                select(PatientProfile.user_id)
+                .join(Prescription, Prescription.patient_id == PatientProfile.id)
+                .where(Prescription.id == prescription_id)
+            ).first()
+        if not patient_user_id:
+            return 0
+
+        return create_notifications([
+            NotificationCreate(
+                user_id=patient_user_id,
+                notification_type=NotificationType.GENERAL,
+                title="New prescription",
+                message="Your doctor has issued a new prescription. Open it to see the details.",
+                related_entity_type="prescription",
+                related_entity_id=prescription_id,
+            )
+        ])
+
+    except Exception as e:
+        logger.error(f"Error notifying new prescription {prescription_id}: {e}")
+        return 0
@@ -1,7 +1,10 @@
 from fastapi import HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel import Session, select, and_
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from app.models.profiles import DoctorBookmark, PatientProfile, DoctorProfile
+from app.models.profiles import DoctorBookmark, PatientProfile, DoctorProfile, DoctorPatientSummary
+from app.models.appointments import Appointment
 from app.schemas.profiles import (
     PatientProfileCreate,
     PatientProfileUpdate,
@@ -10,73 +13,138 @@ from app.schemas.profiles import (
 )
 from app.models.auth import User
 from app.db.session import engine
+from app.core.config import settings
+from app.utils.cache import TTLCache, get_request_cache
 from typing import Optional, Tuple, List
 from datetime import datetime
 import logging
+import re
 import uuid
-from sqlalchemy import func, or_
-from app.crud.auth import get_user_by_id
+from sqlalchemy import func, or_, case
 from datetime import date
 
 logger = logging.getLogger(__name__)
 
 
+# Shorter digit strings match too many phone numbers to be worth the prefix scan
+MIN_PHONE_SEARCH_DIGITS = 3
+
+# Flat (user + profile) dicts from get_profile, keyed by ("user", user_id) and ("profile", profile_id)
+_profile_cache = TTLCache(settings.PROFILE_CACHE_TTL_SECONDS, settings.PROFILE_CACHE_MAX_ENTRIES)
+_PROFILE_MODELS = (("patient", PatientProfile), ("doctor", DoctorProfile))
+
+
+def _profile_statement(user_id: Optional[uuid.UUID], profile_id: Optional[uuid.UUID]):
+    """One row with the user's columns and both profiles' columns, prefixed patient__/doctor__."""
+    columns = list(User.__table__.c)
+    for prefix, model in _PROFILE_MODELS:
+        columns += [
+            column.label(f"{prefix}__{column.name}")
+            for column in model.__table__.c if column.name != "user_id"
+        ]
+    statement = (
+        select(*columns)
+        .select_from(User)
+        .outerjoin(PatientProfile, PatientProfile.user_id == User.id)
+        .outerjoin(DoctorProfile, DoctorProfile.user_id == User.id)
+    )
+    if user_id:
+        return statement.where(User.id == user_id)
+    # Two primary key lookups rather than an OR across the outer joins
+    return statement.where(
+        User.id.in_(
+            select(PatientProfile.user_id).where(PatientProfile.id == profile_id)
+            .union_all(select(DoctorProfile.user_id).where(DoctorProfile.id == profile_id))
+        )
+    )
+
+
+def _flatten_profile_row(row) -> dict:
+    """User fields, overlaid with whichever profile exists (its id as profile_id)."""
+    result = {column.name: row[column.name] for column in User.__table__.c if column.computed is None}
+    for prefix, model in _PROFILE_MODELS:
+        if row[f"{prefix}__id"] is None:
+            continue
+        for column in model.__table__.c:
+            if column.name == "id":
+                result["profile_id"] = row[f"{prefix}__id"]
+            elif column.name != "user_id":
+                result[column.name] = row[f"{prefix}__{column.name}"]
+        break
+    return result
+
+
+def invalidate_profile_cache(user_id: uuid.UUID) -> None:
+    """Drop a user's cached profile in this worker; others see the change within the TTL."""
+    cached = _profile_cache.pop(("user", user_id))
+    if cached and cached.get("profile_id"):
+        _profile_cache.pop(("profile", cached["profile_id"]))
+    request_cache = get_request_cache()
+    if request_cache is not None:
+        request_cache.clear()
+
+
 async def get_profile(
     user_id: Optional[uuid.UUID] = None,
     profile_id: Optional[uuid.UUID] = None,
     password: bool = False,
 ) -> dict:
+    """
+    Get a user's fields merged with their patient or doctor profile.
+
+    Resolved with a single joined query, then cached for the rest of the
+    request and for PROFILE_CACHE_TTL_SECONDS in this worker, since PDF
+    generation and the medication routes call this once per row.
+    """
     if not (user_id or profile_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Either user_id or profile_id must be provided",
         )
 
-    user = None
-    profile = None
+    key = ("user", user_id) if user_id else ("profile", profile_id)
+    request_cache = get_request_cache()
+    # Password hashes are never cached
+    result = None
+    if not password:
+        result = request_cache.get(key) if request_cache is not None else None
+        if result is None:
+            result = _profile_cache.get(key)
 
-    if user_id:
-        user = get_user_by_id(user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found for the given user ID",
-            )
-        profile = get_patient_profile_by_user_id(
-            user_id
-        ) or get_doctor_profile_by_user_id(user_id)
-    elif profile_id:
+    if result is None:
         with Session(engine) as session:
-            profile = (
-                session.exec(
-                    select(PatientProfile).where(PatientProfile.id == profile_id)
-                ).first()
-                or session.exec(
-                    select(DoctorProfile).where(DoctorProfile.id == profile_id)
-                ).first()
-            )
-            if not profile:
+            row = session.exec(_profile_statement(user_id, profile_id)).mappings().first()
+        if not row:
+            if user_id:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Profile not found for the given profile ID",
+                    detail="User not found for the given user ID",
                 )
-            user = get_user_by_id(profile.user_id)
-
-    result = {}
-    if user:
-        for k, v in user.__dict__.items():
-            if k == "password_hash" and not password:
-                continue
-            if not k.startswith("_"):
-                result[k] = v
-    if profile:
-        for k, v in profile.__dict__.items():
-            if not k.startswith("_"):
-                if k == "id":
-                    result["profile_id"] = v
-                elif k != "user_id":
-                    result[k] = v
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found for the given profile ID",
+            )
+        result = _flatten_profile_row(row)
+        if password:
+            return _with_age(result)
+
+        result.pop("password_hash", None)
+        keys = [("user", result["id"])]
+        if result.get("profile_id"):
+            keys.append(("profile", result["profile_id"]))
+        for cache_key in keys:
+            _profile_cache.set(cache_key, result)
+            if request_cache is not None:
+                request_cache[cache_key] = result
+
+    elif request_cache is not None:
+        request_cache[key] = result
+
+    # Callers get their own copy to modify
+    return _with_age(dict(result))
 
+
+def _with_age(result: dict) -> dict:
     if "date_of_birth" in result and result["date_of_birth"]:
         dob = result["date_of_birth"]
         if isinstance(dob, str):
@@ -85,33 +153,55 @@ async def get_profile(
         result["age"] = (
             today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
         )
-
     return result
 
 
+# A user's profile never changes hands, so the mapping can be cached for long
+_profile_id_cache = TTLCache(settings.PROFILE_ID_CACHE_TTL_SECONDS, settings.PROFILE_ID_CACHE_MAX_ENTRIES)
+
+
+def get_profile_id_for_user(user: User) -> Optional[uuid.UUID]:
+    """
+    Get the id of the user's patient or doctor profile, or None if they have none.
+
+    AuthMiddleware resolves this for every request and stores it as
+    request.state.profile_id.
+    """
+    if not (user.is_patient or user.is_doctor):
+        return None
+
+    profile_id = _profile_id_cache.get(user.id)
+    if profile_id is None:
+        model = PatientProfile if user.is_patient else DoctorProfile
+        try:
+            with Session(engine) as session:
+                profile_id = session.exec(
+                    select(model.id).where(model.user_id == user.id)
+                ).first()
+        except Exception as e:
+            logger.error(f"Error resolving profile id for user {user.id}: {e}")
+            return None
+        # Only hits are cached; a profile may still be created for this user
+        if profile_id:
+            _profile_id_cache.set(user.id, profile_id)
+    return profile_id
+
+
 # Helper function to get user profile ID
 async def get_user_profile_id(user: User) -> uuid.UUID:
     """Get the profile ID for the current user based on their type."""
-    if user.is_patient:
-        profile = get_patient_profile_by_user_id(user.id)
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Patient profile not found",
-            )
-        return profile.id
-    elif user.is_doctor:
-        profile = get_doctor_profile_by_user_id(user.id)
-        if not profile:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Doctor profile not found"
-            )
-        return profile.id
-    else:
+    if not (user.is_patient or user.is_doctor):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only patients and doctors can access medications",
         )
+    profile_id = get_profile_id_for_user(user)
+    if not profile_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient profile not found" if user.is_patient else "Doctor profile not found",
+        )
+    return profile_id
 
 
 # Patient Profile CRUD
@@ -168,6 +258,7 @@ def update_patient_profile(
             session.add(db_profile)
             session.commit()
             session.refresh(db_profile)
+            invalidate_profile_cache(user_id)
             return db_profile
         except Exception as e:
             session.rollback()
@@ -245,6 +336,7 @@ def update_doctor_profile(
             session.add(db_profile)
             session.commit()
             session.refresh(db_profile)
+            invalidate_profile_cache(user_id)
             return db_profile
         except IntegrityError as e:
             session.rollback()
@@ -260,66 +352,73 @@ def update_doctor_profile(
 
 
 # Doctor Search Functions
-def search_doctors(
+def doctor_search_conditions(
     specialization: Optional[str] = None,
     hospital_affiliation: Optional[str] = None,
     min_experience: Optional[int] = None,
     max_fee: Optional[float] = None,
     is_verified: Optional[bool] = None,
-    location: Optional[str] = None,
     name: Optional[str] = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> list[DoctorProfile]:
-    """Search doctors with advanced filtering."""
-    try:
-        with Session(engine) as session:
-            # Build query with joins to get user data
-            from app.models.auth import User
+) -> list:
+    """WHERE conditions for a doctor search; the query must join DoctorProfile to User."""
+    conditions = [User.is_active]
 
-            statement = select(DoctorProfile).join(User)
+    if specialization:
+        conditions.append(DoctorProfile.specialization.ilike(f"%{specialization}%"))
 
-            # Add filters
-            if specialization:
-                statement = statement.where(
-                    DoctorProfile.specialization.ilike(f"%{specialization}%")
-                )
+    if hospital_affiliation:
+        conditions.append(
+            DoctorProfile.hospital_affiliation.ilike(f"%{hospital_affiliation}%")
+        )
 
-            if hospital_affiliation:
-                statement = statement.where(
-                    DoctorProfile.hospital_affiliation.ilike(
-                        f"%{hospital_affiliation}%"
-                    )
-                )
+    if min_experience is not None:
+        conditions.append(DoctorProfile.years_of_experience >= min_experience)
 
-            if min_experience is not None:
-                statement = statement.where(
-                    DoctorProfile.years_of_experience >= min_experience
-                )
+    if max_fee is not None:
+        conditions.append(DoctorProfile.consultation_fee <= max_fee)
+
+    if is_verified is not None:
+        conditions.append(DoctorProfile.is_verified == is_verified)
 
-            if max_fee is not None:
-                statement = statement.where(DoctorProfile.consultation_fee <= max_fee)
+    # Add name search filter
+    if name:
+        conditions.append(
+            or_(
+                User.first_name.ilike(f"%{name}%"),
+                User.last_name.ilike(f"%{name}%"),
+                (User.first_name + " " + User.last_name).ilike(f"%{name}%"),
+            )
+        )
 
-            if is_verified is not None:
-                statement = statement.where(DoctorProfile.is_verified == is_verified)
+    return conditions
 
-            # Add name search filter
-            if name:
-                from sqlalchemy import or_
 
-                statement = statement.where(
-                    or_(
-                        User.first_name.ilike(f"%{name}%"),
-                        User.last_name.ilike(f"%{name}%"),
-                        (User.first_name + " " + User.last_name).ilike(f"%{name}%"),
+def search_doctors(
+    specialization: Optional[str] = None,
+    hospital_affiliation: Optional[str] = None,
+    min_experience: Optional[int] = None,
+    max_fee: Optional[float] = None,
+    is_verified: Optional[bool] = None,
+    location: Optional[str] = None,
+    name: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[DoctorProfile]:
+    """Search doctors with advanced filtering."""
+    try:
+        with Session(engine) as session:
+            statement = (
+                select(DoctorProfile)
+                .join(User)
+                .where(
+                    *doctor_search_conditions(
+                        specialization, hospital_affiliation, min_experience,
+                        max_fee, is_verified, name
                     )
                 )
-
-            # Filter by active users only
-            statement = statement.where(User.is_active)
-
-            # Add pagination
-            statement = statement.offset(offset).limit(limit)
+                .offset(offset)
+                .limit(limit)
+            )
 
             return session.exec(statement).all()
     except Exception as e:
@@ -339,46 +438,16 @@ def get_doctor_count(
     """Get count of doctors matching search criteria."""
     try:
         with Session(engine) as session:
-            from app.models.auth import User
-            from sqlalchemy import func, or_
-
-            statement = select(func.count(DoctorProfile.id)).join(User)
-
-            # Add same filters as search
-            if specialization:
-                statement = statement.where(
-                    DoctorProfile.specialization.ilike(f"%{specialization}%")
-                )
-
-            if hospital_affiliation:
-                statement = statement.where(
-                    DoctorProfile.hospital_affiliation.ilike(
-                        f"%{hospital_affiliation}%"
-                    )
-                )
-
-            if min_experience is not None:
-                statement = statement.where(
-                    DoctorProfile.years_of_experience >= min_experience
-                )
-
-            if max_fee is not None:
-                statement = statement.where(DoctorProfile.consultation_fee <= max_fee)
-
-            if is_verified is not None:
-                statement = statement.where(DoctorProfile.is_verified == is_verified)
-
-            # Add name search filter
-            if name:
-                statement = statement.where(
-                    or_(
-                        User.first_name.ilike(f"%{name}%"),
-                        User.last_name.ilike(f"%{name}%"),
-                        (User.first_name + " " + User.last_name).ilike(f"%{name}%"),
+            statement = (
+                select(func.count(DoctorProfile.id))
+                .join(User)
+                .where(
+                    *doctor_search_conditions(
+                        specialization, hospital_affiliation, min_experience,
+                        max_fee, is_verified, name
                     )
                 )
-
-            statement = statement.where(User.is_active)
+            )
 
             return session.exec(statement).first() or 0
     except Exception as e:
@@ -412,83 +481,127 @@ def get_user_with_profile(user_id: uuid.UUID) -> Optional[dict]:
         return None
 
 
-def get_all_patients_for_doctor(
-    doctor_id: uuid.UUID, limit: int = 50, offset: int = 0
-) -> Tuple[List[dict], int]:
-    """Get all patients that a doctor has seen (through appointments)."""
-    try:
-        with Session(engine) as session:
-            from app.models.auth import User
-            from app.models.appointments import Appointment
-
-            # Get patients through appointments
-            base_query = (
-                select(
-                    PatientProfile,
-                    User.first_name,
-                    User.last_name,
-                    User.email,
-                    User.phone,
-                    func.count(Appointment.id).label("appointment_count"),
-                    func.max(Appointment.appointment_date).label("last_visit"),
-                )
-                .join(User, PatientProfile.user_id == User.id)
-                .join(Appointment, PatientProfile.id == Appointment.patient_id)
-                .where(Appointment.doctor_id == doctor_id)
-                .group_by(
-                    PatientProfile.id,
-                    User.first_name,
-                    User.last_name,
-                    User.email,
-                    User.phone,
-                )
-            )
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _patient_search(search_term: str):
+    """
+    (match condition, rank) for a patient type-ahead search.
+
+    Names and email are matched as substrings through the trigram indexes;
+    phone numbers by digits-only prefix on users.phone_digits, so
+    "+880 1712" finds 8801712345678. Rank 0 is an exact match, 1 a prefix
+    of a name, email or phone, 2 anything else.
+    """
+    term = search_term.strip().lower()
+    pattern = f"%{_escape_like(term)}%"
+    prefix_pattern = f"{_escape_like(term)}%"
+    full_name = User.first_name + " " + User.last_name
+
+    matches = [full_name.ilike(pattern, escape="\\"), User.email.ilike(pattern, escape="\\")]
+    exact = [
+        func.lower(full_name) == term,
+        func.lower(User.first_name) == term,
+        func.lower(User.last_name) == term,
+        func.lower(User.email) == term,
+    ]
+    prefix = [
+        User.first_name.ilike(prefix_pattern, escape="\\"),
+        User.last_name.ilike(prefix_pattern, escape="\\"),
+        User.email.ilike(prefix_pattern, escape="\\"),
+    ]
+
+    digits = re.sub(r"\D", "", term)
+    if len(digits) >= MIN_PHONE_SEARCH_DIGITS:
+        phone_prefix = User.phone_digits.like(f"{digits}%")
+        matches.append(phone_prefix)
+        exact.append(User.phone_digits == digits)
+        prefix.append(phone_prefix)
+
+    rank = case((or_(*exact), 0), (or_(*prefix), 1), else_=2)
+    return or_(*matches), rank
+
+
+def _doctor_patients_statement(doctor_id: uuid.UUID, search_term: Optional[str] = None):
+    """Patients of a doctor from doctor_patient_summary; best matches, then most recent appointment, first."""
+    conditions = [
+        DoctorPatientSummary.doctor_id == doctor_id,
+        DoctorPatientSummary.appointment_count > 0,
+    ]
+    order_by = []
+    if search_term:
+        match, rank = _patient_search(search_term)
+        conditions.append(match)
+        order_by.append(rank)
+    order_by += [DoctorPatientSummary.last_visit.desc(), DoctorPatientSummary.patient_id]
+
+    return (
+        select(
+            PatientProfile,
+            User.first_name,
+            User.last_name,
+            User.email,
+            User.phone,
+            DoctorPatientSummary.appointment_count,
+            DoctorPatientSummary.last_visit,
+            DoctorPatientSummary.is_bookmarked,
+        )
+        .select_from(DoctorPatientSummary)
+        .join(PatientProfile, PatientProfile.id == DoctorPatientSummary.patient_id)
+        .join(User, PatientProfile.user_id == User.id)
+        .where(*conditions)
+        .order_by(*order_by)
+    )
 
-            # Get total count
-            count_query = select(func.count()).select_from(base_query.subquery())
-            total_count = session.exec(count_query).first()
 
-            # Apply pagination
-            patients_query = (
-                base_query.offset(offset)
-                .limit(limit)
-                .order_by(func.max(Appointment.appointment_date).desc())
+def _list_doctor_patients(
+    doctor_id: uuid.UUID, search_term: Optional[str], limit: int, offset: int
+) -> Tuple[List[dict], int]:
+    with Session(engine) as session:
+        statement = _doctor_patients_statement(doctor_id, search_term)
+        if search_term:
+            count_query = select(func.count()).select_from(statement.order_by(None).subquery())
+        else:
+            # Without a name filter the count never needs the users table
+            count_query = select(func.count()).where(
+                DoctorPatientSummary.doctor_id == doctor_id,
+                DoctorPatientSummary.appointment_count > 0,
             )
-
-            results = session.exec(patients_query).all()
-
-            # Format results
-            patients = []
-            for result in results:
-                (
-                    patient_profile,
-                    first_name,
-                    last_name,
-                    email,
-                    phone,
-                    appointment_count,
-                    last_visit,
-                ) = result
-
-                # Calculate age
-                age = None
-                if patient_profile.date_of_birth:
-                    from datetime import date
-
-                    today = date.today()
-                    age = (
-                        today.year
-                        - patient_profile.date_of_birth.year
-                        - (
-                            (today.month, today.day)
-                            < (
-                                patient_profile.date_of_birth.month,
-                                patient_profile.date_of_birth.day,
-                            )
+        total_count = session.exec(count_query).one()
+
+        # Unfiltered lists walk ix_doctor_patient_summary_doctor_last_visit backwards
+        results = session.exec(statement.offset(offset).limit(limit)).all()
+
+        patients = []
+        for (
+            patient_profile,
+            first_name,
+            last_name,
+            email,
+            phone,
+            appointment_count,
+            last_visit,
+            is_bookmarked,
+        ) in results:
+            # Calculate age
+            age = None
+            if patient_profile.date_of_birth:
+                today = date.today()
+                age = (
+                    today.year
+                    - patient_profile.date_of_birth.year
+                    - (
+                        (today.month, today.day)
+                        < (
+                            patient_profile.date_of_birth.month,
+                            patient_profile.date_of_birth.day,
                         )
                     )
+                )
 
-                patient_dict = {
+            patients.append(
+                {
                     "id": str(patient_profile.id),
                     "name": f"{first_name} {last_name}",
                     "email": email,
@@ -504,11 +617,19 @@ def get_all_patients_for_doctor(
                     "emergency_contact_phone": patient_profile.emergency_contact_phone,
                     "address": patient_profile.address,
                     "insurance_info": patient_profile.insurance_info,
+                    "is_bookmarked": is_bookmarked,
                 }
-                patients.append(patient_dict)
+            )
 
-            return patients, total_count
+        return patients, total_count
 
+
+def get_all_patients_for_doctor(
+    doctor_id: uuid.UUID, limit: int = 50, offset: int = 0
+) -> Tuple[List[dict], int]:
+    """Get all patients that a doctor has seen (through appointments)."""
+    try:
+        return _list_doctor_patients(doctor_id, None, limit, offset)
     except Exception as e:
         logger.error(f"Error fetching patients for doctor {doctor_id}: {e}")
         return [], 0
@@ -588,116 +709,74 @@ def search_patients_for_doctor(
     offset: int = 0,
 ) -> Tuple[List[dict], int]:
     """Search patients for a doctor with optional search term."""
+    if search_term and not search_term.strip():
+        search_term = None
     try:
-        with Session(engine) as session:
-            from app.models.auth import User
-            from app.models.appointments import Appointment
-
-            # Base query
-            base_query = (
-                select(
-                    PatientProfile,
-                    User.first_name,
-                    User.last_name,
-                    User.email,
-                    User.phone,
-                    func.count(Appointment.id).label("appointment_count"),
-                    func.max(Appointment.appointment_date).label("last_visit"),
-                )
-                .join(User, PatientProfile.user_id == User.id)
-                .join(Appointment, PatientProfile.id == Appointment.patient_id)
-                .where(Appointment.doctor_id == doctor_id)
-            )
-
-            # Add search filter if provided
-            if search_term:
-                base_query = base_query.where(
-                    or_(
-                        User.first_name.ilike(f"%{search_term}%"),
-                        User.last_name.ilike(f"%{search_term}%"),
-                        User.email.ilike(f"%{search_term}%"),
-                        User.phone.ilike(f"%{search_term}%"),
-                    )
-                )
-
-            base_query = base_query.group_by(
-                PatientProfile.id,
-                User.first_name,
-                User.last_name,
-                User.email,
-                User.phone,
-            )
-
-            # Get total count
-            count_query = select(func.count()).select_from(base_query.subquery())
-            total_count = session.exec(count_query).first()
-
-            # Apply pagination and get results
-            patients_query = (
-                base_query.offset(offset)
-                .limit(limit)
-                .order_by(func.max(Appointment.appointment_date).desc())
-            )
-
-            results = session.exec(patients_query).all()
-
-            # Format results
-            patients = []
-            for result in results:
-                (
-                    patient_profile,
-                    first_name,
-                    last_name,
-                    email,
-                    phone,
-                    appointment_count,
-                    last_visit,
-                ) = result
-
-                # Calculate age
-                age = None
-                if patient_profile.date_of_birth:
-                    from datetime import date
-
-                    today = date.today()
-                    age = (
-                        today.year
-                        - patient_profile.date_of_birth.year
-                        - (
-                            (today.month, today.day)
-                            < (
-                                patient_profile.date_of_birth.month,
-                                patient_profile.date_of_birth.day,
-                            )
-                        )
-                    )
-
-                patient_dict = {
-                    "id": str(patient_profile.id),
-                    "name": f"{first_name} {last_name}",
-                    "email": email,
-                    "phone": phone,
-                    "age": age,
-                    "gender": patient_profile.gender,
-                    "blood_group": patient_profile.blood_group,
-                    "appointment_count": appointment_count,
-                    "last_visit": last_visit.isoformat() if last_visit else None,
-                    "allergies": patient_profile.allergies or [],
-                    "medical_history": patient_profile.medical_history or "",
-                    "emergency_contact_name": patient_profile.emergency_contact_name,
-                    "emergency_contact_phone": patient_profile.emergency_contact_phone,
-                    "address": patient_profile.address,
-                    "insurance_info": patient_profile.insurance_info,
-                }
-                patients.append(patient_dict)
-
-            return patients, total_count
-
+        return _list_doctor_patients(doctor_id, search_term, limit, offset)
     except Exception as e:
         logger.error(f"Error searching patients for doctor {doctor_id}: {e}")
         return [], 0
 
 
+# Doctor-patient summary maintenance; these run inside the caller's transaction
+def record_doctor_patient_appointment(
+    session: Session, doctor_id: uuid.UUID, patient_id: uuid.UUID, appointment_date: datetime
+) -> None:
+    """Count a newly booked appointment towards the pair's summary."""
+    statement = pg_insert(DoctorPatientSummary).values(
+        doctor_id=doctor_id,
+        patient_id=patient_id,
+        appointment_count=1,
+        last_visit=appointment_date,
+        is_bookmarked=False,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[DoctorPatientSummary.doctor_id, DoctorPatientSummary.patient_id],
+        set_={
+            "appointment_count": DoctorPatientSummary.appointment_count + 1,
+            "last_visit": func.greatest(
+                DoctorPatientSummary.last_visit, statement.excluded.last_visit
+            ),
+        },
+    )
+    session.execute(statement)
+
+
+def refresh_doctor_patient_last_visit(
+    session: Session, doctor_id: uuid.UUID, patient_id: uuid.UUID
+) -> None:
+    """Recompute the pair's last_visit after one of its appointments was moved."""
+    pair = and_(
+        DoctorPatientSummary.doctor_id == doctor_id,
+        DoctorPatientSummary.patient_id == patient_id,
+    )
+    # Lock the row first so a booking committed meanwhile is included in the max
+    session.exec(select(DoctorPatientSummary.doctor_id).where(pair).with_for_update()).first()
+    last_visit = session.exec(
+        select(func.max(Appointment.appointment_date)).where(
+            Appointment.doctor_id == doctor_id,
+            Appointment.patient_id == patient_id,
+        )
+    ).one()
+    session.execute(update(DoctorPatientSummary).where(pair).values(last_visit=last_visit))
+
+
+def _set_bookmark_flag(
+    session: Session, doctor_id: uuid.UUID, patient_id: uuid.UUID, is_bookmarked: bool
+) -> None:
+    statement = pg_insert(DoctorPatientSummary).values(
+        doctor_id=doctor_id,
+        patient_id=patient_id,
+        appointment_count=0,
+        is_bookmarked=is_bookmarked,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[DoctorPatientSummary.doctor_id, DoctorPatientSummary.patient_id],
+        set_={"is_bookmarked": is_bookmarked},
+    )
+    session.execute(statement)
+
+
 def toggle_bookmark_patient(
     doctor_id: uuid.UUID, patient_id: uuid.UUID
 ) -> Optional[PatientProfile]:
@@ -715,6 +794,7 @@ def toggle_bookmark_patient(
             if existing_bookmark:
                 # If exists, remove (unbookmark)
                 session.delete(existing_bookmark)
+                _set_bookmark_flag(session, doctor_id, patient_id, False)
                 session.commit()
                 # Return the patient profile (now unbookmarked)
                 return True
@@ -723,6 +803,7 @@ def toggle_bookmark_patient(
                 bookmark = DoctorBookmark(doctor_id=doctor_id, patient_id=patient_id)
                 logger.info(f"✅ Creating bookmark: {bookmark}")
                 session.add(bookmark)
+                _set_bookmark_flag(session, doctor_id, patient_id, True)
                 session.commit()
                 session.refresh(bookmark)
                 # Return the patient profile (now bookmarked)
@@ -0,0 +1,212 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.db.session import engine
+from app.core.config import settings
+from typing import List
+from datetime import date, datetime
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# health_metrics is range-partitioned by month on recorded_at
+HEALTH_METRICS_TABLE = "health_metrics"
+DEFAULT_PARTITION = f"{HEALTH_METRICS_TABLE}_default"
+PARTITION_NAME_PATTERN = re.compile(rf"^{HEALTH_METRICS_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing `day`."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a month start by a number of months (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding readings recorded in `month`."""
+    return f"{HEALTH_METRICS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def _default_partition_has_rows(connection: Connection, month: date) -> bool:
+    """Whether readings for `month` already landed in the default partition."""
+    exists = connection.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}
+    ).scalar()
+    if not exists:
+        return False
+    return connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            f"WHERE recorded_at >= :start AND recorded_at < :end)"
+        ),
+        {"start": month, "end": add_months(month, 1)},
+    ).scalar()
+
+
+def _create_partition_from_default(connection: Connection, name: str, month: date) -> None:
+    """
+    Create the partition for `month` when the default partition already holds some of its rows.
+
+    CREATE TABLE ... PARTITION OF would fail on those rows, so the month is
+    built as a plain table, its rows are moved out of the default partition
+    and the table is attached. Writes to the default partition wait until the
+    transaction commits.
+    """
+    bounds = {"start": month, "end": add_months(month, 1)}
+    connection.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+    connection.execute(text(f"CREATE TABLE {name} (LIKE {HEALTH_METRICS_TABLE} INCLUDING DEFAULTS)"))
+    connection.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE recorded_at >= :start AND recorded_at < :end RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    connection.execute(text(
+        f"ALTER TABLE {HEALTH_METRICS_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+    ))
+
+
+def create_health_metric_partitions(connection: Connection, start: date, end: date) -> List[str]:
+    """
+    Create monthly partitions covering [start, end), skipping existing ones.
+
+    Months whose readings already went to the default partition (because
+    maintenance fell behind) are moved into their new partition.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    created = []
+    month = month_start(start)
+    while month < end:
+        name = partition_name(month)
+        exists = connection.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+        ).scalar()
+        if not exists:
+            if _default_partition_has_rows(connection, month):
+                _create_partition_from_default(connection, name, month)
+            else:
+                connection.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {HEALTH_METRICS_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def get_health_metric_partitions(connection: Connection) -> List[date]:
+    """Get the months that currently have an attached partition, oldest first."""
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": HEALTH_METRICS_TABLE}).scalars().all()
+
+    months = []
+    for name in names:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _try_maintenance_lock(connection: Connection) -> bool:
+    """Take the transaction-level lock that keeps API processes from maintaining partitions at once."""
+    return connection.execute(
+        text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+        {"key": f"{HEALTH_METRICS_TABLE}_partition_maintenance"},
+    ).scalar()
+
+
+def ensure_health_metric_partitions(months_ahead: int) -> List[str]:
+    """Create partitions from the current month through `months_ahead` future months."""
+    this_month = month_start(datetime.utcnow().date())
+    try:
+        with engine.begin() as connection:
+            if not _try_maintenance_lock(connection):
+                return []
+            connection.execute(text(f"SET LOCAL lock_timeout = {settings.HEALTH_METRICS_PARTITION_LOCK_TIMEOUT_MS}"))
+            created = create_health_metric_partitions(
+                connection, this_month, add_months(this_month, months_ahead + 1)
+            )
+        if created:
+            logger.info(f"Created health metric partitions: {', '.join(created)}")
+        return created
+    except Exception as e:
+        logger.error(f"Error creating health metric partitions: {e}")
+        raise
+
+
+def _forget_expired_month(connection: Connection, month: date) -> None:
+    """
+    Drop a month's readings from the derived tables before its partition is detached.
+
+    Daily counts for the month are deleted. Latest-vital pointers into the
+    month move to the newest reading outside it, or are deleted when the
+    patient has none.
+    """
+    bounds = {"start": month, "end": add_months(month, 1)}
+    connection.execute(text(
+        "DELETE FROM health_metric_daily_counts WHERE day >= :start AND day < :end"
+    ), bounds)
+    connection.execute(text(
+        f"INSERT INTO patient_latest_vitals (patient_id, metric_type, health_metric_id, recorded_at) "
+        f"SELECT DISTINCT ON (m.patient_id, m.metric_type) m.patient_id, m.metric_type, m.id, m.recorded_at "
+        f"FROM {HEALTH_METRICS_TABLE} m "
+        f"JOIN patient_latest_vitals v ON v.patient_id = m.patient_id AND v.metric_type = m.metric_type "
+        f"WHERE v.recorded_at >= :start AND v.recorded_at < :end "
+        f"AND (m.recorded_at < :start OR m.recorded_at >= :end) "
+        f"ORDER BY m.patient_id, m.metric_type, m.recorded_at DESC, m.created_at DESC "
+        f"ON CONFLICT (patient_id, metric_type) DO UPDATE "
+        f"SET health_metric_id = EXCLUDED.health_metric_id, recorded_at = EXCLUDED.recorded_at"
+    ), bounds)
+    connection.execute(text(
+        "DELETE FROM patient_latest_vitals WHERE recorded_at >= :start AND recorded_at < :end"
+    ), bounds)
+
+
+def detach_expired_health_metric_partitions(retention_months: int) -> List[str]:
+    """
+    Detach partitions whose whole month is older than the retention window.
+
+    Each month is detached in its own transaction together with the updates
+    to health_metric_daily_counts and patient_latest_vitals. DETACH
+    CONCURRENTLY is not allowed while a default partition exists, so a plain
+    DETACH runs last in the transaction under a short lock_timeout: it gives
+    up rather than queueing behind long queries and blocking every reader,
+    and is retried on the next run. Detached tables are kept as standalone
+    tables for archival; dropping them is left to the operator.
+
+    Returns:
+        Names of the partitions that were detached
+    """
+    cutoff = add_months(month_start(datetime.utcnow().date()), -retention_months)
+    with engine.connect() as connection:
+        expired = [month for month in get_health_metric_partitions(connection) if month < cutoff]
+
+    detached = []
+    for month in expired:
+        name = partition_name(month)
+        try:
+            with engine.begin() as connection:
+                if not _try_maintenance_lock(connection):
+                    break
+                _forget_expired_month(connection, month)
+                connection.execute(text(f"SET LOCAL lock_timeout = {settings.HEALTH_METRICS_PARTITION_LOCK_TIMEOUT_MS}"))
+                connection.execute(text(f"ALTER TABLE {HEALTH_METRICS_TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+        except Exception as e:
+            # Stop here so months are always detached oldest first
+            logger.error(f"Error detaching health metric partition {name}: {e}")
+            break
+
+    if detached:
+        logger.info(f"Detached health metric partitions: {', '.join(detached)}")
+    return detached
@@ -2,6 +2,10 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi.responses import FileResponse
 
 from app.services import file_service
@@ -11,8 +15,46 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.middleware import AuthMiddleware
 from app.api.main import api_router
 from app.core.config import settings
+from app.services.reminder_dispatcher import ReminderDispatcher
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.services.events import EventListener, event_bus
+from app.services.password_hasher import password_hasher
+from app.services.token_revocation import TokenRevocationSync
+from app.services.partition_maintenance import PartitionMaintenance
+from app.db.session import engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the change event listener and optional in-process background workers."""
+    stop_event = asyncio.Event()
+    tasks = []
+    # Load revoked tokens before serving; the task then keeps the set current
+    revocation_sync = TokenRevocationSync()
+    try:
+        await asyncio.to_thread(revocation_sync.refresh)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error loading revoked tokens: {e}")
+    tasks.append(asyncio.create_task(revocation_sync.run(stop_event)))
+    # Without Postgres, publish_change delivers to this process's streams directly
+    if engine.dialect.name == "postgresql":
+        tasks.append(asyncio.create_task(EventListener(event_bus).run(stop_event)))
+    # health_metrics is only partitioned on Postgres
+    if settings.HEALTH_METRICS_PARTITION_MAINTENANCE_IN_PROCESS and engine.dialect.name == "postgresql":
+        tasks.append(asyncio.create_task(PartitionMaintenance().run(stop_event)))
+    if settings.REMINDER_DISPATCH_IN_PROCESS:
+        tasks.append(asyncio.create_task(ReminderDispatcher().run(stop_event)))
+    if settings.NOTIFICATION_DISPATCH_IN_PROCESS:
+        tasks.append(asyncio.create_task(NotificationDispatcher().run(stop_event)))
+
+    yield
+
+    stop_event.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    password_hasher.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add auth middleware
 app.add_middleware(AuthMiddleware)
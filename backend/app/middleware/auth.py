@@ -5,6 +5,8 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.utils.auth import verify_token
 from app.crud.auth import get_user_by_id
+from app.crud.profiles import get_profile_id_for_user
+from app.utils.cache import begin_request_cache, end_request_cache
 from app.models.auth import User
 from typing import Optional
 import logging
@@ -27,8 +29,20 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/",
             "/uploads/abd50c5c-7939-4465-92ea-3c00ce41dd6d.pdf",
         ]
+        # EventSource cannot set headers, so streams may pass the token in the query string
+        self.query_token_paths = [
+            "/api/v1/events/stream",
+        ]
 
     async def dispatch(self, request: Request, call_next):
+        # Lookups cached while handling this request (see app/utils/cache.py)
+        token = begin_request_cache()
+        try:
+            return await self._dispatch(request, call_next)
+        finally:
+            end_request_cache(token)
+
+    async def _dispatch(self, request: Request, call_next):
         # Skip auth for excluded paths
         if request.url.path in self.exclude_paths:
             return await call_next(request)
@@ -37,6 +51,10 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if request.url.path.startswith("/api/v1/profiles/doctors/") and request.method == "GET":
             return await call_next(request)
 
+        # Calendar subscription links authenticate with the token in their path
+        if request.url.path.startswith("/api/v1/calendar/feed/"):
+            return await call_next(request)
+
         # Skip auth for static files and OPTIONS requests
         if (
             request.url.path.startswith("/static") or
@@ -47,14 +65,20 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         # Extract token from Authorization header
         auth_header = request.headers.get("authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
+        query_token = None
+        if request.url.path in self.query_token_paths:
+            query_token = request.query_params.get("access_token")
+
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ")[1]
+        elif query_token:
+            token = query_token
+        else:
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Authorization header missing or invalid"}
             )
 
-        token = auth_header.split(" ")[1]
-
         # Verify token
         token_data = verify_token(token)
         if not token_data:
@@ -71,8 +95,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 content={"detail": "User not found"}
             )
 
-        # Add user to request state
+        # Add user and their patient/doctor profile id (None for admins) to request state
         request.state.user = user
+        request.state.profile_id = get_profile_id_for_user(user)
 
         response = await call_next(request)
         return response
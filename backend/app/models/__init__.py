@@ -4,17 +4,17 @@ from .enums import (
     RecordCategory, Priority,
     AppointmentStatus, AppointmentType,
     MedicationStatus, PrescriptionStatus,
-    VitalType,
+    VitalType, MetricBucket,
     NotificationType, NotificationStatus,
     ConditionType, ConditionStatus, AllergySeverity
 )
-from .auth import User, UserBase
-from .profiles import PatientProfile, DoctorProfile
+from .auth import User, UserBase, RevokedToken
+from .profiles import PatientProfile, DoctorProfile, DoctorPatientSummary
 from .medical_records import MedicalRecord, MedicalAttachment
 from .appointments import Appointment, AppointmentReminder
 from .medications import Medication, Prescription, MedicationLog
-from .health_metrics import HealthMetric
-from .notifications import Notification
+from .health_metrics import HealthMetric, PatientLatestVital, HealthMetricDailyCount
+from .notifications import Notification, UserNotificationCounter
 from .medical_conditions import MedicalCondition
 
 __all__ = [
@@ -26,15 +26,15 @@ __all__ = [
     "RecordCategory", "Priority",
     "AppointmentStatus", "AppointmentType",
     "MedicationStatus", "PrescriptionStatus",
-    "VitalType",
+    "VitalType", "MetricBucket",
     "NotificationType", "NotificationStatus",
     "ConditionType", "ConditionStatus", "AllergySeverity",
     
     # Auth Models
-    "User", "UserBase",
+    "User", "UserBase", "RevokedToken",
     
     # Profile Models
-    "PatientProfile", "DoctorProfile",
+    "PatientProfile", "DoctorProfile", "DoctorPatientSummary",
     
     # Medical Records
     "MedicalRecord", "MedicalAttachment",
@@ -46,10 +46,10 @@ __all__ = [
     "Medication", "Prescription", "MedicationLog",
     
     # Health Metrics
-    "HealthMetric",
+    "HealthMetric", "PatientLatestVital", "HealthMetricDailyCount",
     
     # Notifications
-    "Notification",
+    "Notification", "UserNotificationCounter",
     
     # Medical Conditions
     "MedicalCondition"
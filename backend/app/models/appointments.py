@@ -1,4 +1,6 @@
-from sqlmodel import Field, Relationship
+from sqlmodel import Field, Relationship, Index
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 import uuid
@@ -9,8 +11,26 @@ if TYPE_CHECKING:
     from app.models.profiles import PatientProfile, DoctorProfile
 
 
+# A doctor's booked (not cancelled or missed) appointments may not overlap.
+# appointment_date is a naive timestamp, hence tsrange rather than tstzrange.
+APPOINTMENT_TIME_RANGE = "tsrange(appointment_date, appointment_date + make_interval(mins => duration_minutes))"
+
+
 class Appointment(TimestampMixin, table=True):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_doctor_date", "doctor_id", "appointment_date"),
+        # Calendar feed sync walks a user's appointments in (updated_at, id) order
+        Index("ix_appointments_doctor_updated", "doctor_id", "updated_at", "id"),
+        Index("ix_appointments_patient_updated", "patient_id", "updated_at", "id"),
+        ExcludeConstraint(
+            ("doctor_id", "="),
+            (text(APPOINTMENT_TIME_RANGE), "&&"),
+            name="ex_appointments_doctor_overlap",
+            using="gist",
+            where=text("status NOT IN ('CANCELLED', 'NO_SHOW')"),
+        ),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     patient_id: uuid.UUID = Field(foreign_key="patient_profiles.id")
@@ -43,14 +63,27 @@ class Appointment(TimestampMixin, table=True):
 
 class AppointmentReminder(TimestampMixin, table=True):
     __tablename__ = "appointment_reminders"
+    __table_args__ = (
+        # Only unsent reminders are ever polled
+        Index(
+            "ix_appointment_reminders_unsent_time",
+            "reminder_time",
+            postgresql_where=text("NOT is_sent"),
+        ),
+        Index("ix_appointment_reminders_sent_at", "sent_at"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     appointment_id: uuid.UUID = Field(foreign_key="appointments.id")
     
     reminder_time: datetime
     reminder_type: str = Field(max_length=50)  # email, sms, push
-    is_sent: bool = Field(default=False)
+    is_sent: bool = Field(default=False)  # also set, with no sent_at, when the appointment was called off
     sent_at: Optional[datetime] = Field(default=None)
+
+    # Dispatch lease: the worker holding the reminder and until when
+    claimed_by: Optional[str] = Field(max_length=100, default=None)
+    claimed_until: Optional[datetime] = Field(default=None)
     
     # Relationships
     appointment: "Appointment" = Relationship(back_populates="reminders") 
\ No newline at end of file
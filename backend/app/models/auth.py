@@ -1,5 +1,7 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
+from sqlalchemy import Column, String, Computed
 from typing import Optional, TYPE_CHECKING
+from datetime import datetime
 import uuid
 from app.models.mixins import TimestampMixin
 from app.models.enums import UserType
@@ -24,6 +26,14 @@ class User(UserBase, TimestampMixin, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     password_hash: str = Field(max_length=255)
     user_type: UserType = Field(default=UserType.PATIENT)
+    # Digits of phone only, for prefix search regardless of spaces, dashes or a leading +
+    phone_digits: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            String(20),
+            Computed("regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')", persisted=True),
+        ),
+    )
 
     # Relationships (forward references to avoid circular imports)
     patient_profile: Optional["PatientProfile"] = Relationship(
@@ -46,3 +56,35 @@ class User(UserBase, TimestampMixin, table=True):
     @property
     def is_admin(self) -> bool:
         return self.user_type == UserType.SYSTEM_ADMIN
+
+
+
+class RevokedToken(SQLModel, table=True):
+    """A JWT that is no longer accepted, identified by the SHA-256 of the token."""
+    __tablename__ = "revoked_tokens"
+
+    token_hash: str = Field(max_length=64, primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", index=True)
+    # The row can be purged once the token would have expired anyway
+    expires_at: Optional[datetime] = Field(default=None)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+# Patient search (see app/crud/profiles.py): trigram indexes serve ILIKE '%term%'
+Index(
+    "ix_users_full_name_trgm",
+    (User.first_name + " " + User.last_name).label("full_name"),
+    postgresql_using="gin",
+    postgresql_ops={"full_name": "gin_trgm_ops"},
+)
+Index(
+    "ix_users_email_trgm",
+    User.email,
+    postgresql_using="gin",
+    postgresql_ops={"email": "gin_trgm_ops"},
+)
+Index(
+    "ix_users_phone_digits",
+    User.phone_digits,
+    postgresql_ops={"phone_digits": "text_pattern_ops"},
+)
@@ -91,11 +91,18 @@ class VitalType(str, Enum):
     OXYGEN_SATURATION = "oxygen_saturation"
 
 
+class MetricBucket(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+
+
 # Notification Enums
 class NotificationType(str, Enum):
     MEDICATION_REMINDER = "medication_reminder"
     APPOINTMENT_REMINDER = "appointment_reminder"
     TEST_RESULT = "test_result"
+    ABNORMAL_VITAL = "abnormal_vital"
     GENERAL = "general"
 
 
@@ -124,4 +131,12 @@ class AllergySeverity(str, Enum):
     MILD = "mild"
     MODERATE = "moderate"
     SEVERE = "severe"
-    LIFE_THREATENING = "life_threatening" 
\ No newline at end of file
+    LIFE_THREATENING = "life_threatening" 
+
+
+# Live update (server-sent event) Enums
+class ChangeTopic(str, Enum):
+    APPOINTMENTS = "appointments"
+    PRESCRIPTIONS = "prescriptions"
+    HEALTH_METRICS = "health_metrics"
+    NOTIFICATIONS = "notifications"
@@ -1,6 +1,7 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
+from sqlalchemy import text
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from datetime import datetime, date
 import uuid
 from app.models.mixins import TimestampMixin
 from app.models.enums import VitalType
@@ -11,6 +12,20 @@ if TYPE_CHECKING:
 
 class HealthMetric(TimestampMixin, table=True):
     __tablename__ = "health_metrics"
+    __table_args__ = (
+        Index(
+            "ix_health_metrics_patient_type_recorded",
+            "patient_id", "metric_type", "recorded_at",
+        ),
+        # Abnormal readings are rare, so a partial index keeps doctor lookups cheap
+        Index(
+            "ix_health_metrics_abnormal_recorded",
+            "recorded_at", "patient_id",
+            postgresql_where=text("is_abnormal"),
+        ),
+        # Monthly partitions are managed by app.db.partitions
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     patient_id: uuid.UUID = Field(foreign_key="patient_profiles.id")
@@ -18,13 +33,39 @@ class HealthMetric(TimestampMixin, table=True):
     metric_type: VitalType
     value: str = Field(max_length=50)  # "120/80", "98.6°F", "72 bpm"
     unit: str = Field(max_length=20)  # "mmHg", "°F", "bpm"
-    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+    # Partition key, so it is part of the primary key
+    recorded_at: datetime = Field(default_factory=datetime.utcnow, primary_key=True)
     recorded_by: Optional[str] = Field(max_length=100, default=None)  # self, doctor, device
     notes: Optional[str] = Field(max_length=500, default=None)
+
+    # Parsed from value, expressed in unit_normalized (see app.utils.health_metrics)
+    value_num: Optional[float] = Field(default=None)
+    value_secondary: Optional[float] = Field(default=None)  # diastolic for blood pressure
+    unit_normalized: Optional[str] = Field(max_length=20, default=None)
     
     # Normal ranges for comparison
     normal_min: Optional[float] = Field(default=None)
     normal_max: Optional[float] = Field(default=None)
+    is_abnormal: bool = Field(default=False)  # outside normal_min/normal_max
     
     # Relationships
-    patient: "PatientProfile" = Relationship(back_populates="health_metrics") 
\ No newline at end of file
+    patient: "PatientProfile" = Relationship(back_populates="health_metrics") 
+
+class PatientLatestVital(SQLModel, table=True):
+    """Pointer to each patient's most recent reading per vital type, maintained on write."""
+    __tablename__ = "patient_latest_vitals"
+
+    patient_id: uuid.UUID = Field(foreign_key="patient_profiles.id", primary_key=True)
+    metric_type: VitalType = Field(primary_key=True)
+    # No FK: health_metrics is partitioned and old months may be detached
+    health_metric_id: uuid.UUID
+    recorded_at: datetime
+
+
+class HealthMetricDailyCount(SQLModel, table=True):
+    """Number of readings per patient per (UTC) recording day, maintained on write."""
+    __tablename__ = "health_metric_daily_counts"
+
+    patient_id: uuid.UUID = Field(foreign_key="patient_profiles.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    count: int = Field(default=0)
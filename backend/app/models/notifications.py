@@ -1,4 +1,5 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
+from sqlalchemy import text
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 import uuid
@@ -11,6 +12,16 @@ if TYPE_CHECKING:
 
 class Notification(TimestampMixin, table=True):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Inbox keyset pagination: newest delivered first
+        Index("ix_notifications_user_sent", "user_id", "sent_at", "id"),
+        # Only pending notifications are ever polled by the dispatcher
+        Index(
+            "ix_notifications_pending_created",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="users.id")
@@ -31,6 +42,18 @@ class Notification(TimestampMixin, table=True):
     # Related entity IDs (optional)
     related_entity_type: Optional[str] = Field(max_length=50, default=None)
     related_entity_id: Optional[uuid.UUID] = Field(default=None)
+
+    # Dispatch lease: the worker holding the notification and until when
+    claimed_by: Optional[str] = Field(max_length=100, default=None)
+    claimed_until: Optional[datetime] = Field(default=None)
     
     # Relationships
-    user: "User" = Relationship() 
\ No newline at end of file
+    user: "User" = Relationship() 
+
+
+class UserNotificationCounter(SQLModel, table=True):
+    """Unread delivered notifications per user, maintained on delivery and read."""
+    __tablename__ = "user_notification_counters"
+
+    user_id: uuid.UUID = Field(foreign_key="users.id", primary_key=True)
+    unread_count: int = Field(default=0)
@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint
+from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint, Index
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 import uuid
@@ -118,3 +118,17 @@ class DoctorBookmark(TimestampMixin, table=True):
                 "doctor_id", "patient_id", name="uq_doctor_patient_bookmark"
             ),
         )
+
+
+class DoctorPatientSummary(SQLModel, table=True):
+    """Appointment count, latest appointment date and bookmark flag per doctor-patient pair, maintained on write."""
+    __tablename__ = "doctor_patient_summary"
+    __table_args__ = (
+        Index("ix_doctor_patient_summary_doctor_last_visit", "doctor_id", "last_visit"),
+    )
+
+    doctor_id: uuid.UUID = Field(foreign_key="doctor_profiles.id", primary_key=True)
+    patient_id: uuid.UUID = Field(foreign_key="patient_profiles.id", primary_key=True)
+    appointment_count: int = Field(default=0)
+    last_visit: Optional[datetime] = Field(default=None)
+    is_bookmarked: bool = Field(default=False)
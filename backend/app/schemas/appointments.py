@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, date, time
 import uuid
 from app.models.enums import AppointmentStatus, AppointmentType
 from .common import TimestampSchema
@@ -135,6 +135,88 @@ class AppointmentReminderRead(AppointmentReminderBase, TimestampSchema):
         from_attributes = True
 
 
+class AppointmentReminderDispatch(BaseModel):
+    """A claimed reminder with everything a delivery channel needs"""
+    id: uuid.UUID
+    appointment_id: uuid.UUID
+    reminder_time: datetime
+    reminder_type: str
+    appointment_date: datetime
+    patient_user_id: uuid.UUID
+    patient_name: str
+    patient_email: str
+    patient_phone: Optional[str] = None
+    doctor_name: str
+
+
+class ReminderDispatchStats(BaseModel):
+    """Backlog and throughput of reminder delivery across all workers"""
+    pending_due: int
+    in_flight: int
+    oldest_due_lag_seconds: float
+    sent_last_hour: int
+
+
+# Availability
+class AvailableSlot(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class DoctorAvailability(BaseModel):
+    """Free slots of one doctor over a date range"""
+    doctor_id: uuid.UUID
+    start_date: date
+    end_date: date
+    slot_minutes: int
+    slots: List[AvailableSlot]
+
+
+class DoctorAvailabilitySearchFilters(BaseModel):
+    """Doctor search filters plus the window to look for free slots in"""
+    specialization: Optional[str] = None
+    hospital_affiliation: Optional[str] = None
+    min_experience: Optional[int] = None
+    max_fee: Optional[float] = None
+    is_verified: Optional[bool] = None
+    name: Optional[str] = None
+    start_date: date
+    end_date: date
+    from_time: Optional[time] = None  # e.g. 08:00 for "mornings"
+    to_time: Optional[time] = None
+    slot_minutes: int = 30
+    slots_per_doctor: int = 3
+    limit: int = 20
+    offset: int = 0
+
+
+class DoctorSlotMatch(BaseModel):
+    """A doctor with their earliest free slots"""
+    doctor_id: uuid.UUID
+    doctor_name: str
+    specialization: str
+    hospital_affiliation: Optional[str] = None
+    consultation_fee: Optional[float] = None
+    earliest_slot: datetime
+    slots: List[AvailableSlot]
+
+
+class DoctorAvailabilitySearchResponse(BaseModel):
+    doctors: List[DoctorSlotMatch]
+    total_count: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+# Calendar feed
+class CalendarFeedState(BaseModel):
+    """What a calendar feed request would return, without reading the rows"""
+    event_count: int
+    last_modified: Optional[datetime] = None
+    sync_token: Optional[str] = None  # position after the newest change
+
+
 # Batch operations
 class AppointmentBatchUpdate(BaseModel):
     appointment_ids: List[uuid.UUID]
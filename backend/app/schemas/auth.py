@@ -114,6 +114,20 @@ class Token(BaseModel):
     user: UserRead
 
 
+class PasswordHasherStats(BaseModel):
+    """Load on this process's password hashing pool"""
+    workers: int
+    max_pending: int
+    bcrypt_rounds: int
+    active: int
+    queued: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_hash_ms: float
+
+
 class TokenData(BaseModel):
     user_id: Optional[uuid.UUID] = None
     email: Optional[str] = None
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+import uuid
+from app.models.enums import ChangeTopic
+
+
+class ChangeEvent(BaseModel):
+    """A change to one of a user's resources, as carried over NOTIFY"""
+    topic: ChangeTopic
+    action: str  # created, updated, deleted, read
+    ids: List[uuid.UUID] = []
+    # User and profile ids whose streams receive the event
+    recipients: List[uuid.UUID] = []
+    # Sent to every stream instead, for changes too large to address
+    broadcast: bool = False
+
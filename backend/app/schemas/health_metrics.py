@@ -2,7 +2,7 @@ from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 import uuid
-from app.models.enums import VitalType
+from app.models.enums import VitalType, MetricBucket
 
 
 class HealthMetricBase(BaseModel):
@@ -36,8 +36,12 @@ class HealthMetricRead(HealthMetricBase):
     
     id: uuid.UUID
     patient_id: uuid.UUID
+    value_num: Optional[float] = None
+    value_secondary: Optional[float] = None
+    unit_normalized: Optional[str] = None
+    is_abnormal: bool = False
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
 
 
 class HealthMetricStats(BaseModel):
@@ -53,3 +57,70 @@ class HealthMetricSearchFilters(BaseModel):
     recorded_from: Optional[datetime] = None
     recorded_to: Optional[datetime] = None
     recorded_by: Optional[str] = None
+
+
+class HealthMetricBatchError(BaseModel):
+    index: int
+    error: str
+
+
+class HealthMetricBatchResult(BaseModel):
+    """Outcome of a bulk ingestion request"""
+    received: int
+    inserted: int
+    failed: int
+    errors: List[HealthMetricBatchError]
+
+
+class HealthMetricBucket(BaseModel):
+    bucket_start: datetime
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    avg_secondary: Optional[float] = None  # diastolic average for blood pressure
+
+
+class HealthMetricAggregate(BaseModel):
+    """Time-bucketed summary of one vital type"""
+    metric_type: VitalType
+    bucket: MetricBucket
+    unit: Optional[str] = None
+    recorded_from: datetime
+    recorded_to: datetime
+    buckets: List[HealthMetricBucket]
+
+
+class HealthMetricPoint(BaseModel):
+    recorded_at: datetime
+    value: float
+    value_secondary: Optional[float] = None
+
+
+class HealthMetricSeries(BaseModel):
+    """Chart series of one vital type, downsampled to at most max_points"""
+    metric_type: VitalType
+    unit: Optional[str] = None
+    source_count: int
+    points: List[HealthMetricPoint]
+
+
+class AbnormalHealthMetricRead(BaseModel):
+    """Flagged reading shown on the doctor's abnormal vitals view"""
+    id: uuid.UUID
+    patient_id: uuid.UUID
+    patient_name: str
+    metric_type: VitalType
+    value: str
+    unit: str
+    value_num: Optional[float] = None
+    value_secondary: Optional[float] = None
+    unit_normalized: Optional[str] = None
+    normal_min: Optional[float] = None
+    normal_max: Optional[float] = None
+    recorded_at: datetime
+
+
+class AbnormalHealthMetricList(BaseModel):
+    metrics: List[AbnormalHealthMetricRead]
+    total_count: int
@@ -245,9 +245,20 @@ class MedicationStats(BaseModel):
 
 # Batch operations
 class PrescriptionBatchUpdate(BaseModel):
-    prescription_ids: List[uuid.UUID]
+    prescription_ids: List[uuid.UUID] = []
+    pdf_ids: List[uuid.UUID] = []
     status: Optional[PrescriptionStatus] = None
     notes: Optional[str] = None
+    # Update every owned prescription in this status when no IDs are given
+    current_status: Optional[PrescriptionStatus] = None
+    # Commit in chunks of this size for very large batches
+    chunk_size: Optional[int] = None
+
+    @field_validator("chunk_size")
+    def validate_chunk_size(cls, v):
+        if v is not None and (v < 100 or v > 50000):
+            raise ValueError("Chunk size must be between 100 and 50000")
+        return v
 
 
 class PrescriptionPDFRead(BaseModel):
@@ -0,0 +1,62 @@
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional, List
+from datetime import datetime
+import uuid
+from app.models.enums import NotificationType, NotificationStatus
+
+
+class NotificationCreate(BaseModel):
+    user_id: uuid.UUID
+    notification_type: NotificationType
+    title: str
+    message: str
+    scheduled_for: Optional[datetime] = None
+    delivery_method: Optional[str] = None  # email, sms, push; None for in-app only
+    related_entity_type: Optional[str] = None
+    related_entity_id: Optional[uuid.UUID] = None
+
+    @field_validator("delivery_method")
+    def validate_delivery_method(cls, v):
+        allowed_methods = ["email", "sms", "push"]
+        if v is not None and v not in allowed_methods:
+            raise ValueError(f"Delivery method must be one of: {', '.join(allowed_methods)}")
+        return v
+
+
+class NotificationRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    notification_type: NotificationType
+    title: str
+    message: str
+    status: NotificationStatus
+    sent_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+    related_entity_type: Optional[str] = None
+    related_entity_id: Optional[uuid.UUID] = None
+    created_at: datetime
+
+
+class NotificationPage(BaseModel):
+    """One page of the inbox; pass next_cursor back to get the next page"""
+    notifications: List[NotificationRead]
+    next_cursor: Optional[str] = None
+    unread_count: int
+
+
+class NotificationMarkRead(BaseModel):
+    notification_ids: List[uuid.UUID] = []
+    mark_all: bool = False
+
+
+class NotificationDispatch(BaseModel):
+    """A claimed notification with everything a delivery channel needs"""
+    id: uuid.UUID
+    user_id: uuid.UUID
+    email: str
+    phone: Optional[str] = None
+    title: str
+    message: str
+    delivery_method: Optional[str] = None
+    due_at: datetime
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from pydantic import BaseModel
+from typing import Dict, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryMessage(BaseModel):
+    """A message addressed to one user, independent of how it is delivered"""
+    user_id: uuid.UUID
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    title: str
+    body: str
+
+
+class DeliveryChannel(ABC):
+    """
+    Base class for a way of delivering messages (email, SMS, push).
+
+    Subclasses implement send() and raise on failure so the caller can retry.
+    """
+    name: str = ""
+
+    @abstractmethod
+    async def send(self, message: DeliveryMessage) -> None:
+        """Deliver one message; raise on failure."""
+
+
+class LoggingChannel(DeliveryChannel):
+    """Local stand-in that logs messages instead of delivering them."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    async def send(self, message: DeliveryMessage) -> None:
+        recipient = message.email if self.name == "email" else message.phone if self.name == "sms" else message.user_id
+        logger.info(f"[{self.name}] to {recipient}: {message.title} - {message.body}")
+
+
+# Registered channels by name; real providers replace the logging stand-ins
+_channels: Dict[str, DeliveryChannel] = {
+    name: LoggingChannel(name) for name in ("email", "sms", "push")
+}
+
+
+def register_channel(channel: DeliveryChannel) -> None:
+    """Register (or replace) the channel used for channel.name."""
+    _channels[channel.name] = channel
+
+
+def get_channel(name: str) -> Optional[DeliveryChannel]:
+    """Get the channel registered under name, if any."""
+    return _channels.get(name)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class DispatcherMetrics(BaseModel):
+    """Counters for one dispatcher since it started"""
+    started_at: float
+    batches: int = 0
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+    last_batch_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+
+    @property
+    def sent_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+
+class BatchDispatcher(ABC):
+    """
+    Polls for due items, delivers them and records the outcome in bulk.
+
+    Subclasses implement claim/deliver/complete/release. Claims are leases
+    keyed by worker_id and taken with SKIP LOCKED, so any number of
+    dispatchers can run at once, in worker processes or inside the API
+    process, without delivering an item twice. Deliveries in a batch run
+    concurrently; failed ones are released for a retry after
+    retry_delay_seconds.
+    """
+    name = "dispatcher"
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval_seconds: float,
+        claim_timeout_seconds: int,
+        retry_delay_seconds: int,
+        worker_id: Optional[str] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.metrics = DispatcherMetrics(started_at=time.monotonic())
+
+    @abstractmethod
+    def claim(self) -> List[Any]:
+        """Claim up to batch_size due items (runs in a worker thread)."""
+
+    @abstractmethod
+    async def deliver(self, item: Any) -> None:
+        """Deliver one item; raise to have it retried."""
+
+    @abstractmethod
+    def complete(self, ids: List[Any]) -> int:
+        """Record delivered items (runs in a worker thread)."""
+
+    @abstractmethod
+    def release(self, ids: List[Any], retry_at: datetime) -> int:
+        """Hand failed items back for a retry at retry_at (runs in a worker thread)."""
+
+    @abstractmethod
+    def due_at(self, item: Any) -> datetime:
+        """When the item became due, for lag reporting."""
+
+    def now(self) -> datetime:
+        """Current time on the same clock as the items' timestamps."""
+        return datetime.now()
+
+    async def run_once(self) -> int:
+        """
+        Claim and deliver one batch.
+
+        Returns:
+            Number of items claimed (0 when nothing is due)
+        """
+        items = await asyncio.to_thread(self.claim)
+        if not items:
+            return 0
+
+        results = await asyncio.gather(
+            *(self.deliver(item) for item in items), return_exceptions=True
+        )
+        sent_ids, failed_ids = [], []
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error delivering {self.name} item {item.id}: {result}")
+                failed_ids.append(item.id)
+            else:
+                sent_ids.append(item.id)
+
+        if sent_ids:
+            await asyncio.to_thread(self.complete, sent_ids)
+        if failed_ids:
+            retry_at = self.now() + timedelta(seconds=self.retry_delay_seconds)
+            await asyncio.to_thread(self.release, failed_ids, retry_at)
+
+        # Lag: how late the most overdue item in the batch was delivered
+        now = self.now()
+        lag = max((now - self.due_at(item)).total_seconds() for item in items)
+        self.metrics.batches += 1
+        self.metrics.claimed += len(items)
+        self.metrics.sent += len(sent_ids)
+        self.metrics.failed += len(failed_ids)
+        self.metrics.last_batch_lag_seconds = lag
+        self.metrics.max_lag_seconds = max(self.metrics.max_lag_seconds, lag)
+
+        logger.info(
+            f"{self.name} batch: worker={self.worker_id} claimed={len(items)} sent={len(sent_ids)} "
+            f"failed={len(failed_ids)} lag={lag:.1f}s throughput={self.metrics.sent_per_second:.2f}/s"
+        )
+        return len(items)
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """Dispatch until stop_event is set, draining full batches back to back."""
+        stop_event = stop_event or asyncio.Event()
+        logger.info(f"{self.name} dispatcher {self.worker_id} started")
+
+        while not stop_event.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Error in {self.name} dispatcher {self.worker_id}: {e}")
+                claimed = 0
+
+            # A full batch means more may be waiting; otherwise sleep until the next poll
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+        logger.info(f"{self.name} dispatcher {self.worker_id} stopped")
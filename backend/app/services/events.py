@@ -0,0 +1,291 @@
+"""
+Change events behind the live update stream (GET /events/stream).
+
+Writers call publish_change() inside their transaction. On Postgres it
+issues pg_notify, so an event goes out only if the transaction commits and
+reaches every API process, whichever worker or script made the change. Each
+API process holds a single LISTEN connection (EventListener) and fans events
+out to its open streams through the in-process EventBus, so an idle stream
+costs one queue and one sleeping coroutine rather than a database connection.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+import uuid
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.enums import ChangeTopic
+from app.schemas.events import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes; split recipients and drop long id lists
+RECIPIENTS_PER_NOTIFY = 100
+MAX_EVENT_IDS = 50
+
+
+class Subscription:
+    """One open stream: the ids it listens for and its pending events."""
+
+    def __init__(self, keys: Iterable[uuid.UUID], max_queued: int):
+        self.keys = set(keys)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, event: Optional[ChangeEvent]) -> None:
+        """Queue an event; a slow client is told to resync instead of growing the queue."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBus:
+    """Routes change events to the subscriptions of their recipients."""
+
+    def __init__(self, max_queued: int = settings.EVENTS_QUEUE_SIZE):
+        self.max_queued = max_queued
+        self._subscriptions: Dict[uuid.UUID, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.closed = False
+
+    def _all_subscriptions(self) -> Set[Subscription]:
+        return {s for subscriptions in self._subscriptions.values() for s in subscriptions}
+
+    @property
+    def subscription_count(self) -> int:
+        return len(self._all_subscriptions())
+
+    def subscribe(self, keys: Iterable[uuid.UUID]) -> Subscription:
+        """Open a subscription for events addressed to any of the given user/profile ids."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(keys, self.max_queued)
+        subscription.closed = self.closed
+        for key in subscription.keys:
+            self._subscriptions[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for key in subscription.keys:
+            subscriptions = self._subscriptions.get(key)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[key]
+
+    def publish(self, event: ChangeEvent) -> int:
+        """
+        Deliver an event to every matching subscription (event loop thread only).
+
+        Returns:
+            Number of subscriptions the event was queued for
+        """
+        if event.broadcast:
+            targets = self._all_subscriptions()
+        else:
+            targets = set()
+            for recipient in event.recipients:
+                targets.update(self._subscriptions.get(recipient, ()))
+        for subscription in targets:
+            subscription.put(event)
+        return len(targets)
+
+    def publish_threadsafe(self, event: ChangeEvent) -> None:
+        """Deliver an event from any thread; dropped when nothing has subscribed yet."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.publish, event)
+
+    def close(self) -> None:
+        """End every stream, now and later; called when the server starts shutting down."""
+        self.closed = True
+        for subscription in self._all_subscriptions():
+            subscription.closed = True
+            subscription.put(None)
+
+    def resync(self) -> None:
+        """Tell every stream that events may have been missed."""
+        for subscription in self._all_subscriptions():
+            subscription.overflowed = True
+            subscription.put(None)
+
+
+event_bus = EventBus()
+
+
+def publish_change(
+    session: Session,
+    topic: ChangeTopic,
+    action: str,
+    recipients: Iterable[Optional[uuid.UUID]],
+    ids: Optional[Iterable[uuid.UUID]] = None,
+) -> None:
+    """
+    Announce a change to the given user/profile ids as part of the session's transaction.
+
+    Call before session.commit(); nothing is sent if the transaction rolls back.
+    Large changes are sent without ids, which tells clients to refetch the topic.
+    """
+    recipients = list(dict.fromkeys(r for r in recipients if r is not None))
+    if not recipients:
+        return
+    ids = list(dict.fromkeys(ids or []))
+    if len(ids) > MAX_EVENT_IDS:
+        ids = []
+
+    for start in range(0, len(recipients), RECIPIENTS_PER_NOTIFY):
+        _send_event(session, ChangeEvent(
+            topic=topic,
+            action=action,
+            ids=ids,
+            recipients=recipients[start : start + RECIPIENTS_PER_NOTIFY],
+        ))
+
+
+def publish_topic_change(session: Session, topic: ChangeTopic, action: str) -> None:
+    """
+    Tell every open stream to refetch a topic, as part of the session's transaction.
+
+    For set-wide changes whose recipients are too many to address one NOTIFY
+    at a time; a single event without ids goes out instead.
+    """
+    _send_event(session, ChangeEvent(topic=topic, action=action, broadcast=True))
+
+
+def _send_event(session: Session, event: ChangeEvent) -> None:
+    if session.get_bind().dialect.name != "postgresql":
+        event_bus.publish_threadsafe(event)
+        return
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.EVENTS_CHANNEL, "payload": event.model_dump_json()},
+    )
+
+
+class EventListener:
+    """
+    Relays NOTIFY events on EVENTS_CHANNEL into an EventBus.
+
+    Uses one dedicated autocommit connection outside the pool, watched with
+    loop.add_reader so waiting costs no thread. After a reconnect every
+    stream is told to resync, since events sent meanwhile were lost.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        channel: str = settings.EVENTS_CHANNEL,
+        reconnect_seconds: float = settings.EVENTS_RECONNECT_SECONDS,
+    ):
+        self.bus = bus
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+
+    def _connect(self):
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        # Notice a silently dropped connection instead of waiting on it forever
+        cparams.update(keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
+        connection = engine.dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return connection
+
+    def _on_readable(self, connection, lost: asyncio.Event) -> None:
+        try:
+            connection.poll()
+        except Exception as e:
+            logger.error(f"Event listener connection lost: {e}")
+            lost.set()
+            return
+
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            try:
+                event = ChangeEvent.model_validate_json(notify.payload)
+            except ValueError as e:
+                logger.error(f"Ignoring malformed change event: {e}")
+                continue
+            self.bus.publish(event)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Listen until stop_event is set, reconnecting after failures."""
+        loop = asyncio.get_running_loop()
+        connected_before = False
+
+        while not stop_event.is_set():
+            try:
+                connection = await asyncio.to_thread(self._connect)
+            except Exception as e:
+                logger.error(f"Error connecting event listener: {e}")
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.reconnect_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            lost = asyncio.Event()
+            loop.add_reader(connection.fileno(), self._on_readable, connection, lost)
+            logger.info(f"Listening for change events on '{self.channel}'")
+            if connected_before:
+                self.bus.resync()
+            connected_before = True
+
+            waiters = [asyncio.create_task(stop_event.wait()), asyncio.create_task(lost.wait())]
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+                loop.remove_reader(connection.fileno())
+                connection.close()
+
+        logger.info("Event listener stopped")
+
+
+def format_sse(event: str, data: str) -> str:
+    """Frame one server-sent event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def stream_events(
+    subscription: Subscription,
+    heartbeat_seconds: float = settings.EVENTS_HEARTBEAT_SECONDS,
+):
+    """
+    Yield server-sent events for a subscription until the client goes away.
+
+    Comments are sent while idle so proxies keep the connection open. When
+    events were dropped a single resync event replaces them. The stream ends
+    once the subscription is closed, so a shutting-down worker is not held
+    open by it; clients reconnect to another worker after the retry delay.
+    """
+    yield f"retry: {int(settings.EVENTS_RECONNECT_SECONDS * 1000)}\n\n"
+    while not subscription.closed:
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+            continue
+
+        if subscription.closed:
+            return
+
+        if subscription.overflowed:
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.overflowed = False
+            yield format_sse("resync", "{}")
+            continue
+        if event is None:
+            continue
+
+        yield format_sse(
+            event.topic.value,
+            event.model_dump_json(include={"topic", "action", "ids"}),
+        )
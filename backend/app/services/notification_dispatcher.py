@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from app.core.config import settings
+from app.crud.notifications import claim_due_notifications, mark_notifications_sent, release_notifications
+from app.schemas.notifications import NotificationDispatch
+from app.services.delivery_channels import DeliveryMessage, get_channel
+from app.services.dispatch import BatchDispatcher
+
+
+class NotificationDispatcher(BatchDispatcher):
+    """
+    Delivers due PENDING notifications.
+
+    Notifications with a delivery_method go out through that channel; in-app
+    only ones are simply moved into the inbox. Either way the user's unread
+    counter is bumped when the batch is marked sent.
+    """
+    name = "notification"
+
+    def __init__(self, worker_id: Optional[str] = None, batch_size: int = settings.NOTIFICATION_BATCH_SIZE):
+        super().__init__(
+            batch_size=batch_size,
+            poll_interval_seconds=settings.NOTIFICATION_POLL_INTERVAL_SECONDS,
+            claim_timeout_seconds=settings.NOTIFICATION_CLAIM_TIMEOUT_SECONDS,
+            retry_delay_seconds=settings.NOTIFICATION_RETRY_DELAY_SECONDS,
+            worker_id=worker_id,
+        )
+
+    def claim(self) -> List[NotificationDispatch]:
+        return claim_due_notifications(self.worker_id, self.batch_size, self.claim_timeout_seconds)
+
+    async def deliver(self, notification: NotificationDispatch) -> None:
+        if notification.delivery_method is None:
+            return
+
+        channel = get_channel(notification.delivery_method)
+        if channel is None:
+            raise ValueError(f"No delivery channel registered for '{notification.delivery_method}'")
+        await channel.send(DeliveryMessage(
+            user_id=notification.user_id,
+            email=notification.email,
+            phone=notification.phone,
+            title=notification.title,
+            body=notification.message,
+        ))
+
+    def complete(self, ids: List[uuid.UUID]) -> int:
+        return mark_notifications_sent(ids, self.worker_id)
+
+    def release(self, ids: List[uuid.UUID], retry_at: datetime) -> int:
+        return release_notifications(ids, self.worker_id, retry_at)
+
+    def due_at(self, notification: NotificationDispatch) -> datetime:
+        return notification.due_at
+
+    def now(self) -> datetime:
+        # Notification timestamps are naive UTC
+        return datetime.utcnow()
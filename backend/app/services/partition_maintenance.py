@@ -0,0 +1,51 @@
+"""
+Repeats health_metrics partition maintenance while the API runs.
+
+scripts/maintain_partitions.py runs once when the container starts; a
+process that stays up for months would otherwise run out of pre-created
+partitions and send new readings to the default partition. Every API
+process runs this, but an advisory lock lets only one of them work at a
+time, and runs that find nothing to do cost a catalog query.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.db.partitions import (
+    ensure_health_metric_partitions,
+    detach_expired_health_metric_partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionMaintenance:
+    def __init__(
+        self,
+        interval_seconds: float = settings.HEALTH_METRICS_PARTITION_CHECK_INTERVAL_SECONDS,
+        months_ahead: int = settings.HEALTH_METRICS_PARTITION_MONTHS_AHEAD,
+        retention_months: Optional[int] = settings.HEALTH_METRICS_RETENTION_MONTHS,
+    ):
+        self.interval_seconds = interval_seconds
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+
+    def maintain(self) -> None:
+        """Create upcoming partitions, then detach expired ones when retention is set."""
+        ensure_health_metric_partitions(self.months_ahead)
+        if self.retention_months:
+            detach_expired_health_metric_partitions(self.retention_months)
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """Maintain partitions every interval until stop_event is set."""
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.maintain)
+            except Exception as e:
+                logger.error(f"Error maintaining health metric partitions: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
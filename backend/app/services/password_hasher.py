@@ -0,0 +1,105 @@
+"""
+Bounded thread pool for bcrypt (app/utils/auth.py).
+
+A bcrypt hash or verify takes a few hundred milliseconds of CPU. Run inline
+from an async handler, it stalls every other request on the worker. bcrypt
+releases the GIL, so a small dedicated pool hashes in parallel while the
+event loop keeps serving. The pool is capped at PASSWORD_HASH_WORKERS threads
+with at most PASSWORD_HASH_MAX_PENDING calls waiting; beyond that callers get
+PasswordHasherBusy straight away instead of piling onto an ever longer queue.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.schemas.auth import PasswordHasherStats
+from app.utils.auth import get_password_hash, verify_and_update_password
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """Runs password hashing on its own threads and keeps queue metrics."""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on the pool, or raise PasswordHasherBusy if the queue is full."""
+        with self._lock:
+            if self.queued >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.queued += 1
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                wait = started - submitted
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    self.total_run_seconds += time.perf_counter() - started
+
+        return await asyncio.wrap_future(self._get_executor().submit(job))
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash when the stored one uses an outdated cost."""
+        return await self.run(verify_and_update_password, password, hashed_password)
+
+    def stats(self) -> PasswordHasherStats:
+        with self._lock:
+            completed = self.completed or 1
+            return PasswordHasherStats(
+                workers=self.max_workers,
+                max_pending=self.max_pending,
+                bcrypt_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+                active=self.active,
+                queued=self.queued,
+                completed=self.completed,
+                rejected=self.rejected,
+                avg_wait_ms=self.total_wait_seconds / completed * 1000,
+                max_wait_ms=self.max_wait_seconds * 1000,
+                avg_hash_ms=self.total_run_seconds / completed * 1000,
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
@@ -1,6 +1,5 @@
 import os
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from weasyprint import HTML
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../templates")
 
@@ -12,5 +11,8 @@ def render_prescription_pdf(context: dict) -> bytes:
     )
     template = env.get_template("prescription_template.html")
     html_content = template.render(**context)
+    # WeasyPrint pulls in Pango/Cairo; import it on first render, not in every worker at startup
+    from weasyprint import HTML
+
     pdf = HTML(string=html_content).write_pdf()
     return pdf
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from app.core.config import settings
+from app.crud.appointments import claim_due_reminders, mark_reminders_sent, release_reminders
+from app.schemas.appointments import AppointmentReminderDispatch
+from app.services.delivery_channels import DeliveryMessage, get_channel
+from app.services.dispatch import BatchDispatcher
+
+
+def _reminder_message(reminder: AppointmentReminderDispatch) -> DeliveryMessage:
+    """Build the delivery message for an appointment reminder."""
+    when = reminder.appointment_date.strftime("%A, %B %d at %I:%M %p")
+    return DeliveryMessage(
+        user_id=reminder.patient_user_id,
+        email=reminder.patient_email,
+        phone=reminder.patient_phone,
+        title="Appointment reminder",
+        body=f"Hi {reminder.patient_name}, this is a reminder of your appointment with Dr. {reminder.doctor_name} on {when}.",
+    )
+
+
+class ReminderDispatcher(BatchDispatcher):
+    """Delivers due appointment reminders through the channel named by reminder_type."""
+    name = "reminder"
+
+    def __init__(self, worker_id: Optional[str] = None, batch_size: int = settings.REMINDER_BATCH_SIZE):
+        super().__init__(
+            batch_size=batch_size,
+            poll_interval_seconds=settings.REMINDER_POLL_INTERVAL_SECONDS,
+            claim_timeout_seconds=settings.REMINDER_CLAIM_TIMEOUT_SECONDS,
+            retry_delay_seconds=settings.REMINDER_RETRY_DELAY_SECONDS,
+            worker_id=worker_id,
+        )
+
+    def claim(self) -> List[AppointmentReminderDispatch]:
+        return claim_due_reminders(self.worker_id, self.batch_size, self.claim_timeout_seconds)
+
+    async def deliver(self, reminder: AppointmentReminderDispatch) -> None:
+        channel = get_channel(reminder.reminder_type)
+        if channel is None:
+            raise ValueError(f"No delivery channel registered for '{reminder.reminder_type}'")
+        await channel.send(_reminder_message(reminder))
+
+    def complete(self, ids: List[uuid.UUID]) -> int:
+        return mark_reminders_sent(ids, self.worker_id)
+
+    def release(self, ids: List[uuid.UUID], retry_at: datetime) -> int:
+        return release_reminders(ids, self.worker_id, retry_at)
+
+    def due_at(self, reminder: AppointmentReminderDispatch) -> datetime:
+        return reminder.reminder_time
@@ -0,0 +1,69 @@
+"""
+Keeps each API process's revoked-token set (app/utils/auth.py) in step with
+the revoked_tokens table, so verify_token checks revocation with a set
+lookup instead of a query. A token revoked in one process is rejected
+everywhere within TOKEN_REVOCATION_REFRESH_SECONDS. Every
+TOKEN_REVOCATION_PURGE_SECONDS, revocations of tokens that have expired
+anyway are dropped from the set and the table.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.crud.auth import get_revoked_token_hashes, purge_expired_revoked_tokens
+from app.utils.auth import mark_tokens_revoked, forget_expired_revocations
+
+logger = logging.getLogger(__name__)
+
+# revoked_at is set before commit, so look back a little to catch slow transactions
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+class TokenRevocationSync:
+    def __init__(
+        self,
+        interval_seconds: float = settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+        purge_seconds: float = settings.TOKEN_REVOCATION_PURGE_SECONDS,
+    ):
+        self.interval_seconds = interval_seconds
+        self.purge_seconds = purge_seconds
+        self.last_revoked_at: Optional[datetime] = None
+        self.last_purged_at: Optional[datetime] = None
+
+    def refresh(self) -> int:
+        """Load revocations since the last refresh (all unexpired ones the first time)."""
+        since = self.last_revoked_at - REFRESH_OVERLAP if self.last_revoked_at else None
+        rows = get_revoked_token_hashes(since)
+        if rows:
+            mark_tokens_revoked((token_hash, expires_at) for token_hash, expires_at, _ in rows)
+            newest = max(revoked_at for _, _, revoked_at in rows)
+            if not self.last_revoked_at or newest > self.last_revoked_at:
+                self.last_revoked_at = newest
+        return len(rows)
+
+    def purge(self) -> int:
+        """Forget expired revocations in this process and delete them from the table."""
+        now = datetime.utcnow()
+        self.last_purged_at = now
+        forget_expired_revocations(now)
+        return purge_expired_revoked_tokens(now)
+
+    async def run(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """Refresh until stop_event is set."""
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.refresh)
+                if (
+                    not self.last_purged_at
+                    or datetime.utcnow() - self.last_purged_at >= timedelta(seconds=self.purge_seconds)
+                ):
+                    await asyncio.to_thread(self.purge)
+            except Exception as e:
+                logger.error(f"Error refreshing revoked tokens: {e}")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -1,18 +1,37 @@
 from passlib.context import CryptContext
-from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
 from app.core.config import settings
 from app.schemas.auth import TokenData
-from typing import Optional
+from app.utils.cache import TTLCache
+from typing import Dict, Iterable, Optional, Tuple
+import hashlib
+import time
 import uuid
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if settings.JWT_BACKEND == "pyjwt":
+    # Noticeably cheaper per token than python-jose; requires PyJWT to be installed
+    import jwt
+    from jwt import PyJWTError as JWTError
+else:
+    from jose import JWTError, jwt
+
+# Password hashing; hashes with any other cost are flagged for rehashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
 
 # JWT Configuration
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+CALENDAR_SCOPE = "calendar"
+
+# Verified tokens by SHA-256, as (exp, scope, TokenData); exp is still checked on every hit
+_token_cache = TTLCache(settings.TOKEN_CACHE_TTL_SECONDS, settings.TOKEN_CACHE_MAX_ENTRIES)
+# SHA-256 of revoked tokens -> their exp, kept in step with revoked_tokens by TokenRevocationSync
+_revoked_token_hashes: Dict[str, Optional[datetime]] = {}
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -25,6 +44,11 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a new hash as well if the stored one needs upgrading."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -39,8 +63,66 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode a JWT token."""
+def create_calendar_feed_token(user_id: uuid.UUID) -> str:
+    """Create a long-lived token that only grants access to the user's calendar feed."""
+    return create_access_token(
+        {"sub": str(user_id), "scope": CALENDAR_SCOPE},
+        expires_delta=timedelta(days=settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS)
+    )
+
+
+def token_hash(token: str) -> str:
+    """Key under which a token is cached and revoked; the token itself is never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def mark_tokens_revoked(revocations: Iterable[Tuple[str, Optional[datetime]]]) -> None:
+    """Reject these (token_hash, expires_at) tokens from now on in this process."""
+    for key, expires_at in revocations:
+        _revoked_token_hashes[key] = expires_at
+        _token_cache.pop(key)
+
+
+def forget_expired_revocations(now: datetime) -> int:
+    """Drop revoked tokens that have expired anyway (exp as naive UTC); returns how many."""
+    expired = [
+        key for key, expires_at in list(_revoked_token_hashes.items())
+        if expires_at is not None and expires_at <= now
+    ]
+    for key in expired:
+        _revoked_token_hashes.pop(key, None)
+    return len(expired)
+
+
+def get_token_expiry(token: str) -> Optional[datetime]:
+    """The exp of a valid token as naive UTC, or None if it has none or is invalid."""
+    try:
+        exp = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("exp")
+    except JWTError:
+        return None
+    return datetime.fromtimestamp(exp, timezone.utc).replace(tzinfo=None) if exp else None
+
+
+def verify_token(token: str, scope: Optional[str] = None) -> Optional[TokenData]:
+    """
+    Verify and decode a JWT token; scoped tokens are only accepted for their own scope.
+
+    A token that verified once is served from a cache until its exp, so
+    clients reusing one long-lived token skip signature checks; revoked
+    tokens are rejected before the cache is consulted.
+    """
+    key = token_hash(token)
+    if key in _revoked_token_hashes:
+        return None
+
+    cached = _token_cache.get(key)
+    if cached is not None:
+        expires_at, token_scope, token_data = cached
+        if expires_at is not None and expires_at <= time.time():
+            _token_cache.pop(key)
+            return None
+        return token_data if token_scope == scope else None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("sub")
@@ -56,7 +138,9 @@ def verify_token(token: str) -> Optional[TokenData]:
         except ValueError:
             return None
             
-        return TokenData(user_id=user_id, email=email, user_type=user_type)
+        token_data = TokenData(user_id=user_id, email=email, user_type=user_type)
+        _token_cache.set(key, (payload.get("exp"), payload.get("scope"), token_data))
+        return token_data if payload.get("scope") == scope else None
     except JWTError:
         return None
 
@@ -0,0 +1,337 @@
+"""
+Doctor availability: parsing DoctorProfile.available_days and slot arithmetic.
+
+available_days is free-form JSON written by the frontend, usually a list of
+{"days": "Monday - Friday", "time": "9:00 AM - 5:00 PM"} entries. It is
+parsed into a WeeklySchedule: for each weekday (Monday = 0), sorted and
+merged (start, end) working intervals in minutes after midnight.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import json
+import re
+
+import numpy as np
+
+# Longest appointment allowed by Appointment.duration_minutes
+MAX_APPOINTMENT_MINUTES = 180
+
+MINUTES_PER_DAY = 24 * 60
+
+Interval = Tuple[int, int]
+WeeklySchedule = Tuple[Tuple[Interval, ...], ...]
+
+EMPTY_SCHEDULE: WeeklySchedule = tuple(() for _ in range(7))
+
+DAY_NAMES: Dict[str, int] = {
+    "mon": 0, "monday": 0,
+    "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "weds": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5,
+    "sun": 6, "sunday": 6,
+}
+
+DAY_GROUPS: Dict[str, Set[int]] = {
+    "weekdays": {0, 1, 2, 3, 4},
+    "weekends": {5, 6},
+    "weekend": {5, 6},
+    "daily": set(range(7)),
+    "everyday": set(range(7)),
+    "every day": set(range(7)),
+    "all week": set(range(7)),
+}
+
+TIME_PATTERN = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?\s*([ap]\.?m\.?)?$", re.IGNORECASE)
+RANGE_SEPARATOR = re.compile(r"\s*(?:-|–|—|\bto\b)\s*", re.IGNORECASE)
+# "Mon-Fri, 9AM-5PM" / "Saturday 10:00-14:00": day part, then the first digit
+TEXT_ENTRY_PATTERN = re.compile(r"^(?P<days>[^\d]+?)[\s,:]+(?P<time>\d.*)$")
+
+
+def _parse_day_name(value: str) -> Optional[int]:
+    return DAY_NAMES.get(value.strip().lower().rstrip("."))
+
+
+def parse_days(spec: str) -> Set[int]:
+    """Parse "Monday - Friday", "Mon, Wed, Fri", "Weekdays" and the like into weekday numbers."""
+    days: Set[int] = set()
+    for part in re.split(r"\s*(?:,|&|/|\band\b)\s*", spec.strip(), flags=re.IGNORECASE):
+        if not part:
+            continue
+        if part.lower() in DAY_GROUPS:
+            days |= DAY_GROUPS[part.lower()]
+            continue
+        bounds = RANGE_SEPARATOR.split(part)
+        if len(bounds) == 2:
+            first, last = _parse_day_name(bounds[0]), _parse_day_name(bounds[1])
+            if first is None or last is None:
+                continue
+            # Ranges may wrap around the week, e.g. "Sat - Mon"
+            day = first
+            days.add(day)
+            while day != last:
+                day = (day + 1) % 7
+                days.add(day)
+        else:
+            day = _parse_day_name(part)
+            if day is not None:
+                days.add(day)
+    return days
+
+
+def parse_time_of_day(value: str) -> Optional[int]:
+    """Parse "9", "9AM", "9:30 pm" or "17:00" into minutes after midnight."""
+    match = TIME_PATTERN.match(value.strip())
+    if not match:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    meridiem = (match.group(3) or "").lower().replace(".", "")
+    if meridiem:
+        if not 1 <= hours <= 12:
+            return None
+        hours = hours % 12 + (12 if meridiem == "pm" else 0)
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        return None
+    return hours * 60 + minutes
+
+
+def parse_time_ranges(spec: str) -> List[Interval]:
+    """
+    Parse "9:00 AM - 5:00 PM" or "9-12, 14-18" into minute intervals.
+
+    Text without a time range ("Emergency Only", "Closed") yields no intervals.
+    """
+    intervals = []
+    for part in re.split(r"\s*(?:,|;|&|\band\b)\s*", spec.strip(), flags=re.IGNORECASE):
+        bounds = RANGE_SEPARATOR.split(part)
+        if len(bounds) != 2:
+            continue
+        start, end = parse_time_of_day(bounds[0]), parse_time_of_day(bounds[1])
+        if start is None or end is None:
+            continue
+        # "10PM - 12AM" ends at midnight; longer overnight hours are cut there too
+        if end <= start:
+            end = MINUTES_PER_DAY
+        intervals.append((start, end))
+    return intervals
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> Tuple[Interval, ...]:
+    """Sort intervals and merge the ones that overlap or touch."""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def _entries(raw: str) -> List[Tuple[str, str]]:
+    """Split available_days into (days, time) text pairs, whatever shape it was saved in."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = None
+
+    entries = []
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                days = item.get("days") or item.get("day") or ""
+                times = item.get("time") or item.get("times") or item.get("hours") or ""
+                if isinstance(times, list):
+                    times = ", ".join(str(t) for t in times)
+                entries.append((str(days), str(times)))
+            elif isinstance(item, str):
+                entries.extend(_entries(item))
+    elif isinstance(data, dict):
+        for days, times in data.items():
+            if isinstance(times, list):
+                times = ", ".join(str(t) for t in times)
+            entries.append((str(days), str(times or "")))
+    elif data is None or isinstance(data, str):
+        for line in re.split(r"[;\n|]", data if isinstance(data, str) else raw):
+            match = TEXT_ENTRY_PATTERN.match(line.strip())
+            if match:
+                entries.append((match.group("days"), match.group("time")))
+    return entries
+
+
+@lru_cache(maxsize=4096)
+def parse_availability(raw: Optional[str]) -> WeeklySchedule:
+    """
+    Parse a DoctorProfile.available_days value into a WeeklySchedule.
+
+    Entries that cannot be understood are ignored, so an unparseable value
+    means no bookable hours rather than an error. Results are cached per
+    distinct string.
+    """
+    if not raw or not raw.strip():
+        return EMPTY_SCHEDULE
+
+    by_day: List[List[Interval]] = [[] for _ in range(7)]
+    for days, times in _entries(raw):
+        intervals = parse_time_ranges(times)
+        if not intervals:
+            continue
+        for day in parse_days(days):
+            by_day[day].extend(intervals)
+    return tuple(merge_intervals(intervals) for intervals in by_day)
+
+
+def compute_free_slots(
+    schedule: WeeklySchedule,
+    busy: Sequence[Tuple[datetime, datetime]],
+    start: datetime,
+    end: datetime,
+    slot_minutes: int,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Bookable slots within [start, end) that avoid every busy interval.
+
+    Slots are laid on a slot_minutes grid anchored at the start of each
+    working interval, so they line up the same way every day. Busy
+    intervals are merged once and swept in step with the working hours,
+    so the cost is linear in the number of days plus appointments.
+    """
+    if start >= end or slot_minutes <= 0:
+        return []
+
+    busy_merged: List[List[datetime]] = []
+    for busy_start, busy_end in sorted(busy):
+        if busy_merged and busy_start <= busy_merged[-1][1]:
+            busy_merged[-1][1] = max(busy_merged[-1][1], busy_end)
+        else:
+            busy_merged.append([busy_start, busy_end])
+    busy_ends = [busy_end for _, busy_end in busy_merged]
+
+    step = timedelta(minutes=slot_minutes)
+    slots = []
+    day = start.date()
+    while day <= end.date():
+        midnight = datetime.combine(day, time())
+        for open_minute, close_minute in schedule[day.weekday()]:
+            window_start = midnight + timedelta(minutes=open_minute)
+            window_end = midnight + timedelta(minutes=close_minute)
+            slot_start = window_start
+            if slot_start < start:
+                # Jump to the first grid point at or after the requested start
+                slot_start += -((window_start - start) // step) * step
+            # First busy interval that ends after this slot begins
+            index = bisect_left(busy_ends, slot_start + timedelta(microseconds=1))
+            while slot_start + step <= min(window_end, end):
+                slot_end = slot_start + step
+                while index < len(busy_merged) and busy_merged[index][1] <= slot_start:
+                    index += 1
+                if index < len(busy_merged) and busy_merged[index][0] < slot_end:
+                    # Skip to the first grid point at or after the busy interval ends
+                    slot_start += -((slot_start - busy_merged[index][1]) // step) * step
+                    continue
+                slots.append((slot_start, slot_end))
+                slot_start = slot_end
+        day += timedelta(days=1)
+    return slots
+
+
+def compute_free_slots_bulk(
+    schedules: Sequence[WeeklySchedule],
+    busy: Sequence[Tuple[int, datetime, datetime]],
+    start: datetime,
+    end: datetime,
+    slot_minutes: int,
+    day_start_minute: Optional[int] = None,
+    day_end_minute: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Free slots of many doctors at once, with vectorized interval arithmetic.
+
+    Same slot grid as compute_free_slots. Every doctor gets a lane of its
+    own on one minute axis (lane * lane_width + minutes since midnight of
+    start's day), so the candidate slots and busy intervals of all doctors
+    are tested against each other with a single searchsorted. Candidate
+    grids are built once per distinct schedule, since many doctors share
+    the same hours.
+
+    Args:
+        schedules: Weekly schedule of each doctor, by doctor index
+        busy: (doctor index, start, end) of booked appointments
+        day_start_minute/day_end_minute: Optional daily window slots must fall in
+
+    Returns:
+        Tuple of (doctor indexes, slot start minutes since midnight of
+        start's day), ordered by doctor index and then time
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if start >= end or slot_minutes <= 0 or not schedules:
+        return empty, empty
+
+    base = datetime.combine(start.date(), time())
+    days = (end.date() - start.date()).days + 1
+    lane_width = (days + 1) * MINUTES_PER_DAY
+    first_minute = -int(-(start - base).total_seconds() // 60)
+    last_minute = int((end - base).total_seconds() // 60)
+    first_weekday = start.weekday()
+
+    doctors_by_schedule: Dict[WeeklySchedule, List[int]] = defaultdict(list)
+    for index, schedule in enumerate(schedules):
+        doctors_by_schedule[schedule].append(index)
+
+    doctor_parts, start_parts = [], []
+    for schedule, doctor_indexes in doctors_by_schedule.items():
+        grid = [
+            np.arange(open_minute, close_minute - slot_minutes + 1, slot_minutes, dtype=np.int64)
+            + day * MINUTES_PER_DAY
+            for day in range(days)
+            for open_minute, close_minute in schedule[(first_weekday + day) % 7]
+        ]
+        if not grid:
+            continue
+        offsets = np.concatenate(grid)
+        keep = (offsets >= first_minute) & (offsets + slot_minutes <= last_minute)
+        minute_of_day = offsets % MINUTES_PER_DAY
+        if day_start_minute is not None:
+            keep &= minute_of_day >= day_start_minute
+        if day_end_minute is not None:
+            keep &= minute_of_day + slot_minutes <= day_end_minute
+        offsets = offsets[keep]
+        if not len(offsets):
+            continue
+        doctor_parts.append(np.repeat(np.asarray(doctor_indexes, dtype=np.int64), len(offsets)))
+        start_parts.append(np.tile(offsets, len(doctor_indexes)))
+
+    if not doctor_parts:
+        return empty, empty
+    doctors = np.concatenate(doctor_parts)
+    starts = np.concatenate(start_parts)
+    order = np.argsort(doctors * lane_width + starts, kind="stable")
+    doctors, starts = doctors[order], starts[order]
+
+    if busy:
+        busy_doctors = np.fromiter((doctor for doctor, _, _ in busy), dtype=np.int64, count=len(busy))
+        busy_starts = np.fromiter(
+            ((busy_start - base).total_seconds() // 60 for _, busy_start, _ in busy),
+            dtype=np.int64, count=len(busy),
+        )
+        busy_ends = np.fromiter(
+            (-((base - busy_end).total_seconds() // 60) for _, _, busy_end in busy),
+            dtype=np.int64, count=len(busy),
+        )
+        # Clipping keeps every interval inside its own doctor's lane
+        busy_starts = busy_doctors * lane_width + np.clip(busy_starts, 0, lane_width - 1)
+        busy_ends = busy_doctors * lane_width + np.clip(busy_ends, 0, lane_width - 1)
+        order = np.argsort(busy_starts, kind="stable")
+        busy_starts, busy_ends = busy_starts[order], np.maximum.accumulate(busy_ends[order])
+
+        # A slot is taken when any interval starting before the slot ends
+        # also ends after it starts; the running max of ends answers that
+        slot_starts = doctors * lane_width + starts
+        before = np.searchsorted(busy_starts, slot_starts + slot_minutes, side="left")
+        taken = (before > 0) & (busy_ends[np.maximum(before - 1, 0)] > slot_starts)
+        doctors, starts = doctors[~taken], starts[~taken]
+
+    return doctors, starts
@@ -0,0 +1,75 @@
+"""
+Small in-process caches.
+
+TTLCache holds values for a fixed time in this worker only, so anything
+cached here may be up to ttl_seconds stale in other workers after a write.
+The request cache lives for one HTTP request (AuthMiddleware opens it) and
+lets repeated lookups within a handler share one result.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after ttl_seconds, evicting the least recently used beyond max_entries."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_request_cache: ContextVar[Optional[dict]] = ContextVar("request_cache", default=None)
+
+
+def begin_request_cache() -> Token:
+    """Open an empty cache for the current request; pass the token to end_request_cache."""
+    return _request_cache.set({})
+
+
+def end_request_cache(token: Token) -> None:
+    _request_cache.reset(token)
+
+
+def get_request_cache() -> Optional[dict]:
+    """The current request's cache, or None outside a request (scripts, workers)."""
+    return _request_cache.get()
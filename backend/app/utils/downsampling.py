@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Select up to `threshold` points with Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the first and last points and, for every bucket in between,
+    the point forming the largest triangle with the previously selected point
+    and the average of the next bucket. Unlike averaging, this preserves
+    spikes. Triangle areas within a bucket are computed vectorized; only the
+    walk over buckets is a Python loop.
+
+    Args:
+        x: Monotonically increasing x values (e.g. epoch seconds)
+        y: Values at each x
+        threshold: Maximum number of points to keep (>= 3)
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n - 2 interior points
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        if next_end <= next_start:
+            next_end = next_start + 1
+
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
@@ -0,0 +1,147 @@
+import re
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from app.models.enums import VitalType
+
+# Canonical unit that parsed values are stored in, per vital type
+CANONICAL_UNITS = {
+    VitalType.BLOOD_PRESSURE: "mmHg",
+    VitalType.HEART_RATE: "bpm",
+    VitalType.TEMPERATURE: "°C",
+    VitalType.WEIGHT: "kg",
+    VitalType.HEIGHT: "cm",
+    VitalType.BMI: "kg/m²",
+    VitalType.BLOOD_SUGAR: "mg/dL",
+    VitalType.OXYGEN_SATURATION: "%",
+}
+
+NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+")
+FEET_INCHES_PATTERN = re.compile(r"^\s*(\d+)\s*(?:'|ft)\s*(\d+(?:\.\d+)?)?\s*(?:\"|in)?\s*$")
+
+
+def naive_utc(value: datetime) -> datetime:
+    """recorded_at is stored without a time zone; aware values are converted to UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _unit_key(unit: Optional[str]) -> str:
+    """Lower-case a unit string and strip spaces/degree signs for matching."""
+    return (unit or "").lower().replace(" ", "").replace("°", "").replace("º", "")
+
+
+def to_canonical(metric_type: VitalType, unit: Optional[str], number: Optional[float]) -> Optional[float]:
+    """Convert a number expressed in `unit` to the canonical unit of the metric type."""
+    if number is None:
+        return None
+
+    key = _unit_key(unit)
+
+    if metric_type == VitalType.TEMPERATURE:
+        # Assume Fahrenheit for unit-less readings above any plausible Celsius value
+        if key in ("f", "degf", "fahrenheit") or (not key and number > 50):
+            return (number - 32) * 5 / 9
+        if key in ("k", "kelvin"):
+            return number - 273.15
+    elif metric_type == VitalType.WEIGHT:
+        if key in ("lb", "lbs", "pound", "pounds"):
+            return number * 0.45359237
+        if key in ("g", "grams"):
+            return number / 1000
+    elif metric_type == VitalType.HEIGHT:
+        if key in ("m", "meter", "meters", "metre", "metres"):
+            return number * 100
+        if key in ("in", "inch", "inches", '"'):
+            return number * 2.54
+        if key in ("ft", "feet", "'"):
+            return number * 30.48
+        if key == "mm":
+            return number / 10
+    elif metric_type == VitalType.BLOOD_PRESSURE:
+        if key == "kpa":
+            return number * 7.50062
+    elif metric_type == VitalType.BLOOD_SUGAR:
+        if key in ("mmol/l", "mmol"):
+            return number * 18.016
+
+    return number
+
+
+def effective_unit(value: Optional[str], unit: Optional[str]) -> Optional[str]:
+    """
+    The unit a value is expressed in: the unit field, or else a unit embedded in the value.
+
+    Normal ranges must be converted with this same unit, otherwise a value
+    parsed from "180 lbs" is compared in kg against bounds still in lbs.
+
+    >>> effective_unit("180 lbs", "")
+    'lbs'
+    >>> is_abnormal_reading(VitalType.WEIGHT, parse_metric_value(VitalType.WEIGHT, "180 lbs", "")[0],
+    ...                     effective_unit("180 lbs", ""), 150, 200)
+    False
+    """
+    if unit:
+        return unit
+    return NUMBER_PATTERN.sub("", value or "").strip() or None
+
+
+def parse_metric_value(
+    metric_type: VitalType, value: str, unit: Optional[str] = None
+) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """
+    Parse a free-text metric value into numbers in the canonical unit.
+
+    Examples:
+        ("blood_pressure", "120/80", "mmHg") -> (120.0, 80.0, "mmHg")
+        ("temperature", "98.6°F", "°F")     -> (37.0, None, "°C")
+
+    Returns:
+        Tuple of (value_num, value_secondary, unit_normalized); numbers are None
+        when the value cannot be parsed.
+    """
+    canonical_unit = CANONICAL_UNITS.get(metric_type)
+    if not value:
+        return None, None, canonical_unit
+
+    # A unit embedded in the value ("98.6°F") takes precedence over a blank unit
+    unit = effective_unit(value, unit)
+
+    if metric_type == VitalType.HEIGHT:
+        feet_inches = FEET_INCHES_PATTERN.match(value)
+        if feet_inches and ("'" in value or "ft" in value):
+            inches = float(feet_inches.group(2) or 0)
+            return int(feet_inches.group(1)) * 30.48 + inches * 2.54, None, canonical_unit
+
+    numbers = [float(n) for n in NUMBER_PATTERN.findall(value)]
+    if not numbers:
+        return None, None, canonical_unit
+
+    primary = to_canonical(metric_type, unit, numbers[0])
+    secondary = None
+    if metric_type == VitalType.BLOOD_PRESSURE and len(numbers) > 1:
+        secondary = to_canonical(metric_type, unit, numbers[1])
+
+    return primary, secondary, canonical_unit
+
+
+def is_abnormal_reading(
+    metric_type: VitalType,
+    value_num: Optional[float],
+    unit: Optional[str],
+    normal_min: Optional[float],
+    normal_max: Optional[float],
+) -> bool:
+    """
+    Check a parsed reading against its normal range.
+
+    The range is given in the reading's own unit (see effective_unit) and
+    converted to the canonical unit before comparing. Unparsed readings and missing bounds
+    never count as abnormal.
+    """
+    if value_num is None:
+        return False
+
+    low = to_canonical(metric_type, unit, normal_min)
+    high = to_canonical(metric_type, unit, normal_max)
+    return (low is not None and value_num < low) or (high is not None and value_num > high)
@@ -0,0 +1,97 @@
+"""
+Minimal iCalendar (RFC 5545) writer for the appointment feed.
+
+Only what the feed needs: text escaping, line folding and VEVENT rendering.
+Naive datetimes are stored in UTC and written with the Z suffix.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+PRODUCT_ID = "-//MediTrack//Appointments//EN"
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets, as RFC 5545 requires, and terminate it with CRLF."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime as UTC, e.g. 20261019T093000Z."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_calendar_start(name: str) -> str:
+    return "".join(fold_line(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ))
+
+
+def render_calendar_end() -> str:
+    return fold_line("END:VCALENDAR")
+
+
+def render_event(
+    uid: str,
+    start: datetime,
+    end: datetime,
+    summary: str,
+    last_modified: datetime,
+    status: str = "CONFIRMED",
+    description: Optional[str] = None,
+    location: Optional[str] = None,
+    created: Optional[datetime] = None,
+) -> str:
+    """Render one VEVENT; status is CONFIRMED, TENTATIVE or CANCELLED."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(last_modified)}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"STATUS:{status}",
+        f"LAST-MODIFIED:{format_datetime(last_modified)}",
+    ]
+    if created:
+        # Clients keep the revision with the highest SEQUENCE; seconds since creation only grow
+        lines.append(f"CREATED:{format_datetime(created)}")
+        lines.append(f"SEQUENCE:{max(int((last_modified - created).total_seconds()), 0)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
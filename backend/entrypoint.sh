@@ -12,5 +12,9 @@ echo "Database is ready!"
 echo "Running database migrations..."
 alembic upgrade head
 
+# Make sure upcoming health_metrics partitions exist
+echo "Maintaining health metric partitions..."
+python scripts/maintain_partitions.py
+
 # Execute the main command
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings for production, read from app.core.config.Settings.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Runs WEB_WORKERS uvicorn workers (one per core by default) on uvloop and
+httptools. With WEB_PRELOAD_APP the app is imported once in the master and
+forked, so workers share that memory copy-on-write. Workers are restarted
+after about WEB_MAX_REQUESTS requests, and on SIGTERM every worker gets
+WEB_GRACEFUL_TIMEOUT_SECONDS to finish its requests and run the app's
+shutdown before it is killed. Live event streams never finish on their
+own, so they are closed as soon as a worker starts shutting down, and any
+request still running a few seconds before the deadline is cancelled so
+the app's shutdown always gets to run.
+"""
+import multiprocessing
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import settings
+from app.services.events import event_bus
+
+# Time left after cancelling requests for the app's shutdown to run
+SHUTDOWN_MARGIN_SECONDS = 5
+
+
+class AppServer(Server):
+    async def shutdown(self, sockets=None) -> None:
+        # Open /events/stream responses would otherwise hold the worker until it is killed
+        event_bus.close()
+        await super().shutdown(sockets=sockets)
+
+
+class AppUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": settings.WEB_LOOP,
+        "http": settings.WEB_HTTP,
+        "timeout_graceful_shutdown": max(settings.WEB_GRACEFUL_TIMEOUT_SECONDS - SHUTDOWN_MARGIN_SECONDS, 1),
+    }
+
+    async def _serve(self) -> None:
+        # As UvicornWorker._serve, with AppServer in place of uvicorn's Server
+        self.config.app = self.wsgi
+        server = AppServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+
+bind = settings.WEB_BIND
+workers = settings.WEB_WORKERS or multiprocessing.cpu_count()
+worker_class = AppUvicornWorker
+preload_app = settings.WEB_PRELOAD_APP
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS_JITTER
+timeout = settings.WEB_TIMEOUT_SECONDS
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+keepalive = settings.WEB_KEEPALIVE_SECONDS
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Connections opened in the master before forking must not be shared with workers
+    from app.db.session import engine
+
+    engine.dispose(close=False)
@@ -0,0 +1,389 @@
+"""
+Load-test the main API flows and report throughput and latency percentiles as JSON.
+
+Run it against a server whose database was filled by scripts/seed_benchmark_data.py
+(pass the same --doctors/--patients), e.g.
+
+    python scripts/seed_benchmark_data.py --doctors 10000 --patients 100000
+    gunicorn -c gunicorn.conf.py app.main:app &
+    python scripts/benchmark_api.py --duration 60 --concurrency 32 \\
+        --output bench.json --baseline previous-bench.json
+
+Each of --concurrency threads keeps one HTTP connection open and sends
+requests back to back, picking a scenario by --mix weight. Requests sent
+during --warmup seconds are not counted. With --baseline, the run fails
+(exit code 1) when an endpoint's p95 latency or throughput is more than
+--max-regression worse than in the baseline file, or when more than
+--max-error-rate of its requests failed.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from scripts.seed_benchmark_data import (
+    BENCHMARK_PASSWORD,
+    SPECIALIZATIONS,
+    benchmark_email,
+    benchmark_id,
+)
+
+DEFAULT_MIX = (
+    "login=1,doctor_search=4,appointment_stats=3,health_stats=3,"
+    "appointment_search=4,prescription_create=1,record_upload=1"
+)
+
+# Smallest well-formed PDF, uploaded as the attachment of every record
+RECORD_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+Request = Tuple[str, str, Optional[bytes], Dict[str, str]]
+
+
+class BenchmarkContext:
+    """What scenarios need to build requests: the API prefix, seeded population and logged-in tokens."""
+
+    def __init__(self, api_prefix: str, doctors: int, patients: int):
+        self.api_prefix = api_prefix
+        self.doctors = doctors
+        self.patients = patients
+        self.doctor_tokens: List[Tuple[int, str]] = []
+        self.patient_tokens: List[Tuple[int, str]] = []
+
+
+def _json_request(method: str, path: str, body: Optional[dict] = None, token: Optional[str] = None) -> Request:
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return method, path, json.dumps(body).encode() if body is not None else None, headers
+
+
+def _multipart_request(path: str, fields: Dict[str, str], file_name: str, file_data: bytes, content_type: str, token: str) -> Request:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n".encode() + file_data + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Authorization": f"Bearer {token}",
+    }
+    return "POST", path, b"".join(parts), headers
+
+
+def login_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    email = benchmark_email("patient", rng.randrange(context.patients))
+    return _json_request("POST", f"{context.api_prefix}/auth/login", {"email": email, "password": BENCHMARK_PASSWORD})
+
+
+def doctor_search_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.patient_tokens)
+    query = urlencode({"specialization": rng.choice(SPECIALIZATIONS), "page": rng.randint(1, 5), "page_size": 20})
+    return _json_request("GET", f"{context.api_prefix}/profiles/doctors/search?{query}", token=token)
+
+
+def appointment_stats_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.doctor_tokens)
+    return _json_request("GET", f"{context.api_prefix}/appointments/my/stats", token=token)
+
+
+def health_stats_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.patient_tokens)
+    return _json_request("GET", f"{context.api_prefix}/health-metrics/my/stats", token=token)
+
+
+def appointment_search_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.doctor_tokens)
+    date_from = datetime.utcnow() - timedelta(days=rng.randint(0, 180))
+    query = urlencode({
+        "date_from": date_from.isoformat(timespec="seconds"),
+        "date_to": (date_from + timedelta(days=30)).isoformat(timespec="seconds"),
+        "limit": 20,
+    })
+    return _json_request("GET", f"{context.api_prefix}/appointments/search?{query}", token=token)
+
+
+def prescription_create_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.doctor_tokens)
+    body = {
+        "patient_id": str(benchmark_id("patient-profile", rng.randrange(context.patients))),
+        "start_date": datetime.utcnow().isoformat(timespec="seconds"),
+        "diagnosis": "Benchmark diagnosis",
+        "items": [
+            {"medication_name": "Paracetamol", "dosage": "500mg", "frequency": "twice daily", "quantity": "20 tablets", "duration": "10 days"},
+            {"medication_name": "Omeprazole", "dosage": "20mg", "frequency": "once daily", "quantity": "14 capsules"},
+        ],
+    }
+    return _json_request("POST", f"{context.api_prefix}/prescriptions", body, token=token)
+
+
+def record_upload_request(context: BenchmarkContext, rng: random.Random) -> Request:
+    _, token = rng.choice(context.patient_tokens)
+    fields = {"title": "Benchmark lab report", "category": "lab", "summary": "Synthetic upload"}
+    return _multipart_request(
+        f"{context.api_prefix}/records/my/upload", fields, "report.pdf", RECORD_PDF, "application/pdf", token
+    )
+
+
+SCENARIOS = {
+    "login": login_request,
+    "doctor_search": doctor_search_request,
+    "appointment_stats": appointment_stats_request,
+    "health_stats": health_stats_request,
+    "appointment_search": appointment_search_request,
+    "prescription_create": prescription_create_request,
+    "record_upload": record_upload_request,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "name=weight,..." into scenario weights."""
+    mix = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("At least one scenario needs a positive weight")
+    return mix
+
+
+def _connect(base_url: str, timeout: float) -> http.client.HTTPConnection:
+    url = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    return connection_class(url.hostname, url.port, timeout=timeout)
+
+
+def _send(connection: http.client.HTTPConnection, request: Request) -> Tuple[int, bytes]:
+    method, path, body, headers = request
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def _login_users(base_url: str, context: BenchmarkContext, kind: str, count: int, seed: int, timeout: float) -> List[Tuple[int, str]]:
+    """Log in `count` distinct seeded users of a kind before the timed run."""
+    rng = random.Random(f"{seed}:{kind}")
+    total = context.doctors if kind == "doctor" else context.patients
+    tokens = []
+    connection = _connect(base_url, timeout)
+    try:
+        for n in rng.sample(range(total), min(count, total)):
+            request = _json_request(
+                "POST", f"{context.api_prefix}/auth/login",
+                {"email": benchmark_email(kind, n), "password": BENCHMARK_PASSWORD},
+            )
+            status, body = _send(connection, request)
+            if status != 200:
+                raise RuntimeError(f"Login as {benchmark_email(kind, n)} failed with {status}: {body[:200]!r}")
+            tokens.append((n, json.loads(body)["access_token"]))
+    finally:
+        connection.close()
+    return tokens
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _summarize(latencies: List[float], errors: int, seconds: float) -> dict:
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "throughput_rps": requests / seconds if seconds else 0.0,
+        "mean_ms": sum(latencies) / requests * 1000 if requests else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_load(args, context: BenchmarkContext, mix: Dict[str, float]) -> dict:
+    """Drive the API for warmup + duration seconds and return the report."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    measure_from = time.perf_counter() + args.warmup
+    stop_at = measure_from + args.duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(f"{args.seed}:worker:{index}")
+        local_latencies = defaultdict(list)
+        local_errors = defaultdict(int)
+        connection = _connect(args.base_url, args.timeout)
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            name = rng.choices(names, weights=weights)[0]
+            request = SCENARIOS[name](context, rng)
+            try:
+                status, _ = _send(connection, request)
+                failed = status >= 400
+            except (OSError, http.client.HTTPException):
+                failed = True
+                connection.close()
+                connection = _connect(args.base_url, args.timeout)
+            finished = time.perf_counter()
+            if started >= measure_from:
+                local_latencies[name].append(finished - started)
+                if failed:
+                    local_errors[name] += 1
+        connection.close()
+        with lock:
+            for name, values in local_latencies.items():
+                latencies[name].extend(values)
+            for name, count in local_errors.items():
+                errors[name] += count
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_revision": _git_revision(),
+        "config": {
+            "base_url": args.base_url,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "doctors": args.doctors,
+            "patients": args.patients,
+            "seed": args.seed,
+        },
+        "endpoints": {
+            name: _summarize(latencies[name], errors[name], args.duration)
+            for name in names if latencies[name]
+        },
+        "total": _summarize(all_latencies, sum(errors.values()), args.duration),
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, max_regression: float, max_error_rate: float) -> List[str]:
+    """List the endpoints that regressed against the baseline or failed too often."""
+    failures = []
+    for name, current in report["endpoints"].items():
+        if current["error_rate"] > max_error_rate:
+            failures.append(f"{name}: error rate {current['error_rate']:.1%} > {max_error_rate:.1%}")
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p95 {current['p95_ms']:.1f} ms vs {previous['p95_ms']:.1f} ms in baseline")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - max_regression):
+            failures.append(
+                f"{name}: {current['throughput_rps']:.1f} req/s vs {previous['throughput_rps']:.1f} req/s in baseline"
+            )
+    return failures
+
+
+def print_report(report: dict) -> None:
+    print(f"{'endpoint':<22}{'req':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}", file=sys.stderr)
+    for name, stats in list(report["endpoints"].items()) + [("total", report["total"])]:
+        print(
+            f"{name:<22}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}",
+            file=sys.stderr,
+        )
+
+
+def benchmark_api(args) -> bool:
+    """Log in benchmark users, run the load, write the report and check it against the baseline"""
+    mix = parse_mix(args.mix)
+    context = BenchmarkContext(args.api_prefix, args.doctors, args.patients)
+    context.doctor_tokens = _login_users(args.base_url, context, "doctor", args.users, args.seed, args.timeout)
+    context.patient_tokens = _login_users(args.base_url, context, "patient", args.users, args.seed, args.timeout)
+
+    report = run_load(args, context, mix)
+    print_report(report)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = compare_to_baseline(report, baseline, args.max_regression, args.max_error_rate)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the MediTrack API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds of load before measuring")
+    parser.add_argument("--concurrency", type=int, default=16, help="parallel connections")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="scenario weights, e.g. login=1,doctor_search=4")
+    parser.add_argument("--users", type=int, default=20, help="doctors and patients to log in as")
+    parser.add_argument("--doctors", type=int, default=10000, help="doctors seeded by seed_benchmark_data.py")
+    parser.add_argument("--patients", type=int, default=100000, help="patients seeded by seed_benchmark_data.py")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95/throughput regression, 0.2 = 20%%")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+    try:
+        success = benchmark_api(args)
+    except Exception as e:
+        print(f"Error running benchmark: {e}", file=sys.stderr)
+        success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+"""
+Measure how long a fresh worker takes to import the app and how much memory it holds.
+
+Each run imports app.main in a new interpreter under `python -X importtime`,
+so the numbers match what every uvicorn/gunicorn worker pays on start. The
+script fails if a module that should only load on demand (WeasyPrint,
+Pillow, ReportLab) is imported at startup.
+
+    python scripts/benchmark_import_time.py --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed for PDF rendering or image uploads, so they must not load at startup
+LAZY_MODULES = ("weasyprint", "PIL", "reportlab")
+
+CHILD_CODE = f"""
+import resource, sys
+import app.main
+loaded = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+print("maxrss_kb", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print("lazy_loaded", ",".join(loaded))
+"""
+
+
+def run_once():
+    """Import app.main in a new interpreter; return (import times per module in us, max RSS in KB, eagerly loaded lazy modules)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    # Lines look like "import time:       312 |       4861 |   app.main"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1])
+
+    maxrss_kb = 0
+    lazy_loaded = []
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "maxrss_kb":
+            maxrss_kb = int(value)
+        elif key == "lazy_loaded" and value:
+            lazy_loaded = value.split(",")
+    return cumulative, maxrss_kb, lazy_loaded
+
+
+def benchmark_import_time(runs: int, top: int, budget_ms: float):
+    """Print median import time and RSS over several runs; return False when a check fails"""
+    totals = []
+    rss = []
+    per_module = defaultdict(list)
+    lazy_loaded = set()
+    for _ in range(runs):
+        cumulative, maxrss_kb, loaded = run_once()
+        totals.append(cumulative.get("app.main", 0) / 1000)
+        rss.append(maxrss_kb / 1024)
+        lazy_loaded.update(loaded)
+        for module, us in cumulative.items():
+            # Top-level packages only, nested modules are already part of them
+            if "." not in module:
+                per_module[module].append(us / 1000)
+
+    print(f"import app.main over {runs} run(s): median {statistics.median(totals):.1f} ms, "
+          f"min {min(totals):.1f} ms, max {max(totals):.1f} ms")
+    print(f"worker max RSS: median {statistics.median(rss):.1f} MB")
+    print("\nslowest top-level imports (median cumulative ms):")
+    slowest = sorted(per_module.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for module, times in slowest[:top]:
+        print(f"  {statistics.median(times):9.1f}  {module}")
+
+    ok = True
+    if lazy_loaded:
+        print(f"\nFAIL: imported at startup but should load on demand: {', '.join(sorted(lazy_loaded))}")
+        ok = False
+    if budget_ms and statistics.median(totals) > budget_ms:
+        print(f"\nFAIL: median import time {statistics.median(totals):.1f} ms exceeds budget {budget_ms:.1f} ms")
+        ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark app import time and worker memory")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail when the median import time is above this")
+    args = parser.parse_args()
+    try:
+        success = benchmark_import_time(args.runs, args.top, args.budget_ms)
+    except Exception as e:
+        print(f"Error benchmarking import time: {e}")
+        success = False
+    sys.exit(0 if success else 1)
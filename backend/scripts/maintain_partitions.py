@@ -0,0 +1,29 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.core.config import settings
+from app.db.partitions import (
+    ensure_health_metric_partitions,
+    detach_expired_health_metric_partitions,
+)
+
+
+def maintain_partitions():
+    """Create upcoming health_metrics partitions and detach expired ones"""
+    try:
+        created = ensure_health_metric_partitions(settings.HEALTH_METRICS_PARTITION_MONTHS_AHEAD)
+        print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+        if settings.HEALTH_METRICS_RETENTION_MONTHS:
+            detached = detach_expired_health_metric_partitions(settings.HEALTH_METRICS_RETENTION_MONTHS)
+            print(f"Detached {len(detached)} partition(s): {', '.join(detached) or '-'}")
+        return True
+    except Exception as e:
+        print(f"Error maintaining partitions: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    # Run at startup; API processes repeat it every HEALTH_METRICS_PARTITION_CHECK_INTERVAL_SECONDS
+    success = maintain_partitions()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,25 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import signal
+from app.services.notification_dispatcher import NotificationDispatcher
+
+
+async def run_worker():
+    """Run a notification dispatcher until SIGINT/SIGTERM"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    dispatcher = NotificationDispatcher()
+    await dispatcher.run(stop_event)
+
+    metrics = dispatcher.metrics
+    print(f"Delivered {metrics.sent} notification(s), {metrics.failed} failed, max lag {metrics.max_lag_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    # Start as many of these as needed; claims never overlap between workers
+    asyncio.run(run_worker())
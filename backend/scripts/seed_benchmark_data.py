@@ -0,0 +1,543 @@
+"""
+Seed the database with synthetic data at benchmark scale (see scripts/benchmark_api.py).
+
+Generates users, doctor and patient profiles, appointments, health metric
+series, prescriptions with items and medical records. Batches of --batch-size
+rows are generated in --workers processes and written with COPY from
+in-memory CSV buffers, so tens of millions of rows load in minutes.
+
+Doctors and patients get predictable emails
+(bench-doctor-<n>@benchmark.example.com, bench-patient-<n>@...) and ids, and
+all share BENCHMARK_PASSWORD, so the load generator can act as any of them
+without reading the database. For a given --seed, --batch-size and --as-of,
+the output (apart from the salted password hash) is the same whatever the
+number of workers: every batch draws from its own random generator, and all
+dates are relative to midnight of --as-of. Derived tables (doctor_patient_summary,
+patient_latest_vitals, health_metric_daily_counts) are rebuilt at the end.
+
+    python scripts/seed_benchmark_data.py --doctors 10000 --patients 100000 \\
+        --appointments 1000000 --health-metrics 10000000 --workers 8
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.db.partitions import add_months, create_health_metric_partitions, month_start
+from app.models.enums import (
+    AppointmentStatus,
+    AppointmentType,
+    BloodGroup,
+    Gender,
+    PrescriptionStatus,
+    Priority,
+    RecordCategory,
+    UserType,
+    VitalType,
+)
+from app.utils.auth import get_password_hash
+from app.utils.health_metrics import CANONICAL_UNITS, is_abnormal_reading
+
+BENCHMARK_PASSWORD = "benchmark-password"
+EMAIL_DOMAIN = "benchmark.example.com"  # reserved for examples, never delivered to
+ID_NAMESPACE = uuid.UUID("6f1d2c3e-8a4b-4d5e-9f60-7a8b9c0d1e2f")
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Carlos", "Dina", "Elif", "Farhan", "Grace", "Hiro", "Ines", "Jamal",
+    "Kavya", "Liam", "Mei", "Nadia", "Omar", "Priya", "Quinn", "Rahim", "Sara", "Tomas",
+    "Uma", "Victor", "Wen", "Ximena", "Yusuf", "Zoe",
+]
+LAST_NAMES = [
+    "Ahmed", "Brown", "Chowdhury", "Diaz", "Evans", "Fischer", "Garcia", "Hossain", "Ito",
+    "Johnson", "Khan", "Lopez", "Martin", "Nguyen", "Okafor", "Patel", "Rahman", "Silva",
+    "Tanaka", "Umar", "Volkov", "Williams", "Xu", "Yilmaz", "Zhang",
+]
+SPECIALIZATIONS = [
+    "Cardiology", "Dermatology", "Endocrinology", "Family Medicine", "Gastroenterology",
+    "General Practice", "Neurology", "Obstetrics", "Oncology", "Ophthalmology",
+    "Orthopedics", "Pediatrics", "Psychiatry", "Pulmonology", "Urology",
+]
+HOSPITALS = [
+    "City General Hospital", "St. Mary's Medical Center", "Riverside Clinic",
+    "Northside Health", "University Hospital", "Lakeside Medical Group",
+]
+CITIES = ["Dhaka", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Barishal"]
+REASONS = [
+    "Routine checkup", "Follow-up visit", "Chest pain", "Persistent cough", "Headache",
+    "Skin rash", "Back pain", "Blood pressure review", "Diabetes management", "Fever",
+]
+DIAGNOSES = [
+    "Hypertension", "Type 2 diabetes", "Upper respiratory infection", "Migraine",
+    "Gastritis", "Asthma", "Hypothyroidism", "Allergic rhinitis", "Lower back pain", "Anemia",
+]
+# (name, dosage, frequency, quantity, duration, instructions)
+MEDICATIONS = [
+    ("Paracetamol", "500mg", "three times daily", "30 tablets", "10 days", "Take after meals"),
+    ("Amoxicillin", "500mg", "three times daily", "21 capsules", "7 days", "Complete the full course"),
+    ("Metformin", "500mg", "twice daily", "60 tablets", "30 days", "Take with food"),
+    ("Amlodipine", "5mg", "once daily", "30 tablets", "30 days", None),
+    ("Omeprazole", "20mg", "once daily", "14 capsules", "14 days", "Take before breakfast"),
+    ("Salbutamol", "100mcg", "as needed", "1 inhaler", None, "Two puffs when breathless"),
+    ("Levothyroxine", "50mcg", "once daily", "30 tablets", "30 days", "Take on an empty stomach"),
+    ("Cetirizine", "10mg", "once daily", "10 tablets", "10 days", None),
+]
+AVAILABLE_DAYS = json.dumps([{"days": "Monday - Friday", "time": "9:00 AM - 5:00 PM"}])
+
+# Each doctor's appointments take evenly spaced 30 minute slots of 9:00-17:00
+# days, so none of them overlap (ex_appointments_doctor_overlap)
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 16
+DAY_START_MINUTES = 9 * 60
+
+# (unit, mean, standard deviation, normal_min, normal_max, decimals) per vital type
+VITAL_PROFILES = {
+    VitalType.BLOOD_PRESSURE: ("mmHg", 120, 15, 90, 140, 0),
+    VitalType.HEART_RATE: ("bpm", 75, 12, 60, 100, 0),
+    VitalType.TEMPERATURE: ("°C", 36.8, 0.5, 36.1, 37.5, 1),
+    VitalType.WEIGHT: ("kg", 75, 15, None, None, 1),
+    VitalType.HEIGHT: ("cm", 168, 10, None, None, 0),
+    VitalType.BMI: ("kg/m²", 25, 4, 18.5, 24.9, 1),
+    VitalType.BLOOD_SUGAR: ("mg/dL", 100, 25, 70, 140, 0),
+    VitalType.OXYGEN_SATURATION: ("%", 97, 2, 95, 100, 0),
+}
+VITAL_TYPES = list(VITAL_PROFILES)
+
+# Batches of one phase are loaded in parallel; each phase only references rows of earlier ones
+LOAD_PHASES = [
+    ["doctor users", "patient users"],
+    ["doctor_profiles", "patient_profiles"],
+    ["appointments", "health_metrics", "prescriptions", "medical_records"],
+    ["prescription_items"],
+]
+
+# Derived tables, rebuilt with the same statements their migrations used to backfill them
+SUMMARY_REBUILDS = [
+    "TRUNCATE doctor_patient_summary, patient_latest_vitals, health_metric_daily_counts",
+    """
+    INSERT INTO doctor_patient_summary (doctor_id, patient_id, appointment_count, last_visit, is_bookmarked)
+    SELECT doctor_id, patient_id, COUNT(*), MAX(appointment_date), false
+    FROM appointments
+    GROUP BY doctor_id, patient_id
+    """,
+    """
+    INSERT INTO doctor_patient_summary (doctor_id, patient_id, appointment_count, last_visit, is_bookmarked)
+    SELECT DISTINCT doctor_id, patient_id, 0, NULL::timestamp, true
+    FROM doctor_bookmarks
+    ON CONFLICT (doctor_id, patient_id) DO UPDATE SET is_bookmarked = true
+    """,
+    """
+    INSERT INTO patient_latest_vitals (patient_id, metric_type, health_metric_id, recorded_at)
+    SELECT DISTINCT ON (patient_id, metric_type) patient_id, metric_type, id, recorded_at
+    FROM health_metrics
+    ORDER BY patient_id, metric_type, recorded_at DESC, created_at DESC
+    """,
+    """
+    INSERT INTO health_metric_daily_counts (patient_id, day, count)
+    SELECT patient_id, CAST(recorded_at AS DATE), COUNT(*)
+    FROM health_metrics
+    GROUP BY patient_id, CAST(recorded_at AS DATE)
+    """,
+    "ANALYZE",
+]
+
+
+def benchmark_email(kind: str, n: int) -> str:
+    """Email of the n-th seeded doctor or patient."""
+    return f"bench-{kind}-{n}@{EMAIL_DOMAIN}"
+
+
+def benchmark_id(kind: str, n: int) -> uuid.UUID:
+    """Stable id of the n-th seeded row of a kind (doctor-user, patient-profile, ...)."""
+    return uuid.uuid5(ID_NAMESPACE, f"{kind}-{n}")
+
+
+@lru_cache(maxsize=None)
+def _profile_id(kind: str, n: int) -> uuid.UUID:
+    # Every row references a profile, and uuid5 is a large part of generating one
+    return benchmark_id(f"{kind}-profile", n)
+
+
+def _batch_rng(seed: int, label: str, start: int) -> random.Random:
+    return random.Random(f"{seed}:{label}:{start}")
+
+
+def _user_rows(kind: str, user_type: UserType, start: int, end: int, rng: random.Random, password_hash: str, now: datetime) -> List[dict]:
+    rows = []
+    for n in range(start, end):
+        rows.append({
+            "id": benchmark_id(f"{kind}-user", n),
+            "email": benchmark_email(kind, n),
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "phone": f"+8801{rng.randrange(10**9):09d}",
+            "is_active": True,
+            "is_verified": True,
+            "password_hash": password_hash,
+            "user_type": user_type,
+            "created_at": now,
+        })
+    return rows
+
+
+def _patient_rows(start: int, end: int, rng: random.Random, now: datetime) -> List[dict]:
+    rows = []
+    for n in range(start, end):
+        rows.append({
+            "id": benchmark_id("patient-profile", n),
+            "user_id": benchmark_id("patient-user", n),
+            "date_of_birth": datetime(1940, 1, 1) + timedelta(days=rng.randrange(80 * 365)),
+            "gender": rng.choice([Gender.MALE, Gender.FEMALE]),
+            "blood_group": rng.choice(list(BloodGroup)),
+            "address": f"{rng.randrange(1, 200)} Road {rng.randrange(1, 50)}, {rng.choice(CITIES)}",
+            "created_at": now,
+        })
+    return rows
+
+
+def _doctor_rows(start: int, end: int, rng: random.Random, now: datetime) -> List[dict]:
+    rows = []
+    for n in range(start, end):
+        rows.append({
+            "id": benchmark_id("doctor-profile", n),
+            "user_id": benchmark_id("doctor-user", n),
+            "medical_license_number": f"BENCH-{n:08d}",
+            "specialization": rng.choice(SPECIALIZATIONS),
+            "years_of_experience": rng.randrange(1, 40),
+            "hospital_affiliation": rng.choice(HOSPITALS),
+            "consultation_fee": float(rng.randrange(5, 50) * 100),
+            "available_days": AVAILABLE_DAYS,
+            "bio": "Synthetic benchmark doctor",
+            "is_verified": rng.random() < 0.8,
+            "created_at": now,
+        })
+    return rows
+
+
+def _appointment_rows(start: int, end: int, rng: random.Random, doctors: int, patients: int, first_day: datetime, slot_stride: int, now: datetime) -> List[dict]:
+    rows = []
+    for k in range(start, end):
+        doctor_n = k % doctors
+        slot = (k // doctors) * slot_stride
+        appointment_date = first_day + timedelta(
+            days=slot // SLOTS_PER_DAY,
+            minutes=DAY_START_MINUTES + (slot % SLOTS_PER_DAY) * SLOT_MINUTES,
+        )
+        if appointment_date < now:
+            status = rng.choices(
+                [AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW],
+                weights=[85, 10, 5],
+            )[0]
+        else:
+            status = rng.choices(
+                [AppointmentStatus.SCHEDULED, AppointmentStatus.CONFIRMED, AppointmentStatus.CANCELLED],
+                weights=[60, 35, 5],
+            )[0]
+        created_at = appointment_date - timedelta(days=rng.randrange(1, 30))
+        rows.append({
+            "id": benchmark_id("appointment", k),
+            "patient_id": _profile_id("patient", rng.randrange(patients)),
+            "doctor_id": _profile_id("doctor", doctor_n),
+            "appointment_date": appointment_date,
+            "duration_minutes": SLOT_MINUTES,
+            "appointment_type": rng.choice(list(AppointmentType)),
+            "status": status,
+            "reason": rng.choice(REASONS),
+            "prescription_given": status == AppointmentStatus.COMPLETED and rng.random() < 0.6,
+            "follow_up_required": False,
+            "consultation_fee": float(rng.randrange(5, 50) * 100),
+            "payment_status": "paid" if status == AppointmentStatus.COMPLETED else "pending",
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return rows
+
+
+def _health_metric_rows(start: int, end: int, rng: random.Random, patients: int, days: int, now: datetime) -> List[dict]:
+    rows = []
+    span_seconds = days * 24 * 3600
+    for k in range(start, end):
+        metric_type = rng.choice(VITAL_TYPES)
+        unit, mean, deviation, normal_min, normal_max, decimals = VITAL_PROFILES[metric_type]
+        value_num = round(rng.gauss(mean, deviation), decimals)
+        value_secondary = None
+        if metric_type == VitalType.BLOOD_PRESSURE:
+            value_secondary = round(rng.gauss(80, 10))
+            value = f"{value_num:.0f}/{value_secondary}"
+        elif metric_type == VitalType.OXYGEN_SATURATION:
+            value_num = min(value_num, 100)
+            value = f"{value_num:.0f}"
+        else:
+            value = f"{value_num:.{decimals}f}"
+        recorded_at = now - timedelta(seconds=rng.randrange(span_seconds))
+        rows.append({
+            "id": benchmark_id("health-metric", k),
+            "patient_id": _profile_id("patient", k % patients),
+            "metric_type": metric_type,
+            "value": value,
+            "unit": unit,
+            "recorded_at": recorded_at,
+            "recorded_by": rng.choice(["self", "device", "doctor"]),
+            "value_num": value_num,
+            "value_secondary": value_secondary,
+            "unit_normalized": CANONICAL_UNITS[metric_type],
+            "normal_min": normal_min,
+            "normal_max": normal_max,
+            "is_abnormal": is_abnormal_reading(metric_type, value_num, unit, normal_min, normal_max),
+            "created_at": recorded_at,
+        })
+    return rows
+
+
+def _prescription_rows(start: int, end: int, rng: random.Random, doctors: int, patients: int, days: int, now: datetime) -> List[dict]:
+    rows = []
+    span_seconds = days * 24 * 3600
+    for k in range(start, end):
+        prescribed_date = now - timedelta(seconds=rng.randrange(span_seconds))
+        end_date = prescribed_date + timedelta(days=rng.choice([5, 7, 10, 14, 30, 90]))
+        if rng.random() < 0.05:
+            status = PrescriptionStatus.DISCONTINUED
+        elif end_date < now:
+            status = PrescriptionStatus.COMPLETED
+        else:
+            status = PrescriptionStatus.ACTIVE
+        rows.append({
+            "id": benchmark_id("prescription", k),
+            "patient_id": _profile_id("patient", rng.randrange(patients)),
+            "doctor_id": _profile_id("doctor", rng.randrange(doctors)),
+            "prescribed_date": prescribed_date,
+            "start_date": prescribed_date,
+            "end_date": end_date,
+            "status": status,
+            "diagnosis": rng.choice(DIAGNOSES),
+            "created_at": prescribed_date,
+        })
+    return rows
+
+
+def _prescription_item_rows(start: int, end: int, rng: random.Random, items_per_prescription: int, now: datetime) -> List[dict]:
+    rows = []
+    for k in range(start, end):
+        medication_name, dosage, frequency, quantity, duration, instructions = rng.choice(MEDICATIONS)
+        rows.append({
+            "id": benchmark_id("prescription-item", k),
+            "prescription_id": benchmark_id("prescription", k // items_per_prescription),
+            "medication_name": medication_name,
+            "dosage": dosage,
+            "frequency": frequency,
+            "quantity": quantity,
+            "duration": duration,
+            "instructions": instructions,
+            "created_at": now,
+        })
+    return rows
+
+
+def _medical_record_rows(start: int, end: int, rng: random.Random, doctors: int, patients: int, days: int, now: datetime) -> List[dict]:
+    rows = []
+    span_seconds = days * 24 * 3600
+    for k in range(start, end):
+        category = rng.choice(list(RecordCategory))
+        record_date = now - timedelta(seconds=rng.randrange(span_seconds))
+        has_doctor = rng.random() < 0.7
+        rows.append({
+            "id": benchmark_id("medical-record", k),
+            "patient_id": _profile_id("patient", rng.randrange(patients)),
+            "doctor_id": _profile_id("doctor", rng.randrange(doctors)) if has_doctor else None,
+            "title": f"{category.value.replace('_', ' ').title()} report",
+            "category": category,
+            "record_date": record_date,
+            "facility": rng.choice(HOSPITALS),
+            "summary": "Synthetic benchmark record",
+            "diagnosis": rng.choice(DIAGNOSES),
+            "priority": rng.choices(list(Priority), weights=[20, 65, 12, 3])[0],
+            "tags": json.dumps([category.value]),
+            "created_at": record_date,
+        })
+    return rows
+
+
+def _datasets(plan: dict) -> Dict[str, Tuple[str, int, Callable[[int, int, random.Random], List[dict]]]]:
+    """Label -> (table, row count, make_rows(start, end, rng)) for everything that gets seeded."""
+    now = plan["now"]
+    return {
+        "doctor users": ("users", plan["doctors"], lambda s, e, rng: _user_rows(
+            "doctor", UserType.DOCTOR, s, e, rng, plan["password_hash"], now)),
+        "patient users": ("users", plan["patients"], lambda s, e, rng: _user_rows(
+            "patient", UserType.PATIENT, s, e, rng, plan["password_hash"], now)),
+        "doctor_profiles": ("doctor_profiles", plan["doctors"], lambda s, e, rng: _doctor_rows(s, e, rng, now)),
+        "patient_profiles": ("patient_profiles", plan["patients"], lambda s, e, rng: _patient_rows(s, e, rng, now)),
+        "appointments": ("appointments", plan["appointments"], lambda s, e, rng: _appointment_rows(
+            s, e, rng, plan["doctors"], plan["patients"], plan["first_day"], plan["slot_stride"], now)),
+        "health_metrics": ("health_metrics", plan["health_metrics"], lambda s, e, rng: _health_metric_rows(
+            s, e, rng, plan["patients"], plan["history_days"], now)),
+        "prescriptions": ("prescriptions", plan["prescriptions"], lambda s, e, rng: _prescription_rows(
+            s, e, rng, plan["doctors"], plan["patients"], plan["history_days"], now)),
+        "prescription_items": ("prescription_items", plan["prescriptions"] * plan["items_per_prescription"],
+                               lambda s, e, rng: _prescription_item_rows(s, e, rng, plan["items_per_prescription"], now)),
+        "medical_records": ("medical_records", plan["medical_records"], lambda s, e, rng: _medical_record_rows(
+            s, e, rng, plan["doctors"], plan["patients"], plan["history_days"], now)),
+    }
+
+
+def _copy_value(value):
+    # Postgres enum labels are the member names; None becomes an unquoted empty field, i.e. NULL
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def _copy_rows(table: str, rows: List[dict]) -> None:
+    """Write rows with COPY FROM STDIN, streamed from an in-memory CSV buffer."""
+    # COPY skips the model's Python-side defaults: columns not generated are NULL,
+    # except users.phone_digits, which Postgres computes
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+_worker_datasets = None
+
+
+def _init_worker(plan: dict) -> None:
+    global _worker_datasets
+    # Connections inherited from the parent process must not be reused here
+    engine.dispose(close=False)
+    _worker_datasets = _datasets(plan)
+
+
+def _copy_batch(label: str, start: int, end: int, seed: int) -> int:
+    """Generate rows [start, end) of a dataset and COPY them in; runs in a worker process."""
+    table, _, make_rows = _worker_datasets[label]
+    rows = make_rows(start, end, _batch_rng(seed, label, start))
+    if rows:
+        _copy_rows(table, rows)
+    return len(rows)
+
+
+def _run_phase(pool: ProcessPoolExecutor, labels: List[str], datasets: dict, batch_size: int, seed: int) -> None:
+    """COPY every batch of the given datasets in parallel and wait for all of them."""
+    started = time.perf_counter()
+    futures = {}
+    for label in labels:
+        total = datasets[label][1]
+        for start in range(0, total, batch_size):
+            futures[pool.submit(_copy_batch, label, start, min(start + batch_size, total), seed)] = label
+
+    counts = defaultdict(int)
+    for future in as_completed(futures):
+        counts[futures[future]] += future.result()
+    elapsed = time.perf_counter() - started
+    for label in labels:
+        print(f"Seeded {counts[label]} {label}")
+    print(f"  {sum(counts.values())} rows in {elapsed:.1f}s ({sum(counts.values()) / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+def seed_benchmark_data(args) -> bool:
+    """Generate all benchmark rows, COPY them in from parallel workers, then rebuild the derived tables"""
+    if engine.dialect.name != "postgresql":
+        print("Error: seeding uses COPY and needs a PostgreSQL database")
+        return False
+    with engine.connect() as connection:
+        existing = connection.execute(
+            text("SELECT 1 FROM users WHERE email = :email"),
+            {"email": benchmark_email("doctor", 0)},
+        ).first()
+    if existing:
+        print("Error: benchmark data is already seeded; start from an empty database")
+        return False
+
+    started = time.perf_counter()
+    now = datetime.combine(args.as_of, datetime.min.time())
+
+    # Spread each doctor's appointments over --appointment-days, about 80% of them in the past
+    per_doctor = math.ceil(args.appointments / args.doctors)
+    plan = {
+        "now": now,
+        # Same hash for every benchmark user, bcrypt is far too slow to run per row
+        "password_hash": get_password_hash(BENCHMARK_PASSWORD),
+        "doctors": args.doctors,
+        "patients": args.patients,
+        "appointments": args.appointments,
+        "health_metrics": args.health_metrics,
+        "prescriptions": args.prescriptions,
+        "items_per_prescription": args.items_per_prescription,
+        "medical_records": args.medical_records,
+        "history_days": args.history_days,
+        "slot_stride": max(1, args.appointment_days * SLOTS_PER_DAY // max(per_doctor, 1)),
+        "first_day": now - timedelta(days=int(args.appointment_days * 0.8)),
+    }
+    datasets = _datasets(plan)
+
+    if args.health_metrics:
+        first_month = month_start((now - timedelta(days=args.history_days)).date())
+        with engine.begin() as connection:
+            created = create_health_metric_partitions(
+                connection, first_month, add_months(month_start(now.date()), 1)
+            )
+        print(f"Created {len(created)} health_metrics partition(s)")
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(plan,)) as pool:
+        for labels in LOAD_PHASES:
+            _run_phase(pool, labels, datasets, args.batch_size, args.seed)
+
+    summaries_started = time.perf_counter()
+    with engine.begin() as connection:
+        for statement in SUMMARY_REBUILDS:
+            connection.execute(text(statement))
+    print(f"Rebuilt summary tables in {time.perf_counter() - summaries_started:.1f}s")
+    print(f"Done in {time.perf_counter() - started:.1f}s; every user's password is {BENCHMARK_PASSWORD!r}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    parser.add_argument("--doctors", type=int, default=10000)
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--appointments", type=int, default=1000000)
+    parser.add_argument("--health-metrics", type=int, default=10000000)
+    parser.add_argument("--prescriptions", type=int, default=300000)
+    parser.add_argument("--items-per-prescription", type=int, default=3)
+    parser.add_argument("--medical-records", type=int, default=300000)
+    parser.add_argument("--appointment-days", type=int, default=365, help="spread each doctor's appointments over this many days")
+    parser.add_argument("--history-days", type=int, default=365, help="spread metrics, prescriptions and records over this many past days")
+    parser.add_argument("--batch-size", type=int, default=20000, help="rows per COPY")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parallel worker processes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=datetime.utcnow().date(),
+                        help="YYYY-MM-DD that generated dates are relative to (default: today, UTC)")
+    args = parser.parse_args()
+    if args.doctors < 1 or args.patients < 1 or args.items_per_prescription < 1:
+        print("Error: at least one doctor, patient and item per prescription are required")
+        sys.exit(1)
+    try:
+        success = seed_benchmark_data(args)
+    except Exception as e:
+        print(f"Error seeding benchmark data: {e}")
+        success = False
+    sys.exit(0 if success else 1)